@@ -5,13 +5,18 @@
 # - Loteria Federal: layout próprio em linhas (1º a 5º prêmio); sem bolinhas; logo com fallback "federal".
 # - Dedupe de nome da loteria no título; fallback de fontes ampliado; sem alterar visual aprovado.
 #
-# OBS: gerar_imagem_loteria() gera um PNG em memória (BytesIO).
+# OBS: gerar_imagem_loteria() gera um PNG em memória (BytesIO); codificar_imagem() aceita
+#      outra política de image_encode (ex. "jpeg" para envio, "kit" para o /output).
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 import io
 import os
 import re
 import math
+import time
+
+from font_registry import family
+from image_encode import encode_policy
 
 W, H = 1080, 1080
 M = 80
@@ -19,43 +24,43 @@ ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 LOGOS_DIR  = os.path.join(ASSETS_DIR, "logos")
 SHOW_CTA   = False
 BRAND_TEXT = "Portal SimonSports"
+# Fundos prontos em disco (PNG rápido, um por paleta+tamanho); vazio = cache só em memória
+FUNDOS_CACHE_DIR = os.getenv("FUNDOS_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", ".cache", "fundos")).strip()
 
 # ======= Fontes (com fallbacks) =======
-def _try_fonts(cands, size):
-    for p in cands:
-        if os.path.exists(p):
-            try:
-                return ImageFont.truetype(p, size)
-            except Exception:
-                pass
-    return ImageFont.load_default()
+# Caminhos resolvidos na importação e um FreeTypeFont por (tamanho, peso), no
+# registro compartilhado com os renderizadores de vídeo (font_registry).
+_SANS = family(
+    "imagem-sans",
+    [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+        "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
+        "/usr/share/fonts/truetype/arial/arial.ttf",
+    ],
+    [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+        "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf",
+        "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+        "/usr/share/fonts/truetype/arial/arialbd.ttf",
+    ],
+)
+_SERIF = family(
+    "imagem-serif",
+    [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSerif-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSerif-Bold.ttf",
+        "/usr/share/fonts/truetype/noto/NotoSerif-Bold.ttf",
+    ],
+)
 
 def FONT_SANS(size, bold=False):
-    if bold:
-        cands = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-            "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf",
-            "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
-            "/usr/share/fonts/truetype/arial/arialbd.ttf",
-        ]
-    else:
-        cands = [
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-            "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
-            "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
-            "/usr/share/fonts/truetype/arial/arial.ttf",
-        ]
-    return _try_fonts(cands, size)
+    return _SANS.get(size, bold)
 
 def FONT_SERIF(size):
-    cands = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSerif-Bold.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSerif-Bold.ttf",
-        "/usr/share/fonts/truetype/noto/NotoSerif-Bold.ttf",
-    ]
-    return _try_fonts(cands, size)
+    return _SERIF.get(size)
 
 def hx(h):
     h = h.lstrip('#')
@@ -132,29 +137,84 @@ def _vinheta(img, strength=220, blur=180):
     v = v.filter(ImageFilter.GaussianBlur(blur))
     return Image.composite(img, Image.new("RGB", (w, h), (0, 0, 0)), v)
 
+# ======= Cache de fundos e logos =======
+# O fundo (gradiente + vinheta com blur 180) só depende da cor da loteria e do tamanho:
+# é montado uma vez por paleta, guardado em memória e em FUNDOS_CACHE_DIR, e cada
+# imagem desenha sobre uma cópia. Mude _FUNDO_VERSAO ao alterar _gradient_vertical/_vinheta.
+_FUNDO_VERSAO = 1
+_fundos = {}
+_logos = {}
+
+def _fundo_path(top, bottom, w, h):
+    nome = "fundo_v{}_{}x{}_{}_{}.png".format(
+        _FUNDO_VERSAO, w, h, "".join(f"{c:02x}" for c in top), "".join(f"{c:02x}" for c in bottom)
+    )
+    return os.path.join(FUNDOS_CACHE_DIR, nome)
+
+def _fundo_em_cache(top, bottom, w, h):
+    chave = (top, bottom, w, h)
+    img = _fundos.get(chave)
+    if img is not None:
+        return img
+    path = _fundo_path(top, bottom, w, h) if FUNDOS_CACHE_DIR else ""
+    if path and os.path.exists(path):
+        try:
+            with Image.open(path) as f:
+                img = f.convert("RGB")
+        except Exception:
+            img = None
+    if img is None:
+        img = _vinheta(_gradient_vertical(w, h, top, bottom))
+        if path:
+            try:
+                os.makedirs(FUNDOS_CACHE_DIR, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                img.save(tmp, format="PNG", compress_level=1)
+                os.replace(tmp, path)
+            except OSError:
+                pass
+    _fundos[chave] = img
+    return img
+
 def criar_fundo(loteria_nome: str):
     base = cor_loteria(loteria_nome)
     top = tuple(min(255, int(c * 1.3)) for c in base)
     bottom = tuple(int(c * 0.8) for c in base)
-    g = _gradient_vertical(W, H, top, bottom)
-    g = _vinheta(g)
-    return g
+    return _fundo_em_cache(top, bottom, W, H).copy()
 
-def load_logo(loteria_nome: str):
+def _logo_original(loteria_nome: str):
     slug = _slug(loteria_nome)
+    if slug in _logos:
+        return _logos[slug]
     tries = [slug]
     # Fallbacks para Federal
     if "federal" in slug and slug != "federal":
         tries.append("federal")
+    logo = None
     for s in tries:
         for ext in ("png", "jpg", "jpeg"):
             p = os.path.join(LOGOS_DIR, f"{s}.{ext}")
             if os.path.exists(p):
                 try:
-                    return Image.open(p).convert("RGBA")
+                    logo = Image.open(p).convert("RGBA")
+                    break
                 except Exception:
                     pass
-    return None
+        if logo is not None:
+            break
+    _logos[slug] = logo
+    return logo
+
+def load_logo(loteria_nome: str):
+    # cópia: desenhar_logo faz thumbnail() no lugar
+    logo = _logo_original(loteria_nome)
+    return logo.copy() if logo is not None else None
+
+def limpar_caches():
+    _fundos.clear()
+    _logos.clear()
+    _SANS.clear()
+    _SERIF.clear()
 
 def desenhar_logo(canvas: Image.Image, loteria_nome: str):
     logo = load_logo(loteria_nome)
@@ -560,7 +620,8 @@ def desenhar_titulo(draw: ImageDraw.ImageDraw, loteria: str, concurso: str, data
         draw.text((M, M + 90 + 48), data_br, font=font_date, fill=(220, 220, 220))
 
 # ======== API principal (compatível com o bot.py) ========
-def gerar_imagem_loteria(loteria, concurso, data_br, numeros_str, url=""):
+def renderizar_imagem_loteria(loteria, concurso, data_br, numeros_str, url=""):
+    """Arte do resultado como Image RGB, antes de codificar (ver gerar_imagem_loteria)."""
     loteria   = str(loteria or "").strip()
     concurso  = str(concurso or "").strip()
     data_br   = str(data_br or "").strip()
@@ -589,8 +650,63 @@ def gerar_imagem_loteria(loteria, concurso, data_br, numeros_str, url=""):
         desenhar_cta(draw, url=url)
 
     desenhar_marca(draw)
-
-    buf = io.BytesIO()
-    img.save(buf, format="PNG", optimize=True)
-    buf.seek(0)
-    return buf
+    return img
+
+def codificar_imagem(img, politica="arquivo"):
+    # "arquivo" = PNG otimizado de sempre; as políticas rápidas ficam em image_encode
+    return io.BytesIO(encode_policy(politica).encode(img))
+
+def gerar_imagem_loteria(loteria, concurso, data_br, numeros_str, url="", politica="arquivo"):
+    return codificar_imagem(renderizar_imagem_loteria(loteria, concurso, data_br, numeros_str, url), politica)
+
+# ======== Benchmark (python -m app.imaging) ========
+AMOSTRAS_BENCHMARK = [
+    ("Mega-Sena", "04 11 23 35 47 58"),
+    ("Lotofácil", "01 02 04 05 07 08 10 11 13 15 17 19 21 23 25"),
+    ("Quina", "07 18 33 52 71"),
+    ("Lotomania", "00 03 07 12 18 21 29 33 38 42 47 51 58 63 66 72 79 84 90 97"),
+    ("Timemania", "05 14 27 39 48 61 77 - FLAMENGO/RJ"),
+    ("Dupla Sena", "02 09 17 28 36 44 05 13 22 31 40 49"),
+    ("Dia de Sorte", "03 08 14 19 22 27 31 - Maio"),
+    ("Super Sete", "1 8 3 0 6 2 9"),
+    ("+Milionária", "04 12 23 31 38 47 + 2 5"),
+    ("Federal", "12345 67890 24680 13579 11223"),
+    ("Loteca", "\n".join(f"{i:02d} {i % 3} TIME A{i} x {i % 2} TIME B{i}" for i in range(1, 15))),
+]
+
+def benchmark(rodadas: int = 2) -> dict:
+    """Imagens/s nas 11 modalidades: sem cache (antes), só cache em disco e cache em memória."""
+    import tempfile
+    global FUNDOS_CACHE_DIR
+    relatorio = {"modalidades": len(AMOSTRAS_BENCHMARK), "rodadas": rodadas}
+    disco = FUNDOS_CACHE_DIR
+    try:
+        with tempfile.TemporaryDirectory(prefix="portalsimonsports-fundos-") as pasta:
+            # modo: (pasta de fundos, zera a memória antes de cada imagem)
+            for nome, pasta_fundos, frio in (("sem_cache", "", True), ("disco", pasta, True), ("memoria", pasta, False)):
+                FUNDOS_CACHE_DIR = pasta_fundos
+                limpar_caches()
+                if pasta_fundos:
+                    for loteria, numeros in AMOSTRAS_BENCHMARK:
+                        renderizar_imagem_loteria(loteria, "1000", "01/08/2026", numeros)
+                render = total = 0.0
+                for _ in range(rodadas):
+                    for loteria, numeros in AMOSTRAS_BENCHMARK:
+                        if frio:
+                            limpar_caches()
+                        inicio = time.perf_counter()
+                        img = renderizar_imagem_loteria(loteria, "1000", "01/08/2026", numeros)
+                        meio = time.perf_counter()
+                        codificar_imagem(img)
+                        render += meio - inicio
+                        total += time.perf_counter() - inicio
+                n = rodadas * len(AMOSTRAS_BENCHMARK)
+                relatorio[f"{nome}_render_img_s"] = round(n / max(render, 1e-9), 1)
+                relatorio[f"{nome}_com_png_img_s"] = round(n / max(total, 1e-9), 2)
+    finally:
+        FUNDOS_CACHE_DIR = disco
+        limpar_caches()
+    return relatorio
+
+if __name__ == "__main__":
+    print(f"[IMAGEM] {benchmark()}", flush=True)
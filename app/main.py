@@ -18,9 +18,9 @@ import datetime as dt
 import pytz
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from PIL import Image
+from image_encode import encode_policy
 
-from .imaging import gerar_imagem_loteria, _slug  # reaproveita o slug oficial
+from .imaging import renderizar_imagem_loteria, _slug  # reaproveita o slug oficial
 
 TZ = pytz.timezone("America/Sao_Paulo")
 
@@ -94,8 +94,8 @@ def gerar_imagens_automaticamente():
 
             _log(f"Gerando imagem L{i}: {loteria} {concurso} ({data_br})")
 
-            # Gera imagem em buffer PNG (função padrão do imaging.py)
-            buf = gerar_imagem_loteria(loteria, concurso, data_br, numeros, url)
+            # Renderiza a arte (layout padrão do imaging.py), ainda sem codificar
+            img = renderizar_imagem_loteria(loteria, concurso, data_br, numeros, url)
 
             # Define nome "limpo" (slug oficial da imaging.py)
             loteria_slug = _slug(loteria) or "loteria"
@@ -106,11 +106,9 @@ def gerar_imagens_automaticamente():
 
             path = os.path.join(out_dir, fname)
 
-            # Converte o buffer (PNG) para JPEG RGB e SALVA (sobrescreve)
-            buf.seek(0)
-            with Image.open(buf) as im:
-                rgb = im.convert("RGB")
-                rgb.save(path, "JPEG", quality=95, optimize=True)
+            # JPEG 95 direto do canvas (política "kit"), sem passar por PNG, e SALVA (sobrescreve)
+            with open(path, "wb") as f:
+                f.write(encode_policy("kit").encode(img))
 
             geradas += 1
             _log(f"✅ salva: {path}")
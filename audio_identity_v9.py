@@ -2,11 +2,33 @@ from __future__ import annotations
 
 import hashlib
 import math
+import os
+import time
 import wave
 from array import array
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from media_cache import SOUNDTRACK_CACHE, MediaCache
+
 RATE = 44100
+BLOCK_SAMPLES = RATE * 4
+STYLES = (
+    (122.0, 43, ((0, 3, 7), (-4, 0, 7), (3, 7, 10), (-2, 2, 7))),
+    (116.0, 46, ((0, 4, 7), (5, 9, 12), (-3, 0, 4), (2, 5, 9))),
+    (126.0, 48, ((0, 3, 7), (3, 7, 10), (-2, 2, 7), (5, 8, 12))),
+    (120.0, 41, ((0, 4, 7), (-5, -1, 4), (2, 5, 9), (-3, 0, 4))),
+)
+SIGNATURE_NOTES = (
+    (0.42, 74, 0.105, -0.36),
+    (0.69, 81, 0.105, 0.12),
+    (0.96, 86, 0.125, 0.38),
+    (1.28, 90, 0.090, 0.0),
+)
 
 
 def variation_for(loteria: str, concurso: str) -> int:
@@ -63,13 +85,7 @@ def _brand_signature(t: float, start: float) -> tuple[float, float]:
         left += whoosh * (1.0 - pan)
         right += whoosh * (1.0 + pan)
 
-    notes = (
-        (0.42, 74, 0.105, -0.36),
-        (0.69, 81, 0.105, 0.12),
-        (0.96, 86, 0.125, 0.38),
-        (1.28, 90, 0.090, 0.0),
-    )
-    for offset, note, amp, pan in notes:
+    for offset, note, amp, pan in SIGNATURE_NOTES:
         ndt = dt - offset
         env = _env_exp(ndt, 70.0, 4.2, 1.10)
         if env:
@@ -104,23 +120,9 @@ def _section_energy(t: float, result_time: float, cta_time: float) -> tuple[floa
     return 0.72, 0.34, 0.40, 0.22
 
 
-def write_soundtrack(
-    path: str | Path,
-    duration: float,
-    loteria: str,
-    concurso: str,
-    result_time: float,
-    cta_time: float,
-) -> int:
-    variation = variation_for(loteria, concurso)
-
-    styles = (
-        (122.0, 43, ((0, 3, 7), (-4, 0, 7), (3, 7, 10), (-2, 2, 7))),
-        (116.0, 46, ((0, 4, 7), (5, 9, 12), (-3, 0, 4), (2, 5, 9))),
-        (126.0, 48, ((0, 3, 7), (3, 7, 10), (-2, 2, 7), (5, 8, 12))),
-        (120.0, 41, ((0, 4, 7), (-5, -1, 4), (2, 5, 9), (-3, 0, 4))),
-    )
-    bpm, root_base, progression = styles[variation]
+def _render_pcm_scalar(duration: float, variation: int, result_time: float, cta_time: float) -> bytes:
+    """Motor original, amostra a amostra; referência de comparação do motor em blocos."""
+    bpm, root_base, progression = STYLES[variation]
     beat = 60.0 / bpm
     bar = beat * 4.0
     pcm = array("h")
@@ -220,12 +222,281 @@ def write_soundtrack(
         right = math.tanh(right * 1.48) * 0.80 * fade
         pcm.append(int(max(-1.0, min(1.0, left)) * 32767))
         pcm.append(int(max(-1.0, min(1.0, right)) * 32767))
+    return pcm.tobytes()
+
+
+def _use_blocks() -> bool:
+    engine = os.getenv("SOUNDTRACK_ENGINE", "numpy").strip().lower()
+    return np is not None and engine != "scalar"
+
+
+def _midi_table(notes) -> "np.ndarray":
+    """Frequências calculadas pelo mesmo _midi escalar, para manter os valores idênticos."""
+    return np.array([_midi(note) for note in notes], dtype=np.float64)
+
+
+def _pulse_block(phase: "np.ndarray", decay: float) -> "np.ndarray":
+    phase = np.mod(phase, 1.0)
+    return np.exp(-phase * decay) * np.minimum(1.0, phase * 36.0)
+
+
+def _env_exp_block(dt: "np.ndarray", attack: float, decay: float, length: float) -> "np.ndarray":
+    active = (dt >= 0.0) & (dt < length)
+    env = (1.0 - np.exp(-dt * attack)) * np.exp(-dt * decay)
+    return np.where(active, env, 0.0)
+
+
+def _brand_signature_block(t: "np.ndarray", start: float) -> tuple["np.ndarray", "np.ndarray"]:
+    """Versão vetorizada de _brand_signature; só calcula o trecho ativo do bloco."""
+    left = np.zeros_like(t)
+    right = np.zeros_like(t)
+    dt_all = t - start
+    window = np.nonzero((dt_all >= 0.0) & (dt_all <= 2.25))[0]
+    if not window.size:
+        return left, right
+    lo, hi = int(window[0]), int(window[-1]) + 1
+    dt = dt_all[lo:hi]
+    sig_l = np.zeros_like(dt)
+    sig_r = np.zeros_like(dt)
+
+    impact_mask = dt < 0.85
+    if impact_mask.any():
+        sweep = 64.0 - 28.0 * np.minimum(1.0, dt / 0.45)
+        impact_env = _env_exp_block(dt, 55.0, 6.5, 0.85)
+        impact = (
+            np.sin(2.0 * math.pi * sweep * dt)
+            + 0.30 * np.sin(2.0 * math.pi * sweep * 2.0 * dt)
+        ) * 0.19 * impact_env
+        impact = np.where(impact_mask, impact, 0.0)
+        sig_l = sig_l + impact
+        sig_r = sig_r + impact
+
+    whoosh_mask = dt < 1.25
+    if whoosh_mask.any():
+        amount = np.maximum(0.0, np.minimum(1.0, dt / 1.25))
+        whoosh_env = np.abs(np.sin(math.pi * amount)) ** 1.45
+        f1 = 180.0 + 1800.0 * amount * amount
+        f2 = 310.0 + 2800.0 * amount * amount
+        whoosh = (
+            np.sin(2.0 * math.pi * f1 * dt)
+            + 0.55 * np.sin(2.0 * math.pi * f2 * dt + 0.7)
+            + 0.25 * np.sin(2.0 * math.pi * (f2 * 1.73) * dt + 1.4)
+        ) * 0.028 * whoosh_env
+        pan = np.sin(amount * math.pi * 1.5) * 0.42
+        sig_l = sig_l + np.where(whoosh_mask, whoosh * (1.0 - pan), 0.0)
+        sig_r = sig_r + np.where(whoosh_mask, whoosh * (1.0 + pan), 0.0)
+
+    for offset, note, amp, pan in SIGNATURE_NOTES:
+        ndt = dt - offset
+        env = _env_exp_block(ndt, 70.0, 4.2, 1.10)
+        freq = _midi(note)
+        tone = (
+            np.sin(2.0 * math.pi * freq * ndt)
+            + 0.42 * np.sin(2.0 * math.pi * freq * 2.01 * ndt + 0.2)
+            + 0.18 * np.sin(2.0 * math.pi * freq * 3.02 * ndt + 0.55)
+        ) * amp * env
+        sig_l = sig_l + tone * (1.0 - pan * 0.45)
+        sig_r = sig_r + tone * (1.0 + pan * 0.45)
+
+    left[lo:hi] = sig_l
+    right[lo:hi] = sig_r
+    return left, right
+
+
+def _section_energy_block(t: "np.ndarray", result_time: float, cta_time: float) -> tuple["np.ndarray", ...]:
+    """Mesmas faixas de _section_energy, na mesma ordem de precedência."""
+    conditions = [t < 2.2, t < 7.0, t < 24.0, t < 41.0, t < result_time, t < cta_time]
+    intro = (t - 2.2) / 4.8
+    build = (t - 41.0) / max(0.1, result_time - 41.0)
+    pad = np.select(conditions, [0.40, 0.50 + 0.22 * intro, 0.76, 0.82, 0.88 + 0.10 * build, 0.96], 0.72)
+    drum = np.select(conditions, [0.00, 0.10 + 0.20 * intro, 0.72, 0.86, 0.95 + 0.10 * build, 0.48], 0.34)
+    arp = np.select(conditions, [0.00, 0.15 + 0.25 * intro, 0.58, 0.78, 0.88 + 0.12 * build, 0.62], 0.40)
+    trans = np.select(conditions, [0.20, 0.22 + 0.20 * intro, 0.18, 0.22, 0.35 + 0.35 * build, 0.30], 0.22)
+    return pad, drum, arp, trans
+
+
+def _render_block(
+    t: "np.ndarray",
+    duration: float,
+    variation: int,
+    result_time: float,
+    cta_time: float,
+) -> bytes:
+    bpm, root_base, progression = STYLES[variation]
+    beat = 60.0 / bpm
+    bar = beat * 4.0
+    chords = np.array(progression, dtype=np.int64)
+
+    fade = np.minimum(1.0, t / 0.35) * np.minimum(1.0, np.maximum(0.0, duration - t) / 1.10)
+    pad_e, drum_e, arp_e, trans_e = _section_energy_block(t, result_time, cta_time)
+
+    beat_index = (t / beat).astype(np.int64)
+    beat_phase = np.mod(t / beat, 1.0)
+    half_phase = np.mod(t / (beat / 2.0), 1.0)
+    quarter_phase = np.mod(t / (beat / 4.0), 1.0)
+    bar_index = (t / bar).astype(np.int64)
+    chord = chords[bar_index % len(progression)]
+    notes = root_base + chord
+
+    note_min = int(notes.min()) - 12
+    midi = _midi_table(range(note_min, int(notes.max()) + 25))
+
+    left_pad = np.zeros_like(t)
+    right_pad = np.zeros_like(t)
+    for idx in range(notes.shape[1]):
+        freq = midi[notes[:, idx] + 12 - note_min]
+        phase = idx * 0.51 + variation * 0.17
+        tone = (
+            np.sin(2.0 * math.pi * freq * t + phase)
+            + 0.30 * np.sin(2.0 * math.pi * freq * 2.0 * t + phase * 1.7)
+            + 0.10 * np.sin(2.0 * math.pi * freq * 0.5 * t + phase * 0.7)
+        )
+        pan = -0.48 + idx * 0.48
+        left_pad = left_pad + tone * (1.0 - pan * 0.34)
+        right_pad = right_pad + tone * (1.0 + pan * 0.34)
+    lfo = 0.82 + 0.18 * np.sin(2.0 * math.pi * (0.075 + variation * 0.008) * t)
+    left_pad = left_pad * (0.020 * pad_e * lfo)
+    right_pad = right_pad * (0.020 * pad_e * lfo)
+
+    bass_freq = midi[notes[:, 0] - 12 - note_min]
+    bass_env = _pulse_block(beat_phase, 4.8)
+    bass = (
+        np.sin(2.0 * math.pi * bass_freq * t)
+        + 0.27 * np.sin(2.0 * math.pi * bass_freq * 2.0 * t)
+    ) * 0.087 * drum_e * bass_env
+
+    kick_env = np.exp(-beat_phase * 18.0)
+    kick_freq = 58.0 - 23.0 * np.minimum(1.0, beat_phase * 4.5)
+    kick = np.sin(2.0 * math.pi * kick_freq * (beat_phase * beat)) * 0.18 * drum_e * kick_env
+
+    snare_noise = (
+        np.sin(2.0 * math.pi * 1710.0 * t)
+        + 0.70 * np.sin(2.0 * math.pi * 2480.0 * t + 0.8)
+        + 0.42 * np.sin(2.0 * math.pi * 3390.0 * t + 1.5)
+    )
+    snare_on = np.isin(beat_index % 4, (1, 3)) & (t >= 7.0)
+    snare = np.where(snare_on, snare_noise * 0.032 * drum_e * np.exp(-beat_phase * 17.0), 0.0)
 
+    hat_noise = (
+        np.sin(2.0 * math.pi * (6400 + variation * 430) * t)
+        + 0.53 * np.sin(2.0 * math.pi * (8250 + variation * 510) * t + 0.7)
+        + 0.30 * np.sin(2.0 * math.pi * 10100.0 * t + 1.4)
+    )
+    hat_phase = np.where(t >= 41.0, quarter_phase, half_phase)
+    hat = hat_noise * 0.013 * drum_e * _pulse_block(hat_phase, 25.0)
+
+    subdivision = beat / np.where(t >= 24.0, 4.0, 2.0)
+    step = (t / subdivision).astype(np.int64)
+    pattern = np.array((0, 1, 2, 1, 0, 2, 1, 2) if variation % 2 == 0 else (0, 2, 1, 2, 0, 1, 2, 1))
+    arp_slot = pattern[step % len(pattern)] % notes.shape[1]
+    arp_note = notes[np.arange(len(t)), arp_slot] + np.where((t >= 41.0) & (step % 4 == 3), 24, 12)
+    arp_freq = midi[arp_note - note_min]
+    arp_phase = np.mod(t / subdivision, 1.0)
+    arp = (
+        np.sin(2.0 * math.pi * arp_freq * t)
+        + 0.22 * np.sin(2.0 * math.pi * arp_freq * 2.0 * t)
+    ) * 0.061 * arp_e * _pulse_block(arp_phase, 8.8)
+    arp_pan = np.where(step % 2 == 0, -0.46, 0.46)
+
+    transition = np.zeros_like(t)
+    for target in (7.0, 24.0, 41.0, result_time, cta_time):
+        distance = target - t
+        window = (distance > 0.0) & (distance < 1.55)
+        if not window.any():
+            continue
+        amount = 1.0 - distance / 1.55
+        sweep = (
+            np.sin(2.0 * math.pi * (190.0 + 1250.0 * amount * amount) * t)
+            + 0.35 * np.sin(2.0 * math.pi * (320.0 + 1800.0 * amount * amount) * t + 0.8)
+        ) * 0.013 * amount * trans_e
+        transition = transition + np.where(window, sweep, 0.0)
+
+    sig_l, sig_r = _brand_signature_block(t, 0.18)
+    out_l, out_r = _brand_signature_block(t, cta_time + 0.10)
+
+    left = left_pad + bass + kick + snare + hat + arp * (1.0 - arp_pan * 0.52) + transition + sig_l + out_l
+    right = right_pad + bass + kick + snare + hat + arp * (1.0 + arp_pan * 0.52) + transition + sig_r + out_r
+
+    duck = ((t >= 0.10) & (t <= 2.30)) | ((t >= cta_time) & (t <= min(duration, cta_time + 2.30)))
+    music_duck = 0.62
+    left = np.where(duck, (left - sig_l - out_l) * music_duck + sig_l + out_l, left)
+    right = np.where(duck, (right - sig_r - out_r) * music_duck + sig_r + out_r, right)
+
+    left = np.tanh(left * 1.48) * 0.80 * fade
+    right = np.tanh(right * 1.48) * 0.80 * fade
+    frames = np.empty((len(t), 2), dtype="<i2")
+    frames[:, 0] = np.clip(left, -1.0, 1.0) * 32767
+    frames[:, 1] = np.clip(right, -1.0, 1.0) * 32767
+    return frames.tobytes()
+
+
+def _render_pcm_blocks(duration: float, variation: int, result_time: float, cta_time: float):
+    """Motor vetorizado: gera o PCM em blocos de BLOCK_SAMPLES amostras."""
+    total = max(1, int(duration * RATE))
+    for first in range(0, total, BLOCK_SAMPLES):
+        t = np.arange(first, min(total, first + BLOCK_SAMPLES), dtype=np.int64) / RATE
+        yield _render_block(t, duration, variation, result_time, cta_time)
+
+
+def benchmark(duration: float = 60.0, result_time: float = 50.0, cta_time: float = 54.2) -> dict:
+    """Compara o motor escalar com o vetorizado para todas as variações."""
+    report = {}
+    for variation in range(len(STYLES)):
+        started = time.perf_counter()
+        scalar = _render_pcm_scalar(duration, variation, result_time, cta_time)
+        scalar_s = time.perf_counter() - started
+        started = time.perf_counter()
+        blocks = b"".join(_render_pcm_blocks(duration, variation, result_time, cta_time))
+        blocks_s = time.perf_counter() - started
+        a = np.frombuffer(scalar, dtype="<i2").astype(np.int32)
+        b = np.frombuffer(blocks, dtype="<i2").astype(np.int32)
+        report[variation] = {
+            "scalar_s": round(scalar_s, 3),
+            "numpy_s": round(blocks_s, 3),
+            "speedup": round(scalar_s / max(blocks_s, 1e-9), 1),
+            "max_diff_lsb": int(np.abs(a - b).max()) if a.size == b.size else None,
+            "identical": scalar == blocks,
+        }
+    return report
+
+
+def soundtrack_key(variation: int, duration: float, result_time: float, cta_time: float) -> str:
+    """A trilha depende só da variação, da duração e dos dois pontos de transição."""
+    return MediaCache.key("audio_identity_v9", RATE, variation, float(duration), float(result_time), float(cta_time))
+
+
+def write_soundtrack(
+    path: str | Path,
+    duration: float,
+    loteria: str,
+    concurso: str,
+    result_time: float,
+    cta_time: float,
+) -> int:
+    variation = variation_for(loteria, concurso)
     output = Path(path)
+    key = soundtrack_key(variation, duration, result_time, cta_time)
+    if SOUNDTRACK_CACHE.fetch(key, output):
+        return variation
+
     output.parent.mkdir(parents=True, exist_ok=True)
+    # Um destino vindo do cache é um hardlink: grava num arquivo novo para não alterar a entrada.
+    output.unlink(missing_ok=True)
     with wave.open(str(output), "wb") as audio:
         audio.setnchannels(2)
         audio.setsampwidth(2)
         audio.setframerate(RATE)
-        audio.writeframes(pcm.tobytes())
+        if _use_blocks():
+            for chunk in _render_pcm_blocks(duration, variation, result_time, cta_time):
+                audio.writeframes(chunk)
+        else:
+            audio.writeframes(_render_pcm_scalar(duration, variation, result_time, cta_time))
+    SOUNDTRACK_CACHE.store(key, output)
     return variation
+
+
+if __name__ == "__main__":
+    if np is None:
+        raise SystemExit("numpy ausente; o benchmark precisa do motor vetorizado.")
+    for variation, row in benchmark().items():
+        print(f"[TRILHA V9] variação {variation + 1}/4: {row}", flush=True)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Índices de bitrate (kbps) por (versão MPEG-1?, camada).
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+_VBR_TAGS = (b"Xing", b"Info", b"VBRI")
+_DURATION_LINE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def _frame_header(data: bytes, offset: int) -> Optional[tuple[int, int, int]]:
+    """Retorna (tamanho do quadro, amostras, taxa) ou None se não houver cabeçalho válido."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2 = data[offset + 1], data[offset + 2]
+    version = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 2 or mpeg1:
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate
+
+
+def _skip_id3(data: bytes) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def mp3_duration(path: str | Path) -> float:
+    """Mede a duração de um MP3 somando os quadros, sem processo externo.
+
+    Lê apenas os cabeçalhos de 4 bytes de cada quadro; o quadro Xing/Info/VBRI
+    não contém áudio e é ignorado. Levanta ValueError se nada for reconhecido.
+    """
+    data = Path(path).read_bytes()
+    offset = _skip_id3(data)
+    total = 0.0
+    frames = 0
+    end = len(data)
+    while offset + 4 <= end:
+        header = _frame_header(data, offset)
+        if header is None:
+            if data[offset:offset + 3] == b"TAG":
+                break
+            offset = data.find(b"\xff", offset + 1)
+            if offset < 0:
+                break
+            continue
+        length, samples, sample_rate = header
+        if length <= 4:
+            break
+        if frames or not any(tag in data[offset:offset + min(length, 64)] for tag in _VBR_TAGS):
+            total += samples / sample_rate
+        frames += 1
+        offset += length
+    if frames == 0:
+        raise ValueError(f"Nenhum quadro MP3 reconhecido em {Path(path).name}.")
+    return total
+
+
+def _batched_ffmpeg_durations(paths: Sequence[Path]) -> List[float]:
+    """Uma única chamada ao FFmpeg com todas as entradas; lê as durações do stderr."""
+    command: List[str] = ["ffmpeg", "-hide_banner"]
+    for path in paths:
+        command.extend(["-i", str(path)])
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    matches = _DURATION_LINE.findall(process.stderr)
+    if len(matches) != len(paths):
+        raise RuntimeError(f"Não foi possível medir {len(paths)} falas: {process.stderr[-1200:]}")
+    return [int(hours) * 3600 + int(minutes) * 60 + float(seconds) for hours, minutes, seconds in matches]
+
+
+def clip_durations(paths: Sequence[str | Path], minimum: float = 0.05) -> List[float]:
+    """Durações na mesma ordem de ``paths``.
+
+    Os MP3 são medidos no próprio processo; só o que não puder ser lido vai,
+    de uma vez, para uma única chamada ao FFmpeg.
+    """
+    items = [Path(path) for path in paths]
+    durations: Dict[int, float] = {}
+    pending: List[int] = []
+    for index, path in enumerate(items):
+        try:
+            durations[index] = mp3_duration(path)
+        except (OSError, ValueError):
+            pending.append(index)
+    if pending:
+        measured = _batched_ffmpeg_durations([items[index] for index in pending])
+        durations.update(zip(pending, measured))
+    return [max(minimum, durations[index]) for index in range(len(items))]
+
+
+def clip_duration(path: str | Path, minimum: float = 0.05) -> float:
+    return clip_durations([path], minimum)[0]
+
+
+def benchmark(segments: int = 40) -> dict:
+    """Compara ffprobe por fala com a leitura em processo para um boletim de ``segments`` falas."""
+    import asyncio
+
+    from tts_engine import FakeCommunicate
+
+    report: Dict[str, object] = {"segmentos": segments}
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-probe-bench-") as temporary:
+        clips = []
+        for index in range(segments):
+            clip = Path(temporary) / f"fala_{index:02d}.mp3"
+            speaker = FakeCommunicate(text="palavra " * (index % 9 + 1), voice="fake")
+            speaker.latency = 0.0
+            asyncio.run(speaker.save(str(clip)))
+            clips.append(clip)
+
+        started = time.perf_counter()
+        in_process = clip_durations(clips)
+        report["em_processo_s"] = round(time.perf_counter() - started, 4)
+
+        if shutil.which("ffprobe"):
+            started = time.perf_counter()
+            probed = []
+            for clip in clips:
+                process = subprocess.run(
+                    ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                     "-of", "default=noprint_wrappers=1:nokey=1", str(clip)],
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                )
+                probed.append(max(0.05, float(process.stdout.strip())))
+            report["ffprobe_s"] = round(time.perf_counter() - started, 4)
+            report["speedup"] = round(report["ffprobe_s"] / max(report["em_processo_s"], 1e-9), 1)
+            report["max_diff_s"] = round(max(abs(a - b) for a, b in zip(in_process, probed)), 4)
+    return report
+
+
+__all__ = ["benchmark", "clip_duration", "clip_durations", "mp3_duration"]
+
+
+if __name__ == "__main__":
+    print(f"[DURAÇÃO] {benchmark()}", flush=True)
@@ -11,18 +11,30 @@
 #     * SEM /me/accounts (zero “avisos”)
 #     * Exige token por página no Cofre (PAGE_ACCESS_TOKEN / PAGE_TOKEN / Token_de_Acesso etc.)
 
-import os, re, io, glob, json, time, base64, pytz, tweepy, requests
+import os, re, io, glob, json, time, atexit, base64, pytz, tweepy, requests
 import datetime as dt
-from threading import Thread
+from threading import RLock, Thread
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
 from typing import Optional, Dict, List, Tuple, Any
 
 # Google Sheets
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from gspread.utils import absolute_range_name, rowcol_to_a1
 
-# Imagem oficial (layout aprovado)
-from app.imaging import gerar_imagem_loteria
+# Cliente Google único por processo (sessão keep-alive + token reaproveitado)
+from sheets_client import gspread_client
+
+# Imagem oficial (layout aprovado), renderizada uma vez por resultado e rodada
+from app.imaging import renderizar_imagem_loteria
+from image_store import RenderedImage, image_store, row_key
+# Codificação rápida para envio (JPEG/PNG leve por rede, IMAGE_ENCODE_<REDE>)
+from image_encode import policy_for
+
+# Espelho local da planilha principal
+from sheet_mirror import mirror_for
+
+# Índice O(1) das credenciais do Cofre
+from cofre_index import CofreIndex, SINONIMOS_REDE
 
 TZ = pytz.timezone("America/Sao_Paulo")
 
@@ -96,17 +108,9 @@ def _row_has_min_payload(row) -> bool:
 # ============================================================
 # COFRE (cache) — por (Rede + Conta + Chave)
 # ============================================================
-_cofre_cache: Dict[str, Any] = {}  # creds_rows, creds_rc, canais_list
-
-_COOL_REDE = {
-    "GOOGLE":    ["GOOGLE", "PLANILHAS GOOGLE", "PLANILHAS_GOOGLE", "PLANILHAS"],
-    "X":         ["X", "TWITTER"],
-    "FACEBOOK":  ["FACEBOOK", "META_FACEBOOK", "META"],
-    "TELEGRAM":  ["TELEGRAM", "TG"],
-    "DISCORD":   ["DISCORD"],
-    "PINTEREST": ["PINTEREST"],
-    "GITHUB":    ["GITHUB"]
-}
+_cofre_cache: Dict[str, Any] = {}  # creds_rows, creds_rc, creds_index, canais_list
+
+_COOL_REDE = SINONIMOS_REDE
 
 def _match_rede(key_rede: str, target: str) -> bool:
     kr = (key_rede or "").strip().upper()
@@ -118,28 +122,16 @@ def _cofre_get(rede: str, chave: str, conta: Optional[str]=None, default: Option
     chave_u = (chave or "").strip().upper()
     conta_u = (conta or "").strip().upper() if conta else ""
 
+    # Precedência: 1) exato (rede+conta+chave); 2) mesma rede, qualquer conta;
+    # 3) sinônimos na mesma conta; 4) sinônimos em qualquer conta. O índice
+    # (cofre_index.py) é refeito sempre que creds_rc for trocado ou crescer.
     creds_rc: Dict[Tuple[str,str,str], str] = _cofre_cache.get("creds_rc", {}) or {}
+    index = _cofre_cache.get("creds_index")
+    if index is None or not index.is_current(creds_rc):
+        index = _cofre_cache["creds_index"] = CofreIndex(creds_rc, _COOL_REDE)
 
-    # 1) exato (rede+conta+chave)
-    if conta_u:
-        v = creds_rc.get((rede_u, conta_u, chave_u))
-        if v: return v
-
-    # 2) mesma rede, qualquer conta
-    for (r,c,k), v in creds_rc.items():
-        if r == rede_u and k == chave_u and v:
-            return v
-
-    # 3) sinônimos
-    for (r,c,k), v in creds_rc.items():
-        if k == chave_u and _match_rede(r, rede_u) and v:
-            if conta_u and c == conta_u:
-                return v
-    for (r,c,k), v in creds_rc.items():
-        if k == chave_u and _match_rede(r, rede_u) and v:
-            return v
-
-    return default
+    v = index.get(rede_u, chave_u, conta_u)
+    return v if v else default
 
 def _cofre_find_by_prefix(rede: str, prefix: str) -> List[Tuple[str,str,str]]:
     rede_u = (rede or "").strip().upper()
@@ -152,10 +144,6 @@ def _cofre_find_by_prefix(rede: str, prefix: str) -> List[Tuple[str,str,str]]:
     return out
 
 def _gs_client():
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive"
-    ]
     sa_json_env = (os.getenv("GOOGLE_SERVICE_JSON", "") or "").strip()
     if not sa_json_env:
         raise RuntimeError("Credencial Google ausente: defina GOOGLE_SERVICE_JSON (GitHub Actions Secret).")
@@ -163,18 +151,31 @@ def _gs_client():
         info = json.loads(sa_json_env)
     except Exception as e:
         raise RuntimeError(f"GOOGLE_SERVICE_JSON inválido (não é JSON). Erro: {e}")
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(info, scopes)
-    return gspread.authorize(creds)
+    # mesmo cliente para Cofre e planilha principal; open_by_key memorizado por ID
+    return gspread_client(info)
 
-def _open_cofre_ws(tab: str):
+# ---------------- leitura do Cofre + latência de inicialização ----------------
+# As duas abas do Cofre saem de um único values.batchGet (antes: abrir e ler cada aba
+# em sequência). A planilha principal depende de GOOGLE_SHEET_ID, que vem do próprio
+# Cofre, então só abre depois; cada fase fica registrada em _startup_times.
+_startup_times: Dict[str, float] = {}
+
+def _startup_phase(nome: str, inicio: float):
+    _startup_times[nome] = round(time.perf_counter() - inicio, 3)
+    _log(f"[STARTUP] {nome}={_startup_times[nome]:.3f}s | acumulado={sum(_startup_times.values()):.3f}s")
+
+def _cofre_read_tabs(*tabs: str) -> List[List[List[str]]]:
     if not COFRE_SHEET_ID:
         raise RuntimeError("COFRE_SHEET_ID não definido (GitHub Variables).")
     sh = _gs_client().open_by_key(COFRE_SHEET_ID)
-    return sh.worksheet(tab)
+    resp = sh.values_batch_get([absolute_range_name(t) for t in tabs]) or {}
+    ranges = resp.get("valueRanges", []) or []
+    return [(ranges[i].get("values", []) if i < len(ranges) else []) for i in range(len(tabs))]
 
 def _cofre_load():
-    creds_ws = _open_cofre_ws(COFRE_ABA_CRED)
-    allv = creds_ws.get_all_values()
+    inicio = time.perf_counter()
+    allv, vals = _cofre_read_tabs(COFRE_ABA_CRED, COFRE_ABA_CANAIS)
+    _startup_phase("cofre", inicio)
 
     rows=[]
     creds_rc: Dict[Tuple[str,str,str], str] = {}
@@ -193,10 +194,9 @@ def _cofre_load():
 
     _cofre_cache["creds_rows"] = rows
     _cofre_cache["creds_rc"]   = creds_rc
+    _cofre_cache["creds_index"] = CofreIndex(creds_rc, _COOL_REDE)
 
-    canais_ws = _open_cofre_ws(COFRE_ABA_CANAIS)
     canais_list = []
-    vals = canais_ws.get_all_values()
     for r in vals[1:]:
         ativo = _strip_invisible(r[0]).lower() if len(r)>0 else ""
         ordem = _strip_invisible(r[1]) if len(r)>1 else ""
@@ -217,13 +217,23 @@ def _open_ws_principal():
     sid = _cofre_get("GOOGLE", "GOOGLE_SHEET_ID", default="") or ""
     if not sid:
         raise RuntimeError("No Cofre, informe (Rede=GOOGLE, Chave=GOOGLE_SHEET_ID) com o ID da planilha principal.")
-    sh = _gs_client().open_by_key(sid)
-    return sh.worksheet(SHEET_TAB)
-
+    inicio = time.perf_counter()
+    ws = _gs_client().open_by_key(sid).worksheet(SHEET_TAB)
+    _startup_phase("planilha", inicio)
+    # sincroniza o espelho aqui para a leitura da aba contar na inicialização
+    inicio = time.perf_counter()
+    mirror_for(ws)
+    _startup_phase("espelho", inicio)
+    return ws
+
+# ---------------- espelho da planilha principal (SQLite, sheet_mirror.py) ----------------
+# Sincronizado uma vez por rodada (sem leitura se a planilha não mudou desde a anterior);
+# a coleta de cada rede consulta o índice da coluna de status. As marcas gravadas pelo
+# próprio bot são aplicadas no espelho; criar coluna invalida e força nova leitura.
 def _ensure_status_column(ws, rede: str, env_col: Optional[int]) -> int:
     if env_col and isinstance(env_col, int) and env_col > 0:
         return env_col
-    header = ws.row_values(1)
+    header = list(mirror_for(ws).header())
     target = f"Publicado_{rede}"
     for i, h in enumerate(header, start=1):
         if h and h.strip().lower() == target.lower():
@@ -238,16 +248,80 @@ def _ensure_status_column(ws, rede: str, env_col: Optional[int]) -> int:
     except Exception:
         pass
     ws.update_cell(1, col, target)
+    mirror_for(ws).invalidate()
     _log(f"[Planilha] Criada coluna: {target} (col {col})")
     return col
 
+# ---------------- marcação em lote (write-behind) ----------------
+# marcar_publicado só é chamado depois que o post saiu; a marca fica no buffer e vai
+# para a planilha num único batch_update ao atingir o tamanho/tempo limite e no fim
+# da rodada (main + atexit). Se o lote falhar, cai para update_cell célula a célula.
+# É o único escritor da planilha principal: com as redes em threads, add/flush
+# passam pelo mesmo lock e as chamadas à API nunca se sobrepõem.
+SHEETS_BATCH_SIZE    = int(os.getenv("SHEETS_BATCH_SIZE", "25"))
+SHEETS_FLUSH_SECONDS = float(os.getenv("SHEETS_FLUSH_SECONDS", "20"))
+
+class _StatusWriter:
+    def __init__(self, max_cells: int, max_age: float):
+        self.max_cells = max(1, max_cells)
+        self.max_age = max(0.0, max_age)
+        self._pending: Dict[int, Tuple[Any, Dict[Tuple[int,int], str]]] = {}
+        self._since: Optional[float] = None
+        self._lock = RLock()
+        self.writes = 0
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(cells) for _ws, cells in self._pending.values())
+
+    def add(self, ws, rownum: int, col: int, value: str):
+        with self._lock:
+            self._pending.setdefault(id(ws), (ws, {}))[1][(rownum, col)] = value
+            if self._since is None:
+                self._since = time.monotonic()
+            if len(self) >= self.max_cells or time.monotonic() - self._since >= self.max_age:
+                self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        written = 0
+        while self._pending:
+            key, (ws, cells) = next(iter(self._pending.items()))
+            data = [
+                {"range": rowcol_to_a1(r, c), "values": [[v]]}
+                for (r, c), v in sorted(cells.items())
+            ]
+            try:
+                ws.batch_update(data, value_input_option="USER_ENTERED")
+                self.writes += 1
+                mirror_for(ws).apply(cells)
+            except Exception as e:
+                _log(f"[Planilha] batch_update falhou ({e}); gravando {len(cells)} marca(s) uma a uma.")
+                for (r, c), v in sorted(cells.items()):
+                    ws.update_cell(r, c, v)
+                    self.writes += 1
+                    mirror_for(ws).apply({(r, c): v})
+                    del cells[(r, c)]
+            written += len(data)
+            del self._pending[key]
+        self._since = None
+        if written:
+            _log(f"[Planilha] {written} marca(s) gravada(s) | chamadas de escrita na rodada: {self.writes}")
+        return written
+
+_status_writer = _StatusWriter(SHEETS_BATCH_SIZE, SHEETS_FLUSH_SECONDS)
+atexit.register(_status_writer.flush)
+
 def marcar_publicado(ws, rownum, rede, value=None):
     col = COL_STATUS_REDES.get(rede, None)
     if not col:
         col = _ensure_status_column(ws, rede, None)
         COL_STATUS_REDES[rede] = col
     value = value or f"Publicado {rede} via {BOT_ORIGEM} em {_ts_br()}"
-    ws.update_cell(rownum, col, value)
+    _status_writer.add(ws, rownum, col, value)
 
 # ============================================================
 # TEXT MODE + FLAGS (Cofre)
@@ -318,15 +392,32 @@ def _try_load_kit_image(row):
         _log(f"[KIT] erro: {e}")
         return None
 
-def _build_image_from_row(row):
-    buf=_try_load_kit_image(row)
-    if buf: return buf
+# A arte de uma linha é a mesma para todas as redes e contas: fica no image_store
+# por (hash de loteria/concurso/data/números/url, variante) com os bytes e a base RGB.
+# A base sai na política de envio padrão; rede com outra política (ex. Discord em
+# PNG) ganha sua variante, codificada uma vez a partir da mesma base RGB.
+def _rendered_image(row, rede=None) -> RenderedImage:
     loteria  = row[COL_LOTERIA-1]  if _safe_len(row,COL_LOTERIA)  else "Loteria"
     concurso = row[COL_CONCURSO-1] if _safe_len(row,COL_CONCURSO) else "0000"
     data_br  = row[COL_DATA-1]     if _safe_len(row,COL_DATA)     else _now().strftime("%d/%m/%Y")
     numeros  = row[COL_NUMEROS-1]  if _safe_len(row,COL_NUMEROS)  else ""
     url_res  = row[COL_URL-1]      if _safe_len(row,COL_URL)      else ""
-    return gerar_imagem_loteria(str(loteria), str(concurso), str(data_br), str(numeros), str(url_res))
+
+    def render():
+        buf=_try_load_kit_image(row)
+        if buf: return RenderedImage(buf.getvalue(), "JPEG")
+        img = renderizar_imagem_loteria(str(loteria), str(concurso), str(data_br), str(numeros), str(url_res))
+        return RenderedImage.from_image(img, policy_for())
+
+    key = row_key([loteria, concurso, data_br, numeros, url_res])
+    base = image_store.get((key, "base"), render)
+    policy = policy_for(rede)
+    if base.policy in (None, policy.name):
+        return base
+    return image_store.get((key, policy.name), lambda: base.encoded(policy))
+
+def _build_image_from_row(row, rede=None):
+    return _rendered_image(row, rede).buffer()
 
 # ============================================================
 # TEXTO (canais do Cofre)
@@ -393,24 +484,23 @@ def montar_texto_publicacao(row, rede_alvo: str) -> str:
 # COLETA
 # ============================================================
 def coleta_candidatos_para(ws, rede: str):
-    linhas = ws.get_all_values()
-    if len(linhas) <= 1:
+    total = mirror_for(ws).count()
+    if total <= 0:
         _log(f"[{rede}] Planilha sem dados.")
         return []
     if rede not in COL_STATUS_REDES or not COL_STATUS_REDES[rede]:
         COL_STATUS_REDES[rede] = _ensure_status_column(ws, rede, None)
     col_status = COL_STATUS_REDES.get(rede)
 
-    data = linhas[1:]
     cand=[]
-    for rindex, row in enumerate(data, start=2):
+    for rindex, row in mirror_for(ws).pending(col_status):
         status_val = row[col_status-1] if len(row) >= col_status else ""
         if not _is_empty_status(status_val):
             continue
         if not _row_has_min_payload(row):
             continue
         cand.append((rindex, row))
-    _log(f"[{rede}] Candidatas: {len(cand)}/{len(data)}")
+    _log(f"[{rede}] Candidatas: {len(cand)}/{total}")
     return cand
 
 # ============================================================
@@ -506,8 +596,8 @@ def x_upload_media_if_any(acc, row):
     if not _x_post_with_image() or DRY_RUN:
         return None
     try:
-        buf=_build_image_from_row(row)
-        media=acc.api_v1.media_upload(filename="resultado.png", file=buf)
+        img=_rendered_image(row, "X")
+        media=acc.api_v1.media_upload(filename=f"resultado.{img.extension}", file=img.buffer())
         return [media.media_id_string]
     except Exception as e:
         _log(f"[{acc.handle}] Erro imagem: {e}")
@@ -577,7 +667,7 @@ def publicar_em_x(ws, candidatos):
             marcar_publicado(ws, rownum, "X")
             publicados += 1
 
-        time.sleep(PAUSA_ENTRE_POSTS)
+        time.sleep(_pausa_rede("X"))
 
     _log(f"[X] Publicados: {publicados}")
     return publicados
@@ -686,9 +776,9 @@ def _fb_post_text(pid, token, message, link=None):
         _fb_raise_details(r)
     return (r.json() or {}).get("id")
 
-def _fb_post_photo(pid, token, caption, image_bytes):
+def _fb_post_photo(pid, token, caption, img: RenderedImage):
     url=f"https://graph.facebook.com/{FB_GRAPH_VERSION}/{pid}/photos"
-    files={"source":("resultado.png", image_bytes, "image/png")}
+    files={"source":img.upload()}
     data={"access_token":token}
     if caption:
         data["caption"]=caption
@@ -733,9 +823,9 @@ def publicar_em_facebook(ws, candidatos):
                     ok=True
                 else:
                     if post_with_image:
-                        buf=_build_image_from_row(row)
+                        img=_rendered_image(row, "FACEBOOK")
                         try:
-                            fb_id=_fb_post_photo(pid, page_tok, msg, buf.getvalue())
+                            fb_id=_fb_post_photo(pid, page_tok, msg, img)
                             _log(f"[Facebook][{page_name}] OK (/photos) → {fb_id}")
                             ok=True
                         except Exception as e_photo:
@@ -758,7 +848,7 @@ def publicar_em_facebook(ws, candidatos):
             marcar_publicado(ws, rownum, "FACEBOOK")
             publicados += 1
 
-        time.sleep(PAUSA_ENTRE_POSTS)
+        time.sleep(_pausa_rede("FACEBOOK"))
 
     _log(f"[Facebook] Publicados: {publicados}")
     return publicados
@@ -777,9 +867,9 @@ def _tg_chat_ids_from_cofre():
         if v: out.add(v)
     return list(out)
 
-def _tg_send_photo(token, chat_id, caption, image_bytes):
+def _tg_send_photo(token, chat_id, caption, img: RenderedImage):
     url=f"https://api.telegram.org/bot{token}/sendPhoto"
-    files={"photo":("resultado.png", image_bytes, "image/png")}
+    files={"photo":img.upload()}
     data={"chat_id":chat_id,"caption":caption}
     r=requests.post(url, data=data, files=files, timeout=40)
     r.raise_for_status()
@@ -818,8 +908,8 @@ def publicar_em_telegram(ws, candidatos):
                     ok=True
                 else:
                     if post_with_image:
-                        buf=_build_image_from_row(row)
-                        msg_id=_tg_send_photo(token, chat_id, msg, buf.getvalue())
+                        img=_rendered_image(row, "TELEGRAM")
+                        msg_id=_tg_send_photo(token, chat_id, msg, img)
                     else:
                         final_msg = msg
                         if url_post and final_msg:
@@ -840,7 +930,7 @@ def publicar_em_telegram(ws, candidatos):
             marcar_publicado(ws, rownum, "TELEGRAM")
             publicados += 1
 
-        time.sleep(PAUSA_ENTRE_POSTS)
+        time.sleep(_pausa_rede("TELEGRAM"))
 
     _log(f"[Telegram] Publicados: {publicados}")
     return publicados
@@ -856,11 +946,11 @@ def _discord_webhooks_from_cofre():
         if v: out.add(v)
     return list(out)
 
-def _discord_send(webhook_url, content=None, image_bytes=None):
+def _discord_send(webhook_url, content=None, img: Optional[RenderedImage]=None):
     data={"content":content or ""}
     files=None
-    if image_bytes:
-        files={"file":("resultado.png", image_bytes, "image/png")}
+    if img is not None:
+        files={"file":img.upload()}
     r=requests.post(webhook_url, data=data, files=files, timeout=30)
     r.raise_for_status()
     return True
@@ -889,10 +979,9 @@ def publicar_em_discord(ws, candidatos):
                     _log(f"[Discord] DRY_RUN → {wh[-18:]}")
                 ok_any=True
             else:
-                img_bytes=None
+                img=None
                 if post_with_image:
-                    buf=_build_image_from_row(row)
-                    img_bytes=buf.getvalue()
+                    img=_rendered_image(row, "DISCORD")
 
                 for wh in hooks:
                     payload = msg
@@ -900,7 +989,7 @@ def publicar_em_discord(ws, candidatos):
                         payload = f"{payload}\n{url_post}"
                     elif url_post and not payload:
                         payload = url_post
-                    _discord_send(wh, content=(payload or None), image_bytes=img_bytes)
+                    _discord_send(wh, content=(payload or None), img=img)
                     _log(f"[Discord] OK → {wh[-18:]}")
                 ok_any=True
         except Exception as e:
@@ -911,7 +1000,7 @@ def publicar_em_discord(ws, candidatos):
             marcar_publicado(ws, rownum, "DISCORD")
             publicados += 1
 
-        time.sleep(PAUSA_ENTRE_POSTS)
+        time.sleep(_pausa_rede("DISCORD"))
 
     _log(f"[Discord] Publicados: {publicados}")
     return publicados
@@ -925,7 +1014,7 @@ def _pin_token_from_cofre():
 def _pin_board_from_cofre():
     return (_cofre_get("PINTEREST","BOARD_ID", default="") or "").strip()
 
-def _pinterest_create_pin(token, board_id, title, description, link, image_bytes=None, image_url=None):
+def _pinterest_create_pin(token, board_id, title, description, link, img: Optional[RenderedImage]=None, image_url=None):
     url="https://api.pinterest.com/v5/pins"
     headers={"Authorization":f"Bearer {token}"}
     payload={
@@ -936,16 +1025,16 @@ def _pinterest_create_pin(token, board_id, title, description, link, image_bytes
     if link:
         payload["link"]=link
 
-    if image_bytes is not None:
+    if img is not None:
         payload["media_source"]={
             "source_type":"image_base64",
-            "content_type":"image/png",
-            "data": base64.b64encode(image_bytes).decode("utf-8")
+            "content_type":img.mime,
+            "data": base64.b64encode(img.data).decode("utf-8")
         }
     elif image_url:
         payload["media_source"]={"source_type":"image_url","url":image_url}
     else:
-        raise ValueError("Pinterest: informe image_bytes ou image_url.")
+        raise ValueError("Pinterest: informe img ou image_url.")
 
     r=requests.post(url, headers=headers, json=payload, timeout=40)
     r.raise_for_status()
@@ -979,8 +1068,8 @@ def publicar_em_pinterest(ws, candidatos):
                 ok=True
             else:
                 if post_with_image:
-                    buf=_build_image_from_row(row)
-                    pin_id=_pinterest_create_pin(token, board, title, desc, url_post, image_bytes=buf.getvalue())
+                    img=_rendered_image(row, "PINTEREST")
+                    pin_id=_pinterest_create_pin(token, board, title, desc, url_post, img=img)
                 else:
                     pin_id=_pinterest_create_pin(token, board, title, desc, url_post, image_url=url_post or None)
                 _log(f"[Pinterest] OK → {pin_id}")
@@ -993,7 +1082,7 @@ def publicar_em_pinterest(ws, candidatos):
             marcar_publicado(ws, rownum, "PINTEREST")
             publicados += 1
 
-        time.sleep(PAUSA_ENTRE_POSTS)
+        time.sleep(_pausa_rede("PINTEREST"))
 
     _log(f"[Pinterest] Publicados: {publicados}")
     return publicados
@@ -1064,9 +1153,60 @@ def _print_config_summary(redes_alvo):
     _log("Redes alvo (ordem):", ", ".join(redes_alvo) if redes_alvo else "(nenhuma)")
     _log("Canais Cofre:", len(_cofre_cache.get("canais_list", [])))
 
+# ============================================================
+# Publicação das redes em paralelo
+# ============================================================
+# As redes são independentes: cada uma roda na própria thread com o próprio ritmo
+# (PAUSA_ENTRE_POSTS_<REDE>, senão PAUSA_ENTRE_POSTS). Coleta de candidatas e
+# criação de colunas ficam antes, na thread principal; as marcas passam todas pelo
+# _status_writer, o único escritor da planilha. Uma rede que falha não interrompe
+# as outras; o primeiro erro é relançado no fim.
+PUBLICAR_REDES_EM_PARALELO = (os.getenv("PUBLICAR_REDES_EM_PARALELO", "true").strip().lower() == "true")
+
+def _pausa_rede(rede: str) -> float:
+    raw = (os.getenv(f"PAUSA_ENTRE_POSTS_{rede}", "") or "").strip()
+    try:
+        return float(raw) if raw else PAUSA_ENTRE_POSTS
+    except ValueError:
+        return PAUSA_ENTRE_POSTS
+
+def publicar_redes(ws, tarefas: List[Tuple[str, Any, list]]) -> Dict[str, Any]:
+    resultados: Dict[str, Any] = {}
+    if not tarefas:
+        return resultados
+    inicio = time.perf_counter()
+    if not PUBLICAR_REDES_EM_PARALELO or len(tarefas) == 1:
+        for rede, publicador, cand in tarefas:
+            resultados[rede] = publicador(ws, cand)
+        _log(f"[REDES] {len(tarefas)} rede(s) em sequência | {time.perf_counter()-inicio:.1f}s")
+        return resultados
+
+    erros: List[Tuple[str, Exception]] = []
+    with ThreadPoolExecutor(max_workers=len(tarefas), thread_name_prefix="rede") as pool:
+        futuros = {pool.submit(publicador, ws, cand): rede for rede, publicador, cand in tarefas}
+        for fut in as_completed(futuros):
+            rede = futuros[fut]
+            try:
+                resultados[rede] = fut.result()
+            except Exception as e:
+                _log(f"[{rede}] falhou: {e}")
+                erros.append((rede, e))
+    _log(f"[REDES] {len(tarefas)} rede(s) em paralelo | {time.perf_counter()-inicio:.1f}s")
+    if erros:
+        raise erros[0][1]
+    return resultados
+
 # ============================================================
 # MAIN
 # ============================================================
+PUBLICADORES = {
+    "X": publicar_em_x,
+    "FACEBOOK": publicar_em_facebook,
+    "TELEGRAM": publicar_em_telegram,
+    "DISCORD": publicar_em_discord,
+    "PINTEREST": publicar_em_pinterest,
+}
+
 def main():
     _log("Start", f"Origem={BOT_ORIGEM} | DRY_RUN={DRY_RUN} | KIT_FIRST={USE_KIT_IMAGE_FIRST}")
     keepalive_thread = iniciar_keepalive() if ENABLE_KEEPALIVE else None
@@ -1079,6 +1219,7 @@ def main():
 
         ws=_open_ws_principal()
 
+        tarefas=[]
         for rede in redes_alvo:
             rede = rede.upper()
 
@@ -1091,18 +1232,12 @@ def main():
                 _log(f"[{rede}] Sem credenciais no Cofre. Pulando {rede}.")
                 continue
 
-            if rede=="X":
-                publicar_em_x(ws, cand)
-            elif rede=="FACEBOOK":
-                publicar_em_facebook(ws, cand)
-            elif rede=="TELEGRAM":
-                publicar_em_telegram(ws, cand)
-            elif rede=="DISCORD":
-                publicar_em_discord(ws, cand)
-            elif rede=="PINTEREST":
-                publicar_em_pinterest(ws, cand)
-            else:
+            if rede not in PUBLICADORES:
                 _log(f"[{rede}] não suportada.")
+                continue
+            tarefas.append((rede, PUBLICADORES[rede], cand))
+
+        publicar_redes(ws, tarefas)
 
         _log("Concluído.")
 
@@ -1110,6 +1245,7 @@ def main():
         _log(f"[FATAL] {e}")
         raise
     finally:
+        _status_writer.flush()
         if ENABLE_KEEPALIVE and keepalive_thread:
             time.sleep(1)
 
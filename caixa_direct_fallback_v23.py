@@ -5,6 +5,8 @@ from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
 import requests
 
+from sheet_schema import compile_schema
+
 BASE_URL = "https://servicebus2.caixa.gov.br/portaldeloterias/api"
 
 SLUGS = {
@@ -139,13 +141,12 @@ def fetch_official_result(key: str, display: str, contest: str, *, timeout: int
     }
 
 
+def _header_key(value: Any) -> str:
+    return _norm(value).replace(" ", "")
+
+
 def _header_index(headers: Sequence[str], *names: str) -> int | None:
-    normalized = [_norm(item).replace(" ", "") for item in headers]
-    for name in names:
-        target = _norm(name).replace(" ", "")
-        if target in normalized:
-            return normalized.index(target)
-    return None
+    return compile_schema(headers, _header_key, first_wins=True).index(*names)
 
 
 def append_missing_results(
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+"""Índice das credenciais do Cofre para bot._cofre_get.
+
+A busca antiga percorria creds_rc inteiro até três vezes por chamada, testando os
+sinônimos de rede (SINONIMOS_REDE) em cada entrada; com centenas de chamadas por rodada
+(_cofre_bool, _x_creds, _has_creds_for...) isso vira o grosso do custo fora da
+rede. CofreIndex monta, uma vez por carga do Cofre, dicionários por (rede, chave),
+(rede normalizada, chave) e (rede, conta, chave) guardando a posição de inserção de
+cada entrada, então a primeira ocorrência de cada passo da precedência sai de um
+punhado de consultas O(1); o resultado de cada pergunta ainda fica memorizado.
+"""
+
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+CredKey = Tuple[str, str, str]
+_Hit = Tuple[int, str]
+_MISSING = object()
+
+# Sinônimos de rede aceitos no Cofre (bot._COOL_REDE)
+SINONIMOS_REDE: Dict[str, Sequence[str]] = {
+    "GOOGLE":    ["GOOGLE", "PLANILHAS GOOGLE", "PLANILHAS_GOOGLE", "PLANILHAS"],
+    "X":         ["X", "TWITTER"],
+    "FACEBOOK":  ["FACEBOOK", "META_FACEBOOK", "META"],
+    "TELEGRAM":  ["TELEGRAM", "TG"],
+    "DISCORD":   ["DISCORD"],
+    "PINTEREST": ["PINTEREST"],
+    "GITHUB":    ["GITHUB"]
+}
+
+
+def _norm_rede(rede: str) -> str:
+    return rede.replace("_", " ")
+
+
+def _first(table: Dict, key, seq: int, value: str) -> None:
+    if key not in table:
+        table[key] = (seq, value)
+
+
+class CofreIndex:
+    """Mesma precedência da varredura antiga de bot._cofre_get, com consultas de tempo constante."""
+
+    def __init__(self, creds_rc: Mapping[CredKey, str], synonyms: Mapping[str, Sequence[str]]):
+        self.creds_rc = creds_rc
+        self.size = len(creds_rc)
+        self.synonyms = {target: tuple(aliases) for target, aliases in synonyms.items()}
+        self._exact: Dict[CredKey, str] = {}
+        self._by_rk: Dict[Tuple[str, str], _Hit] = {}
+        self._by_rck: Dict[CredKey, _Hit] = {}
+        self._by_nk: Dict[Tuple[str, str], _Hit] = {}
+        self._by_nck: Dict[CredKey, _Hit] = {}
+        self._memo: Dict[CredKey, Optional[str]] = {}
+        for seq, ((rede, conta, chave), value) in enumerate(creds_rc.items()):
+            if not value:
+                continue
+            self._exact[(rede, conta, chave)] = value
+            _first(self._by_rk, (rede, chave), seq, value)
+            _first(self._by_rck, (rede, conta, chave), seq, value)
+            _first(self._by_nk, (_norm_rede(rede), chave), seq, value)
+            _first(self._by_nck, (_norm_rede(rede), conta, chave), seq, value)
+
+    def is_current(self, creds_rc: Mapping[CredKey, str]) -> bool:
+        return creds_rc is self.creds_rc and len(creds_rc) == self.size
+
+    def _earliest(self, rede: str, chave: str, conta: Optional[str]) -> Optional[str]:
+        # sinônimo = mesma rede ignorando "_" x espaço, ou rede listada em synonyms[rede]
+        if conta is None:
+            hits = [self._by_nk.get((_norm_rede(rede), chave))]
+            hits += [self._by_rk.get((alias, chave)) for alias in self.synonyms.get(rede, ())]
+        else:
+            hits = [self._by_nck.get((_norm_rede(rede), conta, chave))]
+            hits += [self._by_rck.get((alias, conta, chave)) for alias in self.synonyms.get(rede, ())]
+        found = min((hit for hit in hits if hit), default=None)
+        return found[1] if found else None
+
+    def get(self, rede_u: str, chave_u: str, conta_u: str = "") -> Optional[str]:
+        """Valor para (rede, chave[, conta]) já normalizados em maiúsculas, ou None."""
+        key = (rede_u, conta_u, chave_u)
+        cached = self._memo.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        value = None
+        # 1) exato (rede+conta+chave)
+        if conta_u:
+            value = self._exact.get(key)
+        # 2) mesma rede, qualquer conta
+        if not value:
+            hit = self._by_rk.get((rede_u, chave_u))
+            value = hit[1] if hit else None
+        # 3) sinônimos, primeiro na mesma conta e depois em qualquer uma
+        if not value and conta_u:
+            value = self._earliest(rede_u, chave_u, conta_u)
+        if not value:
+            value = self._earliest(rede_u, chave_u, None)
+        self._memo[key] = value
+        return value
+
+
+__all__ = ["CofreIndex", "SINONIMOS_REDE"]
@@ -10,6 +10,8 @@ from zoneinfo import ZoneInfo
 import caixa_direct_fallback_v23 as caixa_fallback
 import daily_queue_v19 as queue
 import youtube_daily_live_v22 as live
+from sheet_mirror import SheetMirror, mirror_for
+from sheet_schema import compile_schema
 
 
 API_CALENDAR_SHEET_ID_DEFAULT = "1gHenJLO5Qr23wWLgmRUXHldaDsUdKcICeFR1Ee621X8"
@@ -18,12 +20,7 @@ API_HISTORY_CONFIG_TAB_DEFAULT = "CONFIG_HISTORICO_CAIXA"
 
 
 def _header_index(headers: Sequence[str], *names: str) -> int | None:
-    normalized = [queue._normalize(item) for item in headers]
-    for name in names:
-        target = queue._normalize(name)
-        if target in normalized:
-            return normalized.index(target)
-    return None
+    return compile_schema(headers, queue._normalize, first_wins=True).index(*names)
 
 
 def _cell(row: Sequence[str], index: int | None) -> str:
@@ -150,10 +147,10 @@ def history_imported_map(history_values: List[List[str]]) -> Dict[str, str]:
     return imported
 
 
-def _find_today_rows(values, headers, daily_index, date, targets):
+def _find_today_rows(mirror: SheetMirror, headers, daily_index, date, targets):
     wanted = {(key, contest): display for key, display, contest in targets}
     found = {}
-    for sheet_row, row in enumerate(values[1:], start=2):
+    for sheet_row, row in mirror.by_date(date):
         try:
             data = queue._row_data(row, headers)
             queue._validate_video_data(data)
@@ -190,8 +187,8 @@ def processar_resumo_por_calendario_api() -> int:
 
     main_spreadsheet = client.open_by_key(config.google_sheet_id)
     worksheet = main_spreadsheet.worksheet(config.sheet_tab)
-    values = worksheet.get_all_values()
-    if not values:
+    mirror = mirror_for(worksheet)
+    if not mirror.header():
         raise RuntimeError("A planilha principal está vazia.")
 
     api_sheet_id = os.getenv("YOUTUBE_API_CALENDAR_SHEET_ID", API_CALENDAR_SHEET_ID_DEFAULT).strip()
@@ -242,22 +239,22 @@ def processar_resumo_por_calendario_api() -> int:
         try:
             inserted = caixa_fallback.append_missing_results(
                 worksheet,
-                values,
+                mirror.rows(),
                 targets,
                 expected_date=date,
                 log=queue._log,
             )
             if inserted:
                 queue._log(f"Fallback CAIXA inseriu {len(inserted)} resultado(s) oficial(is).")
-                values = worksheet.get_all_values()
+                mirror.sync(force=True)
         except Exception as error:
             queue._log(f"Fallback direto CAIXA falhou sem interromper o workflow: {error}")
             traceback.print_exc()
 
-    headers = list(values[0])
+    headers = mirror.header()
     daily_column = os.getenv("PUBLICADO_YT_DIARIO_COL", queue.DAILY_COLUMN_DEFAULT)
     daily_index = queue._ensure_column(worksheet, headers, daily_column)
-    rows, missing_rows = _find_today_rows(values, headers, daily_index, date, targets)
+    rows, missing_rows = _find_today_rows(mirror, headers, daily_index, date, targets)
 
     if not rows:
         if missing_rows == ["JÁ PUBLICADO"]:
@@ -21,13 +21,16 @@ from post_video import (
     _unique_tags,
     listar_contas_youtube,
 )
+from sheet_mirror import mirror_for
+from sheet_schema import RowReader, RowRecord
 from video_queue import (
+    VIDEO_FIELDS,
     _ensure_column,
-    _find_col,
     _google_client,
     _load_cofre,
     _log,
-    _row_to_video_data,
+    _record_to_video_data,
+    _schema,
     _validate_video_data,
     carregar_config,
 )
@@ -42,6 +45,13 @@ DAILY_CUTOFF_HOUR_DEFAULT = 23
 
 DailyCandidate = Tuple[str, List[Tuple[int, Dict[str, Any]]], List[str]]
 
+DAILY_OPTIONAL_FIELDS = {
+    "premiacao": ("Premiação", "Premiacao", "Prêmio", "Premio"),
+    "ganhadores": ("Ganhadores", "Quantidade_Ganhadores", "Qtd_Ganhadores"),
+    "destaque_short": ("Destaque_Short", "Destaque Short"),
+}
+DAILY_FIELDS = {**VIDEO_FIELDS, **DAILY_OPTIONAL_FIELDS}
+
 
 def _normalize(value: Any) -> str:
     normalized = unicodedata.normalize("NFKD", str(value or "").strip())
@@ -118,13 +128,6 @@ def _write_step_summary(*lines: str) -> None:
         _log(f"Não foi possível escrever o resumo do GitHub Actions: {error}")
 
 
-def _header_value(row: Sequence[str], headers: Sequence[str], names: Sequence[str]) -> str:
-    index = _find_col(list(headers), list(names))
-    if index is None or index >= len(row):
-        return ""
-    return str(row[index] or "").strip()
-
-
 def _expected_by_date(calendar_values: List[List[str]]) -> Dict[str, List[str]]:
     expected: Dict[str, List[str]] = {}
     for row in calendar_values[1:]:
@@ -152,20 +155,23 @@ def _partial_full_url(value: Any) -> str:
     return match.group(1) if match else ""
 
 
-def _row_data(row: Sequence[str], headers: Sequence[str]) -> Dict[str, Any]:
-    data = _row_to_video_data(row, list(headers))
-    optional_fields = {
-        "premiacao": ["Premiação", "Premiacao", "Prêmio", "Premio"],
-        "ganhadores": ["Ganhadores", "Quantidade_Ganhadores", "Qtd_Ganhadores"],
-        "destaque_short": ["Destaque_Short", "Destaque Short"],
-    }
-    for target, aliases in optional_fields.items():
-        value = _header_value(row, headers, aliases)
+def _daily_reader(headers: Sequence[str]) -> RowReader:
+    return _schema(headers).reader("DailyRow", DAILY_FIELDS)
+
+
+def _record_data(record: RowRecord) -> Dict[str, Any]:
+    data = _record_to_video_data(record)
+    for target in DAILY_OPTIONAL_FIELDS:
+        value = getattr(record, target)
         if value:
             data[target] = value
     return data
 
 
+def _row_data(row: Sequence[str], headers: Sequence[str]) -> Dict[str, Any]:
+    return _record_data(_daily_reader(headers).read(row))
+
+
 def _candidate_dates(
     values: List[List[str]],
     headers: List[str],
@@ -178,19 +184,23 @@ def _candidate_dates(
     today = now_local.date()
     cutoff_hour = max(0, min(23, _env_int("YOUTUBE_DAILY_CUTOFF_HOUR", DAILY_CUTOFF_HOUR_DEFAULT)))
     grouped: Dict[str, Dict[Tuple[str, str], Tuple[int, Dict[str, Any], str]]] = {}
+    reader = _daily_reader(headers)
 
     for sheet_row, row in enumerate(values[1:], start=2):
-        try:
-            data = _row_data(row, headers)
-            _validate_video_data(data)
-        except Exception:
-            continue
-        date = str(data.get("data") or "").strip()
+        # A data sai do registro antes de montar o dicionário do vídeo: a maior parte
+        # da planilha é histórico fora da janela e nem chega a ser convertida.
+        record = reader.read(row, sheet_row)
+        date = record.data
         parsed = _parse_date(date)
         if parsed is None or parsed.date() > today:
             continue
         if start_date is not None and parsed.date() < start_date.date():
             continue
+        try:
+            data = _record_data(record)
+            _validate_video_data(data)
+        except Exception:
+            continue
         lottery_key = _lottery_key(data.get("loteria"))
         contest = re.sub(r"\D+", "", str(data.get("concurso") or "")) or str(data.get("concurso") or "").strip()
         if not lottery_key or not contest:
@@ -379,8 +389,10 @@ def _metadata(resultados: Sequence[Dict[str, Any]], tipo: str) -> Dict[str, Any]
 
 
 def _mark_rows(worksheet, row_numbers: Sequence[int], column_index: int, value: str) -> None:
+    mirror = mirror_for(worksheet)
     for row_number in row_numbers:
-        worksheet.update_cell(row_number, column_index + 1, value)
+        mirror.mark(row_number, column_index + 1, value)
+    mirror.flush()
 
 
 def _publish_day(
@@ -526,7 +538,7 @@ def processar_resumo_diario() -> int:
     calendar_tab = os.getenv("YOUTUBE_CALENDAR_TAB", CALENDAR_TAB_DEFAULT)
     calendar = spreadsheet.worksheet(calendar_tab)
 
-    values = worksheet.get_all_values()
+    values = mirror_for(worksheet).rows()
     calendar_values = calendar.get_all_values()
     if not values:
         raise RuntimeError("A planilha principal está vazia.")
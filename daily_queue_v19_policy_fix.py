@@ -43,10 +43,19 @@ def _candidate_dates_without_loteca(
         ),
     )
     grouped: Dict[str, Dict[Tuple[str, str], Tuple[int, Dict[str, Any], str]]] = {}
+    reader = queue._daily_reader(headers)
 
     for sheet_row, row in enumerate(values[1:], start=2):
+        record = reader.read(row, sheet_row)
+        date = record.data
+        parsed = queue._parse_date(date)
+        if parsed is None or parsed.date() > today:
+            continue
+        if start_date is not None and parsed.date() < start_date.date():
+            continue
+
         try:
-            data = queue._row_data(row, headers)
+            data = queue._record_data(record)
             queue._validate_video_data(data)
         except Exception:
             continue
@@ -55,13 +64,6 @@ def _candidate_dates_without_loteca(
         if lottery_key == "loteca":
             continue
 
-        date = str(data.get("data") or "").strip()
-        parsed = queue._parse_date(date)
-        if parsed is None or parsed.date() > today:
-            continue
-        if start_date is not None and parsed.date() < start_date.date():
-            continue
-
         contest = (
             re.sub(r"\D+", "", str(data.get("concurso") or ""))
             or str(data.get("concurso") or "").strip()
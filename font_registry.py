@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+"""Fontes resolvidas uma vez e FreeTypeFont memorizados por tamanho.
+
+Os renderizadores (vídeo diário, Loteca, pacote, visual, contas do X, thumbnail e
+app.imaging) tinham cada um seu _font: a cada texto desenhado testavam os caminhos
+no disco e abriam o .ttf de novo com ImageFont.truetype, e os _fit_font repetiam
+isso tamanho a tamanho, de 2 em 2, até o texto caber. Aqui cada família resolve
+seus caminhos na importação, cada (tamanho, peso) vira um único FreeTypeFont
+compartilhado e FontFamily.fit() acha o maior tamanho que cabe por busca binária
+sobre a mesma sequência de tamanhos que o laço antigo percorria; o tamanho escolhido
+fica memorizado por texto e largura, já que as mesmas chamadas se repetem a cada
+cena e a cada vídeo do lote.
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from PIL import ImageDraw, ImageFont
+
+DEJAVU = "/usr/share/fonts/truetype/dejavu"
+LIBERATION = "/usr/share/fonts/truetype/liberation"
+LIBERATION2 = "/usr/share/fonts/truetype/liberation2"
+
+_lock = threading.Lock()
+_families: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], "FontFamily"] = {}
+_stats = {"fontes": 0, "reusos": 0}
+FIT_MEMO_MAX = 4096
+
+
+def _existing(candidates: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(path for path in candidates if path and os.path.exists(path))
+
+
+class FontFamily:
+    """Candidatos regular/negrito já filtrados; get() devolve sempre o mesmo objeto por tamanho."""
+
+    __slots__ = ("name", "regular", "bold", "_fonts", "_fits")
+
+    def __init__(self, name: str, regular: Sequence[str], bold: Optional[Sequence[str]] = None):
+        self.name = name
+        self.regular = _existing(regular)
+        self.bold = _existing(bold) if bold is not None else self.regular
+        self._fonts: Dict[Tuple[int, bool], ImageFont.ImageFont] = {}
+        self._fits: Dict[Tuple, int] = {}
+
+    def _load(self, size: int, bold: bool) -> ImageFont.ImageFont:
+        for path in self.bold if bold else self.regular:
+            try:
+                return ImageFont.truetype(path, size=size)
+            except OSError:
+                continue
+        return ImageFont.load_default()
+
+    def get(self, size: int, bold: bool = False) -> ImageFont.ImageFont:
+        key = (int(size), bool(bold))
+        font = self._fonts.get(key)
+        if font is not None:
+            _stats["reusos"] += 1
+            return font
+        font = self._load(*key)
+        with _lock:
+            _stats["fontes"] += 1
+            return self._fonts.setdefault(key, font)
+
+    def fit(
+        self,
+        draw: ImageDraw.ImageDraw,
+        text: str,
+        max_width: int,
+        start: int,
+        minimum: int = 18,
+        bold: bool = True,
+        step: int = 2,
+    ) -> ImageFont.ImageFont:
+        """Maior tamanho de range(start, minimum - 1, -step) em que ``text`` cabe em ``max_width``.
+
+        Mesmo resultado do laço decrescente (a largura cresce com o tamanho), com
+        log2(n) medições em vez de até n; se nada couber, devolve ``minimum``.
+        """
+        key = (text, max_width, start, minimum, bold, step, draw.fontmode)
+        size = self._fits.get(key)
+        if size is None:
+            sizes = range(start, minimum - 1, -step)
+            low, high = 0, len(sizes)
+            while low < high:
+                middle = (low + high) // 2
+                if draw.textbbox((0, 0), text, font=self.get(sizes[middle], bold))[2] <= max_width:
+                    high = middle
+                else:
+                    low = middle + 1
+            size = sizes[low] if low < len(sizes) else minimum
+            if len(self._fits) >= FIT_MEMO_MAX:
+                self._fits.clear()
+            self._fits[key] = size
+        return self.get(size, bold)
+
+    def clear(self) -> None:
+        self._fonts.clear()
+        self._fits.clear()
+
+
+def family(name: str, regular: Sequence[str], bold: Optional[Sequence[str]] = None) -> FontFamily:
+    """Família compartilhada para a lista de candidatos (mesma lista, mesmo objeto)."""
+    key = (tuple(regular), tuple(bold) if bold is not None else tuple(regular))
+    with _lock:
+        found = _families.get(key)
+        if found is None:
+            found = _families[key] = FontFamily(name, *key)
+        return found
+
+
+def registry_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats, familias=len(_families))
+
+
+def clear_registry() -> None:
+    with _lock:
+        for found in _families.values():
+            found.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+# Família dos renderizadores de vídeo/thumbnail (DejaVu e, na falta, Liberation 2).
+SANS = family(
+    "sans",
+    [f"{DEJAVU}/DejaVuSans.ttf", f"{LIBERATION2}/LiberationSans-Regular.ttf"],
+    [f"{DEJAVU}/DejaVuSans-Bold.ttf", f"{LIBERATION2}/LiberationSans-Bold.ttf"],
+)
+
+
+__all__ = ["SANS", "FontFamily", "clear_registry", "family", "registry_stats"]
+
@@ -9,6 +9,7 @@ from typing import Any, Dict, Sequence
 from PIL import Image, ImageDraw, ImageFont
 
 from audio_identity_v9 import write_soundtrack
+from font_registry import SANS
 from gerador_video_v9 import gerar_video_loteria as gerar_base_vertical
 from video_visual_v5 import _palette
 from voice_dialogue_v11 import (
@@ -35,16 +36,7 @@ def _slug(value: str) -> str:
 
 
 def _font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    candidates = (
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
-    )
-    for candidate in candidates:
-        try:
-            return ImageFont.truetype(candidate, size=size)
-        except OSError:
-            pass
-    return ImageFont.load_default()
+    return SANS.get(size, bold)
 
 
 def _center(draw: ImageDraw.ImageDraw, xy: tuple[int, int], text: str, size: int, fill, bold: bool = False) -> None:
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import os
 import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from PIL import Image, ImageDraw
 
 import gerador_pacote_v11 as visual
+import gerador_video_v9 as base_v9
 from audio_identity_v9 import write_soundtrack
 from voice_narration_v13 import (
     extract_numbers,
@@ -125,48 +128,123 @@ def _horizontal_overlay(data: Dict[str, Any], output: Path, presenter: str) -> N
     image.save(output)
 
 
-def _create_short(base_video: Path, data: Dict[str, Any], output_dir: Path, voice: str) -> Path:
+X264_ARGS = ("-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p")
+# unica = base sem perdas e Short + completo numa só chamada ao FFmpeg | separada = fluxo anterior
+ENCODE_MODE = os.getenv("PACOTE_CODIFICACAO", "unica").strip().lower() or "unica"
+
+
+def _output_name(data: Dict[str, Any], prefix: str, suffix: str) -> str:
+    lottery = visual._slug(str(data.get("loteria") or "Loteria").strip()) or "loteria"
+    contest = visual._slug(str(data.get("concurso") or "").strip() or "resultado") or "resultado"
+    return f"{prefix}_{lottery}_{contest}_{suffix}_voz_v13.mp4"
+
+
+def _short_assets(data: Dict[str, Any], temp: Path, voice: str) -> Tuple[Path, Path]:
     lottery_text = str(data.get("loteria") or "Loteria").strip()
     contest_text = str(data.get("concurso") or "").strip()
-    lottery = visual._slug(lottery_text) or "loteria"
-    contest = visual._slug(contest_text or "resultado") or "resultado"
-    output = output_dir / f"short_{lottery}_{contest}_30s_voz_v13.mp4"
     numbers = extract_numbers(data)
     reveals = reveal_times_short(lottery_text, len(numbers), intro_duration=5.4, result_duration=18.1)
+    cta = temp / "cta_short.png"
+    music = temp / "trilha_short.wav"
+    narrated = temp / "audio_short_narrado.wav"
+
+    _short_cta(data, cta, voice_label(voice))
+    write_soundtrack(music, 30.0, lottery_text, contest_text, 23.4, 24.0)
+    synthesize_narration_mix(data, 30.0, reveals, music, narrated, compact=True, voice=voice)
+    return cta, narrated
+
+
+def _short_graph(source: str, cta: str, output: str) -> str:
+    intro_duration = 5.4
+    result_duration = 18.6
+    return (
+        f"[{source}]split=2[short_a][short_b];"
+        f"[short_a]trim=start=0:end=0.9,setpts=PTS-STARTPTS,"
+        f"tpad=stop_mode=clone:stop_duration={intro_duration - 0.9:.3f},"
+        "fps=30,settb=AVTB,format=yuv420p[intro];"
+        f"[short_b]trim=start=7.0:end=54.0,setpts={(result_duration / 47.0):.9f}*PTS,"
+        "fps=30,settb=AVTB,format=yuv420p[result];"
+        "[intro][result]concat=n=2:v=1:a=0,trim=duration=24,"
+        "setpts=PTS-STARTPTS,fade=t=out:st=23.55:d=0.45[v0];"
+        f"[{cta}]scale=1080:1920,trim=duration=6,setpts=PTS-STARTPTS,"
+        "fps=30,settb=AVTB,format=yuv420p,fade=t=in:st=0:d=0.45[v1];"
+        f"[v0][v1]concat=n=2:v=1:a=0,trim=duration=30,setpts=PTS-STARTPTS[{output}]"
+    )
 
-    with tempfile.TemporaryDirectory(prefix="portalsimonsports-short-v13-") as temp_dir:
-        temp = Path(temp_dir)
-        cta = temp / "cta_short.png"
-        music = temp / "trilha_short.wav"
-        narrated = temp / "audio_short_narrado.wav"
-
-        _short_cta(data, cta, voice_label(voice))
-        write_soundtrack(music, 30.0, lottery_text, contest_text, 23.4, 24.0)
-        synthesize_narration_mix(data, 30.0, reveals, music, narrated, compact=True, voice=voice)
-
-        intro_duration = 5.4
-        result_duration = 18.6
-        filter_complex = (
-            f"[0:v]trim=start=0:end=0.9,setpts=PTS-STARTPTS,"
-            f"tpad=stop_mode=clone:stop_duration={intro_duration - 0.9:.3f},"
-            "fps=30,settb=AVTB,format=yuv420p[intro];"
-            f"[0:v]trim=start=7.0:end=54.0,setpts={(result_duration / 47.0):.9f}*PTS,"
-            "fps=30,settb=AVTB,format=yuv420p[result];"
-            "[intro][result]concat=n=2:v=1:a=0,trim=duration=24,"
-            "setpts=PTS-STARTPTS,fade=t=out:st=23.55:d=0.45[v0];"
-            "[1:v]scale=1080:1920,trim=duration=6,setpts=PTS-STARTPTS,"
-            "fps=30,settb=AVTB,format=yuv420p,fade=t=in:st=0:d=0.45[v1];"
-            "[v0][v1]concat=n=2:v=1:a=0,trim=duration=30,setpts=PTS-STARTPTS[v]"
-        )
 
+def _full_assets(data: Dict[str, Any], temp: Path, voice: str) -> Tuple[Path, Path]:
+    numbers = extract_numbers(data)
+    lottery_text = str(data.get("loteria") or "Loteria").strip()
+    contest_text = str(data.get("concurso") or "").strip()
+    reveals = reveal_times_full(
+        lottery_text,
+        len(numbers),
+        intro_duration=FULL_INTRO_DURATION,
+        result_duration=FULL_RESULT_DURATION,
+    )
+    overlay = temp / "moldura_horizontal.png"
+    music = temp / "trilha_completa.wav"
+    narrated = temp / "audio_completo_narrado.wav"
+
+    _horizontal_overlay(data, overlay, voice_label(voice))
+    write_soundtrack(
+        music,
+        FULL_DURATION,
+        lottery_text,
+        contest_text,
+        FULL_INTRO_DURATION + FULL_RESULT_DURATION - 5.0,
+        FULL_INTRO_DURATION + FULL_RESULT_DURATION,
+    )
+    synthesize_narration_mix(
+        data,
+        FULL_DURATION,
+        reveals,
+        music,
+        narrated,
+        compact=False,
+        voice=voice,
+    )
+    return overlay, narrated
+
+
+def _full_graph(
+    source: str,
+    overlay: str,
+    output: str,
+    intro: float = FULL_INTRO_DURATION,
+    result: float = FULL_RESULT_DURATION,
+    closing: float = FULL_CLOSING_DURATION,
+    duration: float = FULL_DURATION,
+) -> str:
+    return (
+        f"[{source}]split=3[full_a][full_b][full_c];"
+        f"[full_a]trim=start=0:end=0.9,setpts=PTS-STARTPTS,"
+        f"tpad=stop_mode=clone:stop_duration={intro - 0.9:.3f}[full_intro];"
+        f"[full_b]trim=start=7.0:end=54.0,setpts={(result / 47.0):.9f}*PTS[full_result];"
+        f"[full_c]trim=start=53.1:end=54.0,setpts=PTS-STARTPTS,"
+        f"tpad=stop_mode=clone:stop_duration={closing - 0.9:.3f}[closing];"
+        f"[full_intro][full_result][closing]concat=n=3:v=1:a=0,trim=duration={duration:.0f},"
+        "setpts=PTS-STARTPTS,split=2[bg][fg];"
+        "[bg]scale=1920:1080:force_original_aspect_ratio=increase,crop=1920:1080,"
+        "boxblur=28:2,eq=brightness=-0.24:saturation=1.18[bg2];"
+        "[fg]scale=-2:1080[fg2];"
+        "[bg2][fg2]overlay=(W-w)/2:0[main];"
+        f"[main][{overlay}]overlay=0:0,format=yuv420p[{output}]"
+    )
+
+
+def _create_short(base_video: Path, data: Dict[str, Any], output_dir: Path, voice: str) -> Path:
+    output = output_dir / _output_name(data, "short", "30s")
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-short-v13-") as temp_dir:
+        cta, narrated = _short_assets(data, Path(temp_dir), voice)
         visual._run([
             "ffmpeg", "-y",
             "-i", str(base_video),
             "-loop", "1", "-t", "6", "-i", str(cta),
             "-i", str(narrated),
-            "-filter_complex", filter_complex,
+            "-filter_complex", _short_graph("0:v", "1:v", "v"),
             "-map", "[v]", "-map", "2:a:0",
-            "-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p",
+            *X264_ARGS,
             "-c:a", "aac", "-b:a", "192k", "-t", "30",
             "-movflags", "+faststart", str(output),
         ])
@@ -174,92 +252,112 @@ def _create_short(base_video: Path, data: Dict[str, Any], output_dir: Path, voic
 
 
 def _create_full(base_video: Path, data: Dict[str, Any], output_dir: Path, voice: str) -> Path:
-    numbers = extract_numbers(data)
-    lottery_text = str(data.get("loteria") or "Loteria").strip()
-    contest_text = str(data.get("concurso") or "").strip()
-    lottery = visual._slug(lottery_text) or "loteria"
-    contest = visual._slug(contest_text or "resultado") or "resultado"
-    output = output_dir / f"video_completo_{lottery}_{contest}_{round(FULL_DURATION)}s_voz_v13.mp4"
-    reveals = reveal_times_full(
-        lottery_text,
-        len(numbers),
-        intro_duration=FULL_INTRO_DURATION,
-        result_duration=FULL_RESULT_DURATION,
-    )
-
+    output = output_dir / _output_name(data, "video_completo", f"{round(FULL_DURATION)}s")
     with tempfile.TemporaryDirectory(prefix="portalsimonsports-completo-v13-") as temp_dir:
-        temp = Path(temp_dir)
-        overlay = temp / "moldura_horizontal.png"
-        music = temp / "trilha_completa.wav"
-        narrated = temp / "audio_completo_narrado.wav"
-
-        _horizontal_overlay(data, overlay, voice_label(voice))
-        write_soundtrack(
-            music,
-            FULL_DURATION,
-            lottery_text,
-            contest_text,
-            FULL_INTRO_DURATION + FULL_RESULT_DURATION - 5.0,
-            FULL_INTRO_DURATION + FULL_RESULT_DURATION,
-        )
-        synthesize_narration_mix(
-            data,
-            FULL_DURATION,
-            reveals,
-            music,
-            narrated,
-            compact=False,
-            voice=voice,
-        )
-
-        filter_complex = (
-            f"[0:v]trim=start=0:end=0.9,setpts=PTS-STARTPTS,"
-            f"tpad=stop_mode=clone:stop_duration={FULL_INTRO_DURATION - 0.9:.3f}[intro];"
-            f"[0:v]trim=start=7.0:end=54.0,setpts={(FULL_RESULT_DURATION / 47.0):.9f}*PTS[result];"
-            f"[0:v]trim=start=53.1:end=54.0,setpts=PTS-STARTPTS,"
-            f"tpad=stop_mode=clone:stop_duration={FULL_CLOSING_DURATION - 0.9:.3f}[closing];"
-            f"[intro][result][closing]concat=n=3:v=1:a=0,trim=duration={FULL_DURATION:.0f},"
-            "setpts=PTS-STARTPTS,split=2[bg][fg];"
-            "[bg]scale=1920:1080:force_original_aspect_ratio=increase,crop=1920:1080,"
-            "boxblur=28:2,eq=brightness=-0.24:saturation=1.18[bg2];"
-            "[fg]scale=-2:1080[fg2];"
-            "[bg2][fg2]overlay=(W-w)/2:0[main];"
-            "[main][1:v]overlay=0:0,format=yuv420p[v]"
-        )
-
+        overlay, narrated = _full_assets(data, Path(temp_dir), voice)
         visual._run([
             "ffmpeg", "-y",
             "-i", str(base_video),
             "-loop", "1", "-t", f"{FULL_DURATION:.3f}", "-i", str(overlay),
             "-i", str(narrated),
-            "-filter_complex", filter_complex,
+            "-filter_complex", _full_graph("0:v", "1:v", "v"),
             "-map", "[v]", "-map", "2:a:0",
-            "-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p",
+            *X264_ARGS,
             "-c:a", "aac", "-b:a", "192k", "-t", f"{FULL_DURATION:.3f}",
             "-movflags", "+faststart", str(output),
         ])
     return output
 
 
+def _encode_outputs(
+    base_video: Path,
+    data: Dict[str, Any],
+    short: Tuple[Path, Path, Path],
+    full: Tuple[Path, Path, Path],
+    full_timing: Optional[Dict[str, float]] = None,
+) -> None:
+    """Short e completo numa única chamada: a base sem perdas é decodificada uma vez,
+    recebe a assinatura visual do V9 e é dividida entre as duas codificações finais.
+
+    ``short`` e ``full`` são (imagem, áudio narrado, saída); ``full_timing`` troca as
+    durações do completo (intro, result, closing, duration) para as versões seguintes.
+    """
+    cta, short_audio, short_output = short
+    overlay, full_audio, full_output = full
+    timing = full_timing or {}
+    duration = timing.get("duration", FULL_DURATION)
+    graph = (
+        f"[0:v]{base_v9.signature_filter(data)},split=2[short_src][full_src];"
+        + _short_graph("short_src", "1:v", "short")
+        + ";"
+        + _full_graph("full_src", "2:v", "full", **timing)
+    )
+    visual._run([
+        "ffmpeg", "-y",
+        "-i", str(base_video),
+        "-loop", "1", "-t", "6", "-i", str(cta),
+        "-loop", "1", "-t", f"{duration:.3f}", "-i", str(overlay),
+        "-i", str(short_audio),
+        "-i", str(full_audio),
+        "-filter_complex", graph,
+        "-map", "[short]", "-map", "3:a:0",
+        *X264_ARGS,
+        "-c:a", "aac", "-b:a", "192k", "-t", "30",
+        "-movflags", "+faststart", str(short_output),
+        "-map", "[full]", "-map", "4:a:0",
+        *X264_ARGS,
+        "-c:a", "aac", "-b:a", "192k", "-t", f"{duration:.3f}",
+        "-movflags", "+faststart", str(full_output),
+    ])
+
+
+def _create_outputs(base_video: Path, data: Dict[str, Any], output_dir: Path, voice: str) -> Tuple[Path, Path]:
+    short_output = output_dir / _output_name(data, "short", "30s")
+    full_output = output_dir / _output_name(data, "video_completo", f"{round(FULL_DURATION)}s")
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-pacote-v13-") as temp_dir:
+        temp = Path(temp_dir)
+        cta, short_audio = _short_assets(data, temp, voice)
+        overlay, full_audio = _full_assets(data, temp, voice)
+        _encode_outputs(base_video, data, (cta, short_audio, short_output), (overlay, full_audio, full_output))
+    return short_output, full_output
+
+
 def gerar_pacote(data: Dict[str, Any]) -> Dict[str, str]:
     output_dir = Path(str(data.get("output_dir") or "output"))
     output_dir.mkdir(parents=True, exist_ok=True)
 
     selected_voice = select_voice(data)
     presenter = voice_label(selected_voice)
-    base_video = Path(visual.gerar_base_vertical(data))
-    short_path = _create_short(base_video, data, output_dir, selected_voice)
-    full_path = _create_full(base_video, data, output_dir, selected_voice)
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    if ENCODE_MODE == "separada":
+        base_video = Path(visual.gerar_base_vertical(data))
+        timings["base"] = time.perf_counter() - started
+        short_path = _create_short(base_video, data, output_dir, selected_voice)
+        full_path = _create_full(base_video, data, output_dir, selected_voice)
+        base = str(base_video)
+    else:
+        with tempfile.TemporaryDirectory(prefix="portalsimonsports-base-v13-") as temp_dir:
+            base_video = Path(base_v9.gerar_base_intermediaria({**data, "output_dir": temp_dir}))
+            timings["base"] = time.perf_counter() - started
+            short_path, full_path = _create_outputs(base_video, data, output_dir, selected_voice)
+        base = ""
+    timings["saidas"] = time.perf_counter() - started - timings["base"]
 
     print(
         f"[VÍDEO {VERSION}] Voz única desta edição: {presenter} | "
         f"Short={short_path.name} | completo={full_path.name}",
         flush=True,
     )
+    print(
+        f"[VÍDEO {VERSION}] Codificação ({ENCODE_MODE}): base={timings['base']:.1f}s | "
+        f"Short+completo={timings['saidas']:.1f}s | total={sum(timings.values()):.1f}s",
+        flush=True,
+    )
     return {
         "short": str(short_path),
         "completo": str(full_path),
-        "base": str(base_video),
+        "base": base,
         "voz": presenter,
     }
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import tempfile
+import time
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
@@ -25,40 +26,54 @@ FULL_RESULT_DURATION = 78.0
 FULL_CLOSING_DURATION = 42.0
 
 
-def _create_short(base_video: Path, data: Dict[str, Any], output_dir: Path, voice: str) -> Path:
+SHORT_INTRO_DURATION = 5.4
+SHORT_RESULT_DURATION = 18.6
+
+
+def _output_names(data: Dict[str, Any], output_dir: Path) -> Tuple[Path, Path]:
+    lottery = v13.visual._slug(str(data.get("loteria") or "Loteria").strip()) or "loteria"
+    contest = v13.visual._slug(str(data.get("concurso") or "").strip() or "resultado") or "resultado"
+    return (
+        output_dir / f"short_{lottery}_{contest}_30s_voz_v17.mp4",
+        output_dir / f"video_completo_{lottery}_{contest}_{round(FULL_DURATION)}s_dialogo_v17.mp4",
+    )
+
+
+def _short_assets(data: Dict[str, Any], temp: Path, voice: str) -> Tuple[Path, Path]:
     lottery_text = str(data.get("loteria") or "Loteria").strip()
     contest_text = str(data.get("concurso") or "").strip()
-    lottery = v13.visual._slug(lottery_text) or "loteria"
-    contest = v13.visual._slug(contest_text or "resultado") or "resultado"
-    output = output_dir / f"short_{lottery}_{contest}_30s_voz_v17.mp4"
     numbers = extract_numbers(data)
-
-    intro_duration = 5.4
-    result_duration = 18.6
     reveals = reveal_times_short(
         lottery_text,
         len(numbers),
-        intro_duration=intro_duration,
-        result_duration=result_duration,
+        intro_duration=SHORT_INTRO_DURATION,
+        result_duration=SHORT_RESULT_DURATION,
     )
+    cta = temp / "cta_short.png"
+    music = temp / "trilha_short.wav"
+    narrated = temp / "audio_short_narrado.wav"
 
-    with tempfile.TemporaryDirectory(prefix="portalsimonsports-short-v17-") as temp_dir:
-        temp = Path(temp_dir)
-        cta = temp / "cta_short.png"
-        music = temp / "trilha_short.wav"
-        narrated = temp / "audio_short_narrado.wav"
+    v13._short_cta(data, cta, voice_label(voice))
+    v13.write_soundtrack(music, 30.0, lottery_text, contest_text, 23.4, 24.0)
+    synthesize_single_mix(
+        data,
+        30.0,
+        reveals,
+        music,
+        narrated,
+        compact=True,
+        voice=voice,
+    )
+    return cta, narrated
 
-        v13._short_cta(data, cta, voice_label(voice))
-        v13.write_soundtrack(music, 30.0, lottery_text, contest_text, 23.4, 24.0)
-        synthesize_single_mix(
-            data,
-            30.0,
-            reveals,
-            music,
-            narrated,
-            compact=True,
-            voice=voice,
-        )
+
+def _create_short(base_video: Path, data: Dict[str, Any], output_dir: Path, voice: str) -> Path:
+    output = _output_names(data, output_dir)[0]
+    intro_duration = SHORT_INTRO_DURATION
+    result_duration = SHORT_RESULT_DURATION
+
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-short-v17-") as temp_dir:
+        cta, narrated = _short_assets(data, Path(temp_dir), voice)
 
         filter_complex = (
             f"[0:v]trim=start=0:end=0.9,setpts=PTS-STARTPTS,"
@@ -87,71 +102,78 @@ def _create_short(base_video: Path, data: Dict[str, Any], output_dir: Path, voic
     return output
 
 
-def _create_full(
-    base_video: Path,
+def _full_assets(
     data: Dict[str, Any],
-    output_dir: Path,
+    temp: Path,
     pair: Tuple[str, str],
     fallback_voice: str,
-) -> Tuple[Path, str, bool]:
+) -> Tuple[Path, Path, str, bool]:
     numbers = extract_numbers(data)
     lottery_text = str(data.get("loteria") or "Loteria").strip()
     contest_text = str(data.get("concurso") or "").strip()
-    lottery = v13.visual._slug(lottery_text) or "loteria"
-    contest = v13.visual._slug(contest_text or "resultado") or "resultado"
-    output = output_dir / f"video_completo_{lottery}_{contest}_{round(FULL_DURATION)}s_dialogo_v17.mp4"
     reveals = reveal_times_full(
         lottery_text,
         len(numbers),
         intro_duration=FULL_INTRO_DURATION,
         result_duration=FULL_RESULT_DURATION,
     )
+    overlay = temp / "moldura_horizontal.png"
+    music = temp / "trilha_completa.wav"
+    narrated = temp / "audio_completo_narrado.wav"
 
-    with tempfile.TemporaryDirectory(prefix="portalsimonsports-completo-v17-") as temp_dir:
-        temp = Path(temp_dir)
-        overlay = temp / "moldura_horizontal.png"
-        music = temp / "trilha_completa.wav"
-        narrated = temp / "audio_completo_narrado.wav"
+    v13.write_soundtrack(
+        music,
+        FULL_DURATION,
+        lottery_text,
+        contest_text,
+        FULL_INTRO_DURATION + FULL_RESULT_DURATION - 5.0,
+        FULL_INTRO_DURATION + FULL_RESULT_DURATION,
+    )
 
-        v13.write_soundtrack(
+    used_dialogue = True
+    presenter = pair_label(pair)
+    try:
+        synthesize_dialogue_mix(
+            data,
+            FULL_DURATION,
+            reveals,
             music,
+            narrated,
+            pair=pair,
+        )
+    except Exception as dialogue_error:
+        used_dialogue = False
+        presenter = voice_label(fallback_voice)
+        print(
+            f"[VÍDEO {VERSION}] Diálogo indisponível ({dialogue_error}). "
+            f"Aplicando fallback individual com {presenter}.",
+            flush=True,
+        )
+        synthesize_single_mix(
+            data,
             FULL_DURATION,
-            lottery_text,
-            contest_text,
-            FULL_INTRO_DURATION + FULL_RESULT_DURATION - 5.0,
-            FULL_INTRO_DURATION + FULL_RESULT_DURATION,
+            reveals,
+            music,
+            narrated,
+            compact=False,
+            voice=fallback_voice,
         )
 
-        used_dialogue = True
-        presenter = pair_label(pair)
-        try:
-            synthesize_dialogue_mix(
-                data,
-                FULL_DURATION,
-                reveals,
-                music,
-                narrated,
-                pair=pair,
-            )
-        except Exception as dialogue_error:
-            used_dialogue = False
-            presenter = voice_label(fallback_voice)
-            print(
-                f"[VÍDEO {VERSION}] Diálogo indisponível ({dialogue_error}). "
-                f"Aplicando fallback individual com {presenter}.",
-                flush=True,
-            )
-            synthesize_single_mix(
-                data,
-                FULL_DURATION,
-                reveals,
-                music,
-                narrated,
-                compact=False,
-                voice=fallback_voice,
-            )
+    v13._horizontal_overlay(data, overlay, presenter)
+    return overlay, narrated, presenter, used_dialogue
+
+
+def _create_full(
+    base_video: Path,
+    data: Dict[str, Any],
+    output_dir: Path,
+    pair: Tuple[str, str],
+    fallback_voice: str,
+) -> Tuple[Path, str, bool]:
+    output = _output_names(data, output_dir)[1]
 
-        v13._horizontal_overlay(data, overlay, presenter)
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-completo-v17-") as temp_dir:
+        overlay, narrated, presenter, used_dialogue = _full_assets(data, Path(temp_dir), pair, fallback_voice)
 
         filter_complex = (
             f"[0:v]trim=start=0:end=0.9,setpts=PTS-STARTPTS,"
@@ -182,6 +204,35 @@ def _create_full(
     return output, presenter, used_dialogue
 
 
+def _create_outputs(
+    base_video: Path,
+    data: Dict[str, Any],
+    output_dir: Path,
+    voice: str,
+    pair: Tuple[str, str],
+    fallback_voice: str,
+) -> Tuple[Path, Path, str, bool]:
+    """Short e completo do V17 na codificação única do V13 (base sem perdas + assinatura no filtro)."""
+    short_output, full_output = _output_names(data, output_dir)
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-pacote-v17-") as temp_dir:
+        temp = Path(temp_dir)
+        cta, short_audio = _short_assets(data, temp, voice)
+        overlay, full_audio, presenter, used_dialogue = _full_assets(data, temp, pair, fallback_voice)
+        v13._encode_outputs(
+            base_video,
+            data,
+            (cta, short_audio, short_output),
+            (overlay, full_audio, full_output),
+            full_timing={
+                "intro": FULL_INTRO_DURATION,
+                "result": FULL_RESULT_DURATION,
+                "closing": FULL_CLOSING_DURATION,
+                "duration": FULL_DURATION,
+            },
+        )
+    return short_output, full_output, presenter, used_dialogue
+
+
 def gerar_pacote(data: Dict[str, Any]) -> Dict[str, str]:
     output_dir = Path(str(data.get("output_dir") or "output"))
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -190,14 +241,33 @@ def gerar_pacote(data: Dict[str, Any]) -> Dict[str, str]:
     presenter_pair = select_presenter_pair(data)
     fallback_voice = short_voice
 
-    base_video = Path(v13.visual.gerar_base_vertical(data))
-    short_path = _create_short(base_video, data, output_dir, short_voice)
-    full_path, presenter, used_dialogue = _create_full(
-        base_video,
-        data,
-        output_dir,
-        presenter_pair,
-        fallback_voice,
+    started = time.perf_counter()
+    if v13.ENCODE_MODE == "separada":
+        base_video = Path(v13.visual.gerar_base_vertical(data))
+        short_path = _create_short(base_video, data, output_dir, short_voice)
+        full_path, presenter, used_dialogue = _create_full(
+            base_video,
+            data,
+            output_dir,
+            presenter_pair,
+            fallback_voice,
+        )
+        base = str(base_video)
+    else:
+        with tempfile.TemporaryDirectory(prefix="portalsimonsports-base-v17-") as temp_dir:
+            base_video = Path(v13.base_v9.gerar_base_intermediaria({**data, "output_dir": temp_dir}))
+            short_path, full_path, presenter, used_dialogue = _create_outputs(
+                base_video,
+                data,
+                output_dir,
+                short_voice,
+                presenter_pair,
+                fallback_voice,
+            )
+        base = ""
+    print(
+        f"[VÍDEO {VERSION}] Codificação ({v13.ENCODE_MODE}): total={time.perf_counter() - started:.1f}s",
+        flush=True,
     )
 
     mode = "diálogo natural" if used_dialogue else "apresentação individual automática"
@@ -209,7 +279,7 @@ def gerar_pacote(data: Dict[str, Any]) -> Dict[str, str]:
     return {
         "short": str(short_path),
         "completo": str(full_path),
-        "base": str(base_video),
+        "base": base,
         "voz": presenter,
         "modo_apresentacao": mode,
     }
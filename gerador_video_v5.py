@@ -11,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Sequence, Tuple
 
+from media_cache import SOUNDTRACK_CACHE, MediaCache
 from video_visual_v5 import WIDTH, HEIGHT, criar_poster, prepare_numbers, scene_image
 
 DEFAULT_DURATION = 30.0
@@ -131,12 +132,18 @@ def _lottery_key(loteria: str) -> int:
 
 def _write_soundtrack(path: Path, duration: float, loteria: str, final_time: float, cta_time: float) -> None:
     """Trilha eletrônica contínua, original e gerada localmente."""
+    base_note = _lottery_key(loteria)
+    cache_key = MediaCache.key(
+        "gerador_video_v5", AUDIO_SAMPLE_RATE, base_note, float(duration), float(final_time), float(cta_time)
+    )
+    if SOUNDTRACK_CACHE.fetch(cache_key, path):
+        return
+
     total_samples = max(1, int(duration * AUDIO_SAMPLE_RATE))
     pcm = array("h")
     bpm = 124.0
     beat_seconds = 60.0 / bpm
     bar_seconds = beat_seconds * 4.0
-    base_note = _lottery_key(loteria)
     progression = [(0, (0, 3, 7)), (-4, (0, 4, 7)), (3, (0, 4, 7)), (-2, (0, 4, 7))]
 
     for sample_index in range(total_samples):
@@ -202,11 +209,13 @@ def _write_soundtrack(path: Path, duration: float, loteria: str, final_time: flo
         pcm.append(int(max(-1.0, min(1.0, left)) * 32767))
         pcm.append(int(max(-1.0, min(1.0, right)) * 32767))
 
+    Path(path).unlink(missing_ok=True)
     with wave.open(str(path), "wb") as audio:
         audio.setnchannels(2)
         audio.setsampwidth(2)
         audio.setframerate(AUDIO_SAMPLE_RATE)
         audio.writeframes(pcm.tobytes())
+    SOUNDTRACK_CACHE.store(cache_key, path)
 
 
 def gerar_video_loteria(data: Dict[str, Any]) -> str:
@@ -6,12 +6,19 @@ import re
 import shutil
 import subprocess
 import tempfile
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Sequence, Tuple
 
 from PIL import Image, ImageDraw
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from gerador_video_v5 import _write_soundtrack
 from video_visual_v6 import (
     HEIGHT,
@@ -31,6 +38,19 @@ DURATION = 60.0
 BACKGROUND_SCALE = 1.035
 FOCUS_DIAMETER = 300
 
+REVEAL_START, REVEAL_FADE = 5.60, 0.85
+RESULT_START, RESULT_FADE = 49.00, 0.85
+CTA_START, CTA_FADE = 54.20, 0.90
+
+# python = todos os quadros em Python | trechos = trechos estáticos gerados pelo FFmpeg
+# filtergraph = só quadros-chave; crop, xfade, zoompan e overlay num único FFmpeg
+RENDER_MODE = os.getenv("VIDEO_RENDER_MODE", "python")
+MIN_STATIC_FRAMES = 8
+# numpy = buffers pré-alocados e escrita por memoryview | pil = um Image e um bytes por quadro
+FRAME_PIPELINE = os.getenv("VIDEO_FRAME_PIPELINE", "numpy" if np is not None else "pil")
+VIDEO_CODEC = ("-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p")
+LOSSLESS_CODEC = ("-c:v", "ffv1", "-pix_fmt", "yuv420p")
+
 
 def _slug(value: str) -> str:
     text = (value or "").strip().lower()
@@ -45,6 +65,12 @@ def _ffmpeg_binary() -> str:
     return executable
 
 
+def _run(command: Sequence[str]) -> None:
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Falha no FFmpeg V7: {process.stderr[-5000:]}")
+
+
 def _reveal_times(loteria: str, count: int) -> List[float]:
     if count <= 0:
         return []
@@ -118,8 +144,7 @@ def _target_geometry(position: Tuple[int, int, int], scaled_background: Image.Im
     return center_x, center_y, diameter * BACKGROUND_SCALE
 
 
-def _draw_focus_ball(
-    frame: Image.Image,
+def _focus_overlay(
     sprite: Image.Image,
     progress: float,
     target: Tuple[float, float, float],
@@ -177,131 +202,676 @@ def _draw_focus_ball(
     left = round(center_x - sprite_size / 2)
     top = round(center_y - sprite_size / 2)
     overlay.alpha_composite(rendered, (left, top))
+    return overlay
+
+
+def _draw_focus_ball(
+    frame: Image.Image,
+    sprite: Image.Image,
+    progress: float,
+    target: Tuple[float, float, float],
+    data: Dict[str, Any],
+) -> Image.Image:
+    overlay = _focus_overlay(sprite, progress, target, data)
     return Image.alpha_composite(frame.convert("RGBA"), overlay).convert("RGB")
 
 
+@dataclass
+class _Scenes:
+    """Quadros-chave já escalados e dados de tempo usados por todos os renderizadores."""
+
+    data: Dict[str, Any]
+    positions: List[Tuple[int, int, int]]
+    reveal_times: List[float]
+    animation_duration: float
+    intro: Image.Image
+    cumulative: List[Image.Image]
+    final_frame: Image.Image
+    cta: Image.Image
+    sprites: List[Image.Image]
+
+
+def _build_scenes(data: Dict[str, Any], loteria: str, numbers: List[str]) -> _Scenes:
+    positions = number_positions(loteria, numbers)
+    reveal_times = _reveal_times(loteria, len(numbers))
+
+    intro = _scaled_frame(render_intro(data))
+    reveal_zero = render_reveal_background(data, final=False).convert("RGBA")
+    cumulative: List[Image.Image] = [_scaled_frame(reveal_zero)]
+    working = reveal_zero.copy()
+    sprites: List[Image.Image] = []
+    for number, position in zip(numbers, positions):
+        sprites.append(_ball_sprite(data, number))
+        working = Image.alpha_composite(working, render_ball_overlay(data, number, position, newest=False))
+        cumulative.append(_scaled_frame(working))
+
+    final_working = render_reveal_background(data, final=True).convert("RGBA")
+    for number, position in zip(numbers, positions):
+        final_working = Image.alpha_composite(final_working, render_ball_overlay(data, number, position, newest=False))
+    return _Scenes(
+        data=data,
+        positions=positions,
+        reveal_times=reveal_times,
+        animation_duration=_event_duration(reveal_times),
+        intro=intro,
+        cumulative=cumulative,
+        final_frame=_scaled_frame(final_working),
+        cta=_scaled_frame(render_cta(data)),
+        sprites=sprites,
+    )
+
+
+def _active_reveal(scenes: _Scenes, t: float) -> int | None:
+    return next(
+        (index for index, start in enumerate(scenes.reveal_times) if start <= t < start + scenes.animation_duration),
+        None,
+    )
+
+
+def _static_source(scenes: _Scenes, t: float) -> Image.Image | None:
+    """Imagem da qual o quadro em ``t`` é apenas um recorte, ou None se houver animação."""
+    if t < REVEAL_START:
+        return scenes.intro
+    if t < REVEAL_START + REVEAL_FADE:
+        return None
+    if t >= CTA_START:
+        return scenes.cta if _ease((t - CTA_START) / CTA_FADE) >= 1.0 else None
+    if t >= RESULT_START:
+        return scenes.final_frame if _ease((t - RESULT_START) / RESULT_FADE) >= 1.0 else None
+    if _active_reveal(scenes, t) is not None:
+        return None
+    shown = sum(1 for start in scenes.reveal_times if t >= start + scenes.animation_duration)
+    return scenes.cumulative[min(shown, len(scenes.cumulative) - 1)]
+
+
+def _compose_frame(scenes: _Scenes, t: float) -> Image.Image:
+    source = _static_source(scenes, t)
+    if source is not None:
+        # Com a transição concluída, Image.blend(a, b, 1.0) devolve b: o recorte é idêntico.
+        return _moving_crop(source, t)
+    if t < REVEAL_START + REVEAL_FADE:
+        return Image.blend(
+            _moving_crop(scenes.intro, t),
+            _moving_crop(scenes.cumulative[0], t),
+            _ease((t - REVEAL_START) / REVEAL_FADE),
+        )
+    if t >= CTA_START:
+        return Image.blend(
+            _moving_crop(scenes.final_frame, t),
+            _moving_crop(scenes.cta, t),
+            _ease((t - CTA_START) / CTA_FADE),
+        )
+    if t >= RESULT_START:
+        return Image.blend(
+            _moving_crop(scenes.cumulative[-1], t),
+            _moving_crop(scenes.final_frame, t),
+            _ease((t - RESULT_START) / RESULT_FADE),
+        )
+
+    active = _active_reveal(scenes, t)
+    event_progress = (t - scenes.reveal_times[active]) / scenes.animation_duration
+    base_before = _moving_crop(scenes.cumulative[active], t)
+    if event_progress > 0.82:
+        base_after = _moving_crop(scenes.cumulative[active + 1], t)
+        base_frame = Image.blend(
+            base_before,
+            base_after,
+            _ease((event_progress - 0.82) / 0.18),
+        )
+    else:
+        base_frame = base_before
+    target = _target_geometry(scenes.positions[active], scenes.cumulative[active], t)
+    return _draw_focus_ball(
+        base_frame,
+        scenes.sprites[active],
+        event_progress,
+        target,
+        scenes.data,
+    )
+
+
+class _NumpyFrames:
+    """Compõe quadros em buffers NumPy pré-alocados, sem criar imagens por quadro.
+
+    Recorte é uma fatia copiada para o buffer de saída; a mistura repete a conta
+    do Image.blend do Pillow em float32 (mesmo arredondamento), então os bytes
+    saem idênticos aos de _compose_frame.
+    """
+
+    def __init__(self, scenes: _Scenes) -> None:
+        self.scenes = scenes
+        self.arrays: Dict[int, "np.ndarray"] = {}
+        for image in (scenes.intro, *scenes.cumulative, scenes.final_frame, scenes.cta):
+            self.arrays.setdefault(id(image), np.asarray(image.convert("RGB")))
+        shape = (HEIGHT, WIDTH, 3)
+        self.frame = np.empty(shape, dtype=np.uint8)
+        self.other = np.empty(shape, dtype=np.uint8)
+        self.mix = np.empty(shape, dtype=np.float32)
+        self.mix_other = np.empty(shape, dtype=np.float32)
+
+    def _crop(self, image: Image.Image, t: float, out: "np.ndarray") -> "np.ndarray":
+        x, y = _crop_offsets(image, t)
+        np.copyto(out, self.arrays[id(image)][y:y + HEIGHT, x:x + WIDTH])
+        return out
+
+    def _blend(self, first: Image.Image, second: Image.Image, t: float, alpha: float) -> "np.ndarray":
+        # Pillow: out = (UINT8)(in1 + (float)alpha * (in2 - in1)), com truncamento.
+        self._crop(first, t, self.frame)
+        self._crop(second, t, self.other)
+        np.copyto(self.mix, self.frame)
+        np.copyto(self.mix_other, self.other)
+        np.subtract(self.mix_other, self.mix, out=self.mix_other)
+        np.multiply(self.mix_other, np.float32(alpha), out=self.mix_other)
+        np.add(self.mix, self.mix_other, out=self.mix)
+        np.copyto(self.frame, self.mix, casting="unsafe")
+        return self.frame
+
+    def _composite(self, overlay: Image.Image) -> None:
+        box = overlay.getbbox()
+        if not box:
+            return
+        left, top, right, bottom = box
+        region = Image.fromarray(self.frame[top:bottom, left:right]).convert("RGBA")
+        merged = Image.alpha_composite(region, overlay.crop(box)).convert("RGB")
+        self.frame[top:bottom, left:right] = np.asarray(merged)
+
+    def compose(self, t: float) -> "np.ndarray":
+        scenes = self.scenes
+        source = _static_source(scenes, t)
+        if source is not None:
+            return self._crop(source, t, self.frame)
+        if t < REVEAL_START + REVEAL_FADE:
+            return self._blend(scenes.intro, scenes.cumulative[0], t, _ease((t - REVEAL_START) / REVEAL_FADE))
+        if t >= CTA_START:
+            return self._blend(scenes.final_frame, scenes.cta, t, _ease((t - CTA_START) / CTA_FADE))
+        if t >= RESULT_START:
+            return self._blend(scenes.cumulative[-1], scenes.final_frame, t, _ease((t - RESULT_START) / RESULT_FADE))
+
+        active = _active_reveal(scenes, t)
+        event_progress = (t - scenes.reveal_times[active]) / scenes.animation_duration
+        if event_progress > 0.82:
+            self._blend(
+                scenes.cumulative[active],
+                scenes.cumulative[active + 1],
+                t,
+                _ease((event_progress - 0.82) / 0.18),
+            )
+        else:
+            self._crop(scenes.cumulative[active], t, self.frame)
+        target = _target_geometry(scenes.positions[active], scenes.cumulative[active], t)
+        self._composite(_focus_overlay(scenes.sprites[active], event_progress, target, scenes.data))
+        return self.frame
+
+
+def _frame_writer(scenes: _Scenes, pipeline: str):
+    """Função t -> buffer contíguo com os bytes RGB do quadro."""
+    if pipeline == "numpy":
+        frames = _NumpyFrames(scenes)
+        return lambda t: memoryview(frames.compose(t)).cast("B")
+    return lambda t: _compose_frame(scenes, t).tobytes()
+
+
+def _raw_input() -> List[str]:
+    return [
+        _ffmpeg_binary(), "-y", "-f", "rawvideo", "-vcodec", "rawvideo", "-pix_fmt", "rgb24",
+        "-s", f"{WIDTH}x{HEIGHT}", "-r", str(FPS), "-i", "-",
+    ]
+
+
+def _pipe_frames(command: Sequence[str], log_path: Path, scenes: _Scenes, first: int, count: int) -> None:
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=log_file)
+        assert process.stdin is not None
+        try:
+            frame_at = _frame_writer(scenes, FRAME_PIPELINE)
+            for frame_index in range(first, first + count):
+                process.stdin.write(frame_at(frame_index / FPS))
+        except Exception:
+            process.kill()
+            raise
+        finally:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+        return_code = process.wait()
+
+    if return_code != 0:
+        raise RuntimeError("Falha no FFmpeg: " + log_path.read_text(encoding="utf-8", errors="replace")[-5000:])
+
+
+def _render_python(scenes: _Scenes, soundtrack: Path, video_path: Path, temp: Path, video_codec: Sequence[str]) -> None:
+    """Renderizador original: todos os quadros são compostos em Python e enviados ao FFmpeg."""
+    command = _raw_input() + [
+        "-i", str(soundtrack), "-t", f"{DURATION:.2f}", *video_codec,
+        "-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart", str(video_path),
+    ]
+    _pipe_frames(command, temp / "ffmpeg.log", scenes, 0, round(DURATION * FPS))
+
+
+def _round_matches_ffmpeg(value: float) -> bool:
+    """round() do Python arredonda empates para o par; o do FFmpeg, para longe do zero."""
+    return round(value) == math.floor(value + 0.5)
+
+
+def _crop_axes(image: Image.Image) -> Tuple[float, float, float, float]:
+    max_x = max(0, image.width - WIDTH)
+    max_y = max(0, image.height - HEIGHT)
+    return max_x / 2, min(max_x / 2, 7 * WIDTH / 1080.0), max_y / 2, min(max_y / 2, 6 * WIDTH / 1080.0)
+
+
+def _ffmpeg_safe_crop(image: Image.Image, t: float) -> bool:
+    x_center, x_swing, y_center, y_swing = _crop_axes(image)
+    return _round_matches_ffmpeg(x_center + x_swing * math.sin(t * 0.22)) and _round_matches_ffmpeg(
+        y_center + y_swing * math.cos(t * 0.19)
+    )
+
+
+def _plan_spans(scenes: _Scenes, total_frames: int) -> List[Tuple[int, int, Image.Image | None]]:
+    """Divide a linha do tempo em trechos estáticos (recorte móvel de uma imagem) e animados."""
+    keys: List[Image.Image | None] = []
+    for frame_index in range(total_frames):
+        t = frame_index / FPS
+        source = _static_source(scenes, t)
+        if source is not None and not _ffmpeg_safe_crop(source, t):
+            source = None
+        keys.append(source)
+
+    spans: List[Tuple[int, int, Image.Image | None]] = []
+    first = 0
+    for frame_index in range(1, total_frames + 1):
+        if frame_index < total_frames and keys[frame_index] is keys[first]:
+            continue
+        source = keys[first]
+        count = frame_index - first
+        if source is not None and count < MIN_STATIC_FRAMES:
+            source = None
+        if spans and source is None and spans[-1][2] is None:
+            previous_first, previous_count, _ = spans[-1]
+            spans[-1] = (previous_first, previous_count + count, None)
+        else:
+            spans.append((first, count, source))
+        first = frame_index
+    return spans
+
+
+def _static_segment_command(still: Path, image: Image.Image, first: int, count: int, output: Path, video_codec: Sequence[str]) -> List[str]:
+    x_center, x_swing, y_center, y_swing = _crop_axes(image)
+    t = f"(({first}+n)/{FPS})"
+    x_expr = f"round({x_center!r}+{x_swing!r}*sin({t}*0.22))"
+    y_expr = f"round({y_center!r}+{y_swing!r}*cos({t}*0.19))"
+    return [
+        _ffmpeg_binary(), "-y", "-loop", "1", "-framerate", str(FPS), "-i", str(still),
+        "-vf", f"crop=w={WIDTH}:h={HEIGHT}:x='{x_expr}':y='{y_expr}'",
+        "-frames:v", str(count), "-an", *video_codec, str(output),
+    ]
+
+
+def _render_spans(scenes: _Scenes, soundtrack: Path, video_path: Path, temp: Path, video_codec: Sequence[str]) -> None:
+    """Trechos estáticos saem direto do FFmpeg (imagem em loop + crop com expressão de tempo);
+    só as janelas animadas são compostas em Python. Os trechos são unidos sem recodificar."""
+    total_frames = round(DURATION * FPS)
+    stills: Dict[int, Path] = {}
+    segments: List[Path] = []
+    for index, (first, count, source) in enumerate(_plan_spans(scenes, total_frames)):
+        segment = temp / f"trecho_{index:03d}.mkv"
+        if source is None:
+            command = _raw_input() + ["-frames:v", str(count), "-an", *video_codec, str(segment)]
+            _pipe_frames(command, temp / f"trecho_{index:03d}.log", scenes, first, count)
+        else:
+            still = stills.get(id(source))
+            if still is None:
+                still = temp / f"quadro_{len(stills):02d}.ppm"
+                source.save(still)
+                stills[id(source)] = still
+            _run(_static_segment_command(still, source, first, count, segment, video_codec))
+        segments.append(segment)
+
+    concat_file = temp / "trechos.txt"
+    concat_file.write_text("\n".join(f"file '{path.as_posix()}'" for path in segments), encoding="utf-8")
+    _run([
+        _ffmpeg_binary(), "-y", "-f", "concat", "-safe", "0", "-i", str(concat_file), "-i", str(soundtrack),
+        "-map", "0:v:0", "-map", "1:a:0", "-t", f"{DURATION:.2f}", "-c:v", "copy",
+        "-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart", str(video_path),
+    ])
+
+
+# filtergraph: o Python só grava os quadros-chave; crop, xfade, zoompan e overlay
+# montam a linha do tempo inteira numa única chamada ao FFmpeg.
+FOCUS_ZOOM_RANGE = 4.0
+FOCUS_PEAK = 1.1  # _ease_out_back passa de 1 em até ~10% antes de assentar
+
+
+def _frame_window(start: float, duration: float) -> Tuple[int, int]:
+    """(primeiro quadro, quantidade) dos quadros com start <= i/FPS < start + duration."""
+    first = math.ceil(start * FPS - 1e-9)
+    return first, math.ceil((start + duration) * FPS - 1e-9) - first
+
+
+def _crop_exprs(image: Image.Image, time_expr: str) -> Tuple[str, str]:
+    x_center, x_swing, y_center, y_swing = _crop_axes(image)
+    return (
+        f"round({x_center!r}+{x_swing!r}*sin({time_expr}*0.22))",
+        f"round({y_center!r}+{y_swing!r}*cos({time_expr}*0.19))",
+    )
+
+
+def _smoothstep_expr(value: str) -> str:
+    clipped = f"clip({value},0,1)"
+    return f"({clipped}*{clipped}*(3-2*{clipped}))"
+
+
+def _focus_diameter_expr(progress: str, target_diameter: float) -> str:
+    """Curva de diâmetro de _focus_overlay escrita como expressão do FFmpeg."""
+    c1 = 1.70158
+    back = f"(({progress})/0.34-1)"
+    grow = f"(58+{FOCUS_DIAMETER - 58.0!r}*(1+{c1 + 1.0!r}*{back}*{back}*{back}+{c1!r}*{back}*{back}))"
+    pulse = f"({FOCUS_DIAMETER}*(1+0.018*sin((({progress})-0.34)/0.18*PI)))"
+    travel = f"({FOCUS_DIAMETER}+{target_diameter - FOCUS_DIAMETER!r}*{_smoothstep_expr(f'(({progress})-0.52)/0.48')})"
+    return f"if(lt({progress},0.34),{grow},if(lt({progress},0.52),{pulse},{travel}))"
+
+
+def _focus_center_exprs(progress: str, position: Tuple[int, int, int], background: Image.Image) -> Tuple[str, str]:
+    x, y, diameter = position
+    crop_x, crop_y = _crop_exprs(background, "t")
+    phase = f"if(lt({progress},0.52),0,{_smoothstep_expr(f'(({progress})-0.52)/0.48')})"
+    target_x = f"({(x + diameter / 2.0) * BACKGROUND_SCALE!r}-{crop_x})"
+    target_y = f"({(y + diameter / 2.0) * BACKGROUND_SCALE!r}-{crop_y})"
+    return (
+        f"({WIDTH * 0.5!r}+({target_x}-{WIDTH * 0.5!r})*{phase})",
+        f"({HEIGHT * 0.5!r}+({target_y}-{HEIGHT * 0.5!r})*{phase})",
+    )
+
+
+def _halo_still(data: Dict[str, Any], radius: float) -> Image.Image:
+    """Anéis e brilho do destaque no maior raio da animação; o FFmpeg reduz e esmaece."""
+    loteria = str(data.get("loteria") or data.get("produto") or "Loteria").strip()
+    primary, _dark, light = v5._palette(loteria, data.get("cor_fundo_rgb"))
+    size = 2 * math.ceil(radius + 40)
+    center = size / 2
+    halo = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(halo, "RGBA")
+    glow_r = radius * 0.72 / 0.98
+    draw.ellipse((center - glow_r, center - glow_r, center + glow_r, center + glow_r), fill=(*primary, 34))
+    for extra, width, factor in ((0, 6, 1.0), (30, 3, 0.55)):
+        r = radius + extra
+        draw.ellipse(
+            (center - r, center - r, center + r, center + r),
+            outline=(*light, round(150 * factor)),
+            width=max(1, round(width * WIDTH / 1080.0)),
+        )
+    return halo
+
+
+def _zoom_layer(source: str, output: str, size: int, scale_expr: str, fades: str, first: int, count: int) -> str:
+    """Camada RGBA ``size``x``size`` cujo conteúdo é reduzido por zoompan segundo ``scale_expr``.
+
+    A imagem fica no centro de uma tela FOCUS_ZOOM_RANGE vezes maior: zoom máximo mostra
+    o tamanho original e zoom 1 o menor tamanho possível.
+    """
+    canvas = round(size * FOCUS_ZOOM_RANGE)
+    canvas += canvas % 2
+    return (
+        f"[{source}]format=rgba,pad=w={canvas}:h={canvas}:x=(ow-iw)/2:y=(oh-ih)/2:color=black@0,"
+        f"loop=loop={count - 1}:size=1:start=0,setpts=N/({FPS}*TB),"
+        f"zoompan=z='max(1,{FOCUS_ZOOM_RANGE!r}*{scale_expr})'"
+        f":x='iw/2-iw/zoom/2':y='ih/2-ih/zoom/2':d=1:s={size}x{size}:fps={FPS},"
+        f"{fades}setpts=PTS-STARTPTS+{first}/({FPS}*TB)[{output}]"
+    )
+
+
+def _build_filtergraph(scenes: _Scenes, stills: Sequence[Image.Image], ball_size: int, ball_diameter: float, halo_size: int, halo_radius: float) -> str:
+    """Entradas na ordem: quadros-chave, uma esfera por número e um halo por número."""
+    total_frames = round(DURATION * FPS)
+    duration = scenes.animation_duration
+    transitions = [(REVEAL_START, REVEAL_FADE)]
+    transitions += [(start + 0.82 * duration, 0.18 * duration) for start in scenes.reveal_times]
+    transitions += [(RESULT_START, RESULT_FADE), (CTA_START, CTA_FADE)]
+    windows = [_frame_window(start, length) for start, length in transitions]
+
+    # Cada quadro-chave vira um trecho que começa na transição de entrada e termina no
+    # fim da transição de saída; o recorte móvel usa o tempo global do quadro.
+    chains: List[str] = []
+    starts = [0, *(first for first, _ in windows)]
+    for index, image in enumerate(stills):
+        first = starts[index]
+        last = windows[index][0] + windows[index][1] if index < len(windows) else total_frames
+        x_expr, y_expr = _crop_exprs(image, f"(({first}+n)/{FPS})")
+        chains.append(
+            f"[{index}:v]format=rgb24,loop=loop={last - first - 1}:size=1:start=0,setpts=N/({FPS}*TB),fps={FPS},"
+            f"crop=w={WIDTH}:h={HEIGHT}:x='{x_expr}':y='{y_expr}',setsar=1[base{index}]"
+        )
+    current = "base0"
+    for index, (first, count) in enumerate(windows):
+        chains.append(
+            f"[{current}][base{index + 1}]xfade=transition=fade:duration={count / FPS!r}:offset={first / FPS!r}[mix{index}]"
+        )
+        current = f"mix{index}"
+
+    sprites = len(stills)
+    halos = sprites + len(scenes.sprites)
+    for index, (start, position) in enumerate(zip(scenes.reveal_times, scenes.positions)):
+        first, count = _frame_window(start, duration)
+        # zoompan vê o tempo da própria camada (it); overlay vê o tempo do vídeo (t).
+        layer_progress = f"(({first}/{FPS}+it-{start!r})/{duration!r})"
+        diameter = _focus_diameter_expr(layer_progress, position[2] * BACKGROUND_SCALE)
+        ring_scale = f"(({diameter})*(0.56+0.42*clip({layer_progress}/0.58,0,1))/{halo_radius!r})"
+        chains.append(_zoom_layer(
+            f"{halos + index}:v", f"halo{index}", halo_size, ring_scale,
+            f"fade=t=out:st=0:d={0.58 * duration!r}:alpha=1,", first, count,
+        ))
+        chains.append(_zoom_layer(
+            f"{sprites + index}:v", f"ball{index}", ball_size, f"(({diameter})/{ball_diameter!r})",
+            f"fade=t=in:st=0:d={0.34 / 4.5 * duration!r}:alpha=1,"
+            f"fade=t=out:st={0.84 * duration!r}:d={0.16 * duration!r}:alpha=1,",
+            first, count,
+        ))
+
+        video_progress = f"((t-{start!r})/{duration!r})"
+        center_x, center_y = _focus_center_exprs(video_progress, position, scenes.cumulative[index])
+        for layer, size in ((f"halo{index}", halo_size), (f"ball{index}", ball_size)):
+            chains.append(
+                f"[{current}][{layer}]overlay=x='round({center_x}-{size / 2!r})':y='round({center_y}-{size / 2!r})'"
+                f":eval=frame:eof_action=pass[{layer}_on]"
+            )
+            current = f"{layer}_on"
+
+    chains.append(f"[{current}]format=yuv420p[video]")
+    return ";\n".join(chains)
+
+
+def _render_filtergraph(scenes: _Scenes, soundtrack: Path, video_path: Path, temp: Path, video_codec: Sequence[str]) -> None:
+    """Grava só os quadros-chave e entrega a animação inteira a um único FFmpeg.
+
+    Aproxima o modo python: as transições do xfade são lineares (o Python usa
+    suavização) e anéis/esfera são reduzidos pelo zoompan em vez de redesenhados.
+    """
+    stills = [scenes.intro, *scenes.cumulative, scenes.final_frame, scenes.cta]
+    ball_diameter = max([FOCUS_DIAMETER * FOCUS_PEAK] + [position[2] * BACKGROUND_SCALE for position in scenes.positions])
+    ball_size = round(390 * ball_diameter / 280.0)
+    ball_size += ball_size % 2
+    halo_radius = ball_diameter * 0.98
+    halo = _halo_still(scenes.data, halo_radius)
+    halo_path = temp / "halo.png"
+    halo.save(halo_path)
+
+    command: List[str] = [_ffmpeg_binary(), "-y"]
+    for index, image in enumerate(stills):
+        path = temp / f"quadro_{index:02d}.ppm"
+        image.save(path)
+        command += ["-framerate", str(FPS), "-i", str(path)]
+    for index, sprite in enumerate(scenes.sprites):
+        path = temp / f"esfera_{index:02d}.png"
+        sprite.resize((ball_size, ball_size), Image.Resampling.LANCZOS).save(path)
+        command += ["-framerate", str(FPS), "-i", str(path)]
+    for _ in scenes.sprites:
+        command += ["-framerate", str(FPS), "-i", str(halo_path)]
+    audio_index = len(stills) + 2 * len(scenes.sprites)
+    command += ["-i", str(soundtrack)]
+
+    graph = _build_filtergraph(scenes, stills, ball_size, ball_diameter, halo.width, halo_radius)
+    (temp / "filtergraph.txt").write_text(graph, encoding="utf-8")
+    command += [
+        "-filter_complex", graph, "-map", "[video]", "-map", f"{audio_index}:a:0",
+        "-t", f"{DURATION:.2f}", *video_codec, "-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart", str(video_path),
+    ]
+    _run(command)
+
+
+RENDERERS = {
+    "python": _render_python,
+    "trechos": _render_spans,
+    "filtergraph": _render_filtergraph,
+}
+
+
+def _render_mode(data: Dict[str, Any]) -> str:
+    mode = str(data.get("render_mode") or RENDER_MODE).strip().lower()
+    if mode not in RENDERERS:
+        raise RuntimeError(f"Modo de renderização desconhecido: {mode}. Use {', '.join(RENDERERS)}.")
+    return mode
+
+
 def gerar_video_loteria(data: Dict[str, Any]) -> str:
     loteria = str(data.get("loteria") or data.get("produto") or "Loteria").strip()
     concurso = str(data.get("concurso") or "").strip()
     numbers, _ = prepare_numbers(loteria, data.get("numeros") or data.get("descricao") or "")
-    positions = number_positions(loteria, numbers)
-    reveal_times = _reveal_times(loteria, len(numbers))
-    animation_duration = _event_duration(reveal_times)
+    mode = _render_mode(data)
 
     output_dir = Path(str(data.get("output_dir") or "output"))
     output_dir.mkdir(parents=True, exist_ok=True)
     video_path = output_dir / f"video_{_slug(loteria) or 'loteria'}_{_slug(concurso) or 'resultado'}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.mp4"
 
-    reveal_start, reveal_fade = 5.60, 0.85
-    result_start, result_fade = 49.00, 0.85
-    cta_start, cta_fade = 54.20, 0.90
-
     with tempfile.TemporaryDirectory(prefix="portalsimonsports-video-v7-") as temp_dir:
         temp = Path(temp_dir)
         soundtrack = temp / "soundtrack.wav"
-        _write_soundtrack(soundtrack, DURATION, loteria, result_start, cta_start)
-
-        intro = _scaled_frame(render_intro(data))
-        reveal_zero = render_reveal_background(data, final=False).convert("RGBA")
-        cumulative: List[Image.Image] = [_scaled_frame(reveal_zero)]
-        working = reveal_zero.copy()
-        sprites: List[Image.Image] = []
-        for number, position in zip(numbers, positions):
-            sprites.append(_ball_sprite(data, number))
-            working = Image.alpha_composite(working, render_ball_overlay(data, number, position, newest=False))
-            cumulative.append(_scaled_frame(working))
-
-        final_working = render_reveal_background(data, final=True).convert("RGBA")
-        for number, position in zip(numbers, positions):
-            final_working = Image.alpha_composite(final_working, render_ball_overlay(data, number, position, newest=False))
-        final_frame = _scaled_frame(final_working)
-        cta = _scaled_frame(render_cta(data))
-
-        log_path = temp / "ffmpeg.log"
-        command = [
-            _ffmpeg_binary(), "-y", "-f", "rawvideo", "-vcodec", "rawvideo", "-pix_fmt", "rgb24",
-            "-s", f"{WIDTH}x{HEIGHT}", "-r", str(FPS), "-i", "-", "-i", str(soundtrack),
-            "-t", f"{DURATION:.2f}", "-c:v", "libx264", "-preset", "veryfast", "-crf", "18",
-            "-pix_fmt", "yuv420p", "-c:a", "aac", "-b:a", "192k", "-movflags", "+faststart", str(video_path),
-        ]
-
-        with open(log_path, "w", encoding="utf-8") as log_file:
-            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=log_file)
-            assert process.stdin is not None
-            try:
-                for frame_index in range(round(DURATION * FPS)):
-                    t = frame_index / FPS
-                    if t < reveal_start:
-                        frame = _moving_crop(intro, t)
-                    elif t < reveal_start + reveal_fade:
-                        frame = Image.blend(
-                            _moving_crop(intro, t),
-                            _moving_crop(cumulative[0], t),
-                            _ease((t - reveal_start) / reveal_fade),
-                        )
-                    elif t >= cta_start:
-                        frame = Image.blend(
-                            _moving_crop(final_frame, t),
-                            _moving_crop(cta, t),
-                            _ease((t - cta_start) / cta_fade),
-                        )
-                    elif t >= result_start:
-                        frame = Image.blend(
-                            _moving_crop(cumulative[-1], t),
-                            _moving_crop(final_frame, t),
-                            _ease((t - result_start) / result_fade),
-                        )
-                    else:
-                        active = next(
-                            (index for index, start in enumerate(reveal_times) if start <= t < start + animation_duration),
-                            None,
-                        )
-                        if active is not None:
-                            event_progress = (t - reveal_times[active]) / animation_duration
-                            base_before = _moving_crop(cumulative[active], t)
-                            if event_progress > 0.82:
-                                base_after = _moving_crop(cumulative[active + 1], t)
-                                base_frame = Image.blend(
-                                    base_before,
-                                    base_after,
-                                    _ease((event_progress - 0.82) / 0.18),
-                                )
-                            else:
-                                base_frame = base_before
-                            target = _target_geometry(positions[active], cumulative[active], t)
-                            frame = _draw_focus_ball(
-                                base_frame,
-                                sprites[active],
-                                event_progress,
-                                target,
-                                data,
-                            )
-                        else:
-                            shown = sum(1 for start in reveal_times if t >= start + animation_duration)
-                            frame = _moving_crop(cumulative[min(shown, len(cumulative) - 1)], t)
-                    process.stdin.write(frame.tobytes())
-            except Exception:
-                process.kill()
-                raise
-            finally:
-                try:
-                    process.stdin.close()
-                except Exception:
-                    pass
-            return_code = process.wait()
-
-        if return_code != 0:
-            raise RuntimeError("Falha no FFmpeg: " + log_path.read_text(encoding="utf-8", errors="replace")[-5000:])
+        _write_soundtrack(soundtrack, DURATION, loteria, RESULT_START, CTA_START)
+        scenes = _build_scenes(data, loteria, numbers)
+        RENDERERS[mode](scenes, soundtrack, video_path, temp, VIDEO_CODEC)
 
     print(
-        f"[VÍDEO V7] OK: {video_path} | duração=60s | destaque central e encaixe suave | números={len(numbers)}",
+        f"[VÍDEO V7] OK: {video_path} | duração=60s | destaque central e encaixe suave | números={len(numbers)} | modo={mode}",
         flush=True,
     )
     return str(video_path)
 
 
+def _frame_digests(video: Path) -> List[str]:
+    process = subprocess.run(
+        [_ffmpeg_binary(), "-v", "error", "-i", str(video), "-map", "0:v:0", "-f", "framemd5", "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Falha ao ler quadros de {video.name}: {process.stderr[-2000:]}")
+    return [line.rsplit(",", 1)[-1].strip() for line in process.stdout.splitlines() if line and not line.startswith("#")]
+
+
+def _psnr(reference: Path, candidate: Path) -> float | None:
+    process = subprocess.run(
+        [_ffmpeg_binary(), "-i", str(reference), "-i", str(candidate), "-lavfi", "[0:v][1:v]psnr", "-f", "null", "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    match = re.search(r"average:(inf|[0-9.]+)", process.stderr)
+    if not match:
+        return None
+    return math.inf if match.group(1) == "inf" else float(match.group(1))
+
+
+def verificar_equivalencia(data: Dict[str, Any], mode: str = "trechos") -> Dict[str, Any]:
+    """Renderiza o modo original e ``mode`` sem perdas (FFV1) e compara quadro a quadro.
+
+    ``psnr_db`` mede o quanto um modo aproximado (filtergraph) se afasta do original.
+    """
+    loteria = str(data.get("loteria") or data.get("produto") or "Loteria").strip()
+    numbers, _ = prepare_numbers(loteria, data.get("numeros") or data.get("descricao") or "")
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-video-v7-eq-") as temp_dir:
+        temp = Path(temp_dir)
+        soundtrack = temp / "soundtrack.wav"
+        _write_soundtrack(soundtrack, DURATION, loteria, RESULT_START, CTA_START)
+        scenes = _build_scenes(data, loteria, numbers)
+        digests = {}
+        timings = {}
+        for name in ("python", mode):
+            work = temp / name
+            work.mkdir()
+            output = temp / f"{name}.mkv"
+            started = time.perf_counter()
+            RENDERERS[name](scenes, soundtrack, output, work, LOSSLESS_CODEC)
+            timings[name] = round(time.perf_counter() - started, 2)
+            digests[name] = _frame_digests(output)
+        psnr = _psnr(temp / "python.mkv", temp / f"{mode}.mkv")
+    reference, candidate = digests["python"], digests[mode]
+    mismatched = [index for index, (a, b) in enumerate(zip(reference, candidate)) if a != b]
+    return {
+        "modo": mode,
+        "quadros": len(reference),
+        "quadros_modo": len(candidate),
+        "divergentes": len(mismatched) + abs(len(reference) - len(candidate)),
+        "primeiro_divergente": mismatched[0] if mismatched else None,
+        "psnr_db": psnr,
+        "tempo_s": timings,
+    }
+
+
 def executar(data: Dict[str, Any]) -> str:
     return gerar_video_loteria(data)
 
 
-__all__ = ["criar_poster", "executar", "gerar_video_loteria"]
+BENCHMARK_SAMPLES = {
+    "Mega-Sena": "04 12 23 35 47 58",
+    "Lotofácil": "01 02 04 05 07 08 10 11 13 15 17 19 20 22 25",
+}
+
+
+def _benchmark_worker(loteria: str, numbers_text: str, pipeline: str, queue) -> None:
+    import resource
+
+    data = {"loteria": loteria, "concurso": "3000", "numeros": numbers_text, "data": "01/01/2026"}
+    numbers, _ = prepare_numbers(loteria, numbers_text)
+    scenes = _build_scenes(data, loteria, numbers)
+    frame_at = _frame_writer(scenes, pipeline)
+    total = round(DURATION * FPS)
+    with open(os.devnull, "wb", buffering=0) as sink:
+        started = time.perf_counter()
+        for frame_index in range(total):
+            sink.write(frame_at(frame_index / FPS))
+        elapsed = time.perf_counter() - started
+    queue.put({
+        "quadros_s": round(total / elapsed, 1),
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+
+
+def benchmark_pipeline() -> Dict[str, Dict[str, Any]]:
+    """Quadros/s e pico de RSS do pipeline PIL e do NumPy, cada um em processo próprio.
+
+    Mede só a composição e a escrita dos quadros (destino /dev/null), sem o custo do x264.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    report: Dict[str, Dict[str, Any]] = {}
+    for loteria, numbers_text in BENCHMARK_SAMPLES.items():
+        for pipeline in ("pil", "numpy"):
+            queue = context.Queue()
+            worker = context.Process(target=_benchmark_worker, args=(loteria, numbers_text, pipeline, queue))
+            worker.start()
+            result = queue.get()
+            worker.join()
+            report[f"{loteria}/{pipeline}"] = result
+    return report
+
+
+__all__ = [
+    "RENDERERS",
+    "benchmark_pipeline",
+    "criar_poster",
+    "executar",
+    "gerar_video_loteria",
+    "verificar_equivalencia",
+]
+
+
+if __name__ == "__main__":
+    for name, row in benchmark_pipeline().items():
+        print(f"[VÍDEO V7] {name}: {row}", flush=True)
@@ -61,28 +61,40 @@ def _apply_visual_signature(base_video: Path, output_video: Path, loteria: str,
     ])
 
 
-def gerar_video_loteria(data: Dict[str, Any]) -> str:
-    loteria = str(data.get("loteria") or data.get("produto") or "Loteria").strip()
+# Base intermediária sem perdas: quem a usa aplica a assinatura na própria codificação final.
+MEZZANINE_CODEC = ("-c:v", "libx264", "-preset", "ultrafast", "-qp", "0", "-pix_fmt", "yuv420p")
+CTA_START = 54.20
+
+
+def _render_base(data: Dict[str, Any], video_codec: Sequence[str]) -> Path:
     concurso = str(data.get("concurso") or "").strip()
-    cta_start = 54.20
-    variation = variation_for(loteria, concurso)
 
     original_writer = v7._write_soundtrack
     original_reveal_times = v7._reveal_times
+    original_codec = v7.VIDEO_CODEC
 
     def _writer(path, duration, lottery_name, result_time, cta_time):
         return write_soundtrack(path, duration, lottery_name, concurso, result_time, cta_time)
 
     v7._write_soundtrack = _writer
     v7._reveal_times = _reveal_times_v9
+    v7.VIDEO_CODEC = tuple(video_codec)
     try:
-        base_path = Path(v7.gerar_video_loteria(data))
+        return Path(v7.gerar_video_loteria(data))
     finally:
         v7._write_soundtrack = original_writer
         v7._reveal_times = original_reveal_times
+        v7.VIDEO_CODEC = original_codec
 
+
+def gerar_video_loteria(data: Dict[str, Any]) -> str:
+    loteria = str(data.get("loteria") or data.get("produto") or "Loteria").strip()
+    concurso = str(data.get("concurso") or "").strip()
+    variation = variation_for(loteria, concurso)
+
+    base_path = _render_base(data, v7.VIDEO_CODEC)
     final_path = base_path.with_name(base_path.stem + "_identidade_v9.mp4")
-    _apply_visual_signature(base_path, final_path, loteria, data, cta_start)
+    _apply_visual_signature(base_path, final_path, loteria, data, CTA_START)
     os.replace(final_path, base_path)
 
     print(
@@ -92,8 +104,22 @@ def gerar_video_loteria(data: Dict[str, Any]) -> str:
     return str(base_path)
 
 
+def gerar_base_intermediaria(data: Dict[str, Any]) -> str:
+    """Mesma base de gerar_video_loteria, sem perdas e ainda sem a assinatura visual.
+
+    Serve a quem recodifica a base de qualquer forma: aplicar signature_filter() na
+    codificação final evita duas passagens do x264 e a perda de geração entre elas.
+    """
+    return str(_render_base(data, MEZZANINE_CODEC))
+
+
+def signature_filter(data: Dict[str, Any]) -> str:
+    loteria = str(data.get("loteria") or data.get("produto") or "Loteria").strip()
+    return _signature_filter(loteria, data, CTA_START)
+
+
 def executar(data: Dict[str, Any]) -> str:
     return gerar_video_loteria(data)
 
 
-__all__ = ["criar_poster", "executar", "gerar_video_loteria"]
+__all__ = ["criar_poster", "executar", "gerar_base_intermediaria", "gerar_video_loteria", "signature_filter"]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+"""Políticas de codificação das artes: rápida para envio às redes, arquivo para guardar.
+
+gerar_imagem_loteria salvava todo PNG com optimize=True, que faz o Pillow repetir a
+compressão zlib em várias estratégias (~340 ms por arte de 1080x1080, mais que o
+render inteiro), e app/main.py ainda abria esse PNG só para regravá-lo em JPEG 95.
+As redes recomprimem a foto de qualquer jeito, então o envio usa uma política
+rápida: JPEG direto do canvas por padrão e PNG de compressão baixa no Discord, que
+entrega o arquivo como veio. A política "arquivo" mantém o PNG otimizado de antes.
+Cada rede pode trocar a sua por IMAGE_ENCODE_<REDE>; benchmark() mede tamanho,
+tempo de codificação e envio estimado por rede.
+"""
+
+import io
+import os
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from PIL import Image
+
+# formato do Pillow -> (MIME, extensão do arquivo enviado)
+FORMATS: Dict[str, tuple] = {
+    "PNG": ("image/png", "png"),
+    "JPEG": ("image/jpeg", "jpg"),
+    "WEBP": ("image/webp", "webp"),
+}
+
+
+class EncodePolicy:
+    """Formato + opções de Image.save; encode() devolve os bytes prontos para envio."""
+
+    __slots__ = ("name", "format", "options")
+
+    def __init__(self, name: str, format: str, **options: Any):
+        self.name = name
+        self.format = format
+        self.options = options
+
+    @property
+    def mime(self) -> str:
+        return FORMATS[self.format][0]
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.format][1]
+
+    def encode(self, image: Image.Image) -> bytes:
+        if self.format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        output = io.BytesIO()
+        image.save(output, format=self.format, **self.options)
+        return output.getvalue()
+
+    def __repr__(self) -> str:
+        return f"EncodePolicy({self.name!r}, {self.format!r}, {self.options!r})"
+
+
+POLICIES: Dict[str, EncodePolicy] = {
+    policy.name: policy
+    for policy in (
+        EncodePolicy("arquivo", "PNG", optimize=True),
+        EncodePolicy("png", "PNG", compress_level=1),
+        EncodePolicy("jpeg", "JPEG", quality=90),
+        EncodePolicy("webp", "WEBP", quality=90, method=0),
+        # saída do KIT (app/main.py): mesmo JPEG 95 otimizado de antes, sem passar por PNG
+        EncodePolicy("kit", "JPEG", quality=95, optimize=True),
+    )
+}
+
+DEFAULT_UPLOAD_POLICY = "jpeg"
+NETWORK_DEFAULTS: Mapping[str, str] = {"DISCORD": "png"}
+NETWORKS = ("X", "FACEBOOK", "TELEGRAM", "DISCORD", "PINTEREST")
+
+
+def encode_policy(name: Optional[str]) -> EncodePolicy:
+    """Política pelo nome; nome vazio ou desconhecido cai no envio rápido padrão."""
+    return POLICIES.get((name or "").strip().lower()) or POLICIES[DEFAULT_UPLOAD_POLICY]
+
+
+def policy_for(rede: Optional[str] = None) -> EncodePolicy:
+    """Política de envio da rede: IMAGE_ENCODE_<REDE>, depois IMAGE_ENCODE, depois o padrão da rede."""
+    rede = (rede or "").strip().upper()
+    name = (os.getenv(f"IMAGE_ENCODE_{rede}", "") if rede else "").strip()
+    name = name or (os.getenv("IMAGE_ENCODE", "") or "").strip()
+    return encode_policy(name or NETWORK_DEFAULTS.get(rede, DEFAULT_UPLOAD_POLICY))
+
+
+def benchmark(mbps: float = 10.0, redes: Sequence[str] = NETWORKS) -> dict:
+    """Amostras de app.imaging em cada política e, por rede, codificação + envio estimado a ``mbps``."""
+    from app.imaging import AMOSTRAS_BENCHMARK, renderizar_imagem_loteria
+
+    images = [renderizar_imagem_loteria(nome, "3000", "10/10/2026", numeros) for nome, numeros in AMOSTRAS_BENCHMARK]
+    per_policy: Dict[str, Dict[str, float]] = {}
+    for policy in POLICIES.values():
+        started = time.perf_counter()
+        sizes = [len(policy.encode(image)) for image in images]
+        encode_ms = (time.perf_counter() - started) * 1000 / len(images)
+        size_kb = sum(sizes) / len(sizes) / 1024
+        per_policy[policy.name] = {
+            "codificar_ms": round(encode_ms, 1),
+            "kb": round(size_kb, 1),
+            "envio_ms": round(size_kb * 8 / 1024 / mbps * 1000, 1),
+        }
+
+    antes = per_policy["arquivo"]
+    por_rede: Dict[str, Dict[str, Any]] = {}
+    for rede in redes:
+        policy = policy_for(rede)
+        medida = per_policy[policy.name]
+        total = medida["codificar_ms"] + medida["envio_ms"]
+        por_rede[rede] = {
+            "politica": policy.name,
+            **medida,
+            "total_ms": round(total, 1),
+            "total_antes_ms": round(antes["codificar_ms"] + antes["envio_ms"], 1),
+        }
+    return {"imagens": len(images), "mbps": mbps, "politicas": per_policy, "redes": por_rede}
+
+
+__all__ = [
+    "DEFAULT_UPLOAD_POLICY",
+    "FORMATS",
+    "NETWORK_DEFAULTS",
+    "POLICIES",
+    "EncodePolicy",
+    "benchmark",
+    "encode_policy",
+    "policy_for",
+]
+
+
+if __name__ == "__main__":
+    relatorio = benchmark()
+    for nome, medida in relatorio["politicas"].items():
+        print(f"[CODIFICACAO] {nome}: {medida}", flush=True)
+    for rede, medida in relatorio["redes"].items():
+        print(f"[CODIFICACAO] {rede}: {medida}", flush=True)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+"""Imagens renderizadas uma vez por rodada.
+
+X (uma vez por conta), Facebook, Telegram, Discord e Pinterest pediam a mesma arte
+de resultado a bot._build_image_from_row, e cada pedido refazia o fundo, o texto e a
+compressão PNG; x_multi_account ainda decodificava esse PNG para montar a versão de
+cada conta. ImageStore memoriza por (hash do conteúdo da linha, variante) os bytes
+codificados e a base RGB já decodificada, então cada resultado custa um render por
+rodada mesmo com as redes publicando em threads ao mesmo tempo. A variante também
+separa a política de codificação (image_encode) quando uma rede usa outro formato.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from image_encode import FORMATS, EncodePolicy
+
+IMAGE_STORE_MAX = max(1, int(os.getenv("IMAGE_STORE_MAX", "96") or "96"))
+
+StoreKey = Tuple[str, Hashable]
+
+
+def row_key(values: Sequence[Any]) -> str:
+    """Hash estável do conteúdo que entra na arte (não da linha inteira da planilha)."""
+    payload = json.dumps([str(value or "").strip() for value in values], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RenderedImage:
+    """Arte pronta: bytes codificados e, quando disponível, a base RGB que os gerou.
+
+    ``policy`` é o nome da política de image_encode que gerou os bytes; None indica
+    um arquivo que já veio codificado (ex. KIT) e é enviado como está.
+    """
+
+    __slots__ = ("data", "format", "policy", "_rgb")
+
+    def __init__(
+        self,
+        data: bytes,
+        format: str = "PNG",
+        rgb: Optional[Image.Image] = None,
+        policy: Optional[str] = None,
+    ):
+        self.data = data
+        self.format = format
+        self.policy = policy
+        self._rgb = rgb.convert("RGB") if rgb is not None and rgb.mode != "RGB" else rgb
+
+    @classmethod
+    def from_image(cls, image: Image.Image, policy: EncodePolicy, keep_rgb: bool = True) -> "RenderedImage":
+        return cls(policy.encode(image), policy.format, image if keep_rgb else None, policy.name)
+
+    def encoded(self, policy: EncodePolicy) -> "RenderedImage":
+        """A mesma arte em ``policy``; bytes prontos de fora (policy None) seguem como estão."""
+        if self.policy is None or self.policy == policy.name:
+            return self
+        return RenderedImage.from_image(self.rgb(), policy, keep_rgb=False)
+
+    @property
+    def mime(self) -> str:
+        return FORMATS.get(self.format, ("application/octet-stream", "bin"))[0]
+
+    @property
+    def extension(self) -> str:
+        return FORMATS.get(self.format, ("application/octet-stream", "bin"))[1]
+
+    def upload(self, stem: str = "resultado") -> Tuple[str, bytes, str]:
+        """Tupla (nome do arquivo, bytes, MIME) no formato de ``files=`` do requests."""
+        return f"{stem}.{self.extension}", self.data, self.mime
+
+    def buffer(self) -> io.BytesIO:
+        # cada chamador recebe o próprio cursor; os bytes são compartilhados
+        return io.BytesIO(self.data)
+
+    def rgb(self) -> Image.Image:
+        """Base RGB somente leitura (decodificada uma vez se veio só em bytes, ex. KIT)."""
+        if self._rgb is None:
+            with Image.open(io.BytesIO(self.data)) as image:
+                self._rgb = image.convert("RGB")
+        return self._rgb
+
+
+class ImageStore:
+    def __init__(self, max_entries: int = IMAGE_STORE_MAX):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[StoreKey, RenderedImage]" = OrderedDict()
+        self._inflight: Dict[StoreKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.hits = 0
+
+    def _cached(self, key: StoreKey) -> Optional[RenderedImage]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry
+
+    def get(self, key: StoreKey, render: Callable[[], RenderedImage]) -> RenderedImage:
+        """Devolve a arte de ``key``; ``render`` roda uma única vez mesmo com threads concorrentes."""
+        with self._lock:
+            entry = self._cached(key)
+            if entry is not None:
+                return entry
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._cached(key)
+            if entry is not None:
+                return entry
+            entry = render()
+            with self._lock:
+                self._entries[key] = entry
+                self._inflight.pop(key, None)
+                self.renders += 1
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.renders = 0
+            self.hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"imagens": len(self._entries), "renders": self.renders, "reusos": self.hits}
+
+
+image_store = ImageStore()
+
+__all__ = ["ImageStore", "RenderedImage", "image_store", "row_key"]
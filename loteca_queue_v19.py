@@ -6,6 +6,7 @@ import traceback
 from typing import Any, Dict, List, Sequence, Tuple
 
 from post_video import publicar_video_em_multicanais
+from sheet_mirror import mirror_for
 from video_queue import (
     _empty,
     _ensure_column,
@@ -37,17 +38,17 @@ def processar_loteca_individual() -> int:
     client = _google_client()
     cofre_cache, cofre_get = _load_cofre(client, cfg)
     worksheet = client.open_by_key(cfg.google_sheet_id).worksheet(cfg.sheet_tab)
-    values = worksheet.get_all_values()
-    if not values:
+    mirror = mirror_for(worksheet)
+    headers = mirror.header()
+    if not headers:
         _log("Aba principal vazia para a fila exclusiva da Loteca.")
         return 0
 
-    headers = list(values[0])
     queue_index = _ensure_column(worksheet, headers, cfg.enfileirado_col)
     published_index = _ensure_column(worksheet, headers, cfg.publicado_col)
 
     grouped: Dict[Tuple[str, str, str], List[Tuple[int, Sequence[str], Dict[str, Any]]]] = {}
-    for sheet_row, row in enumerate(values[1:], start=2):
+    for sheet_row, row in mirror.pending(published_index + 1, filled=queue_index + 1):
         queue_value = row[queue_index] if queue_index < len(row) else ""
         published_value = row[published_index] if published_index < len(row) else ""
         if not _truthy_queue(queue_value) or not _empty(published_value):
@@ -92,7 +93,8 @@ def processar_loteca_individual() -> int:
             if result.get("ok_any") and not cfg.dry_run:
                 marker = str(result.get("mark_value") or "Publicado YOUTUBE LOTeca")
                 for row_number in row_numbers:
-                    worksheet.update_cell(row_number, published_index + 1, marker)
+                    mirror.mark(row_number, published_index + 1, marker)
+                mirror.flush()
                 successes += 1
                 _log(
                     f"Loteca concurso {data.get('concurso') or '-'} publicada separadamente "
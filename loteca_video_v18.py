@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Sequence, Tuple
 from PIL import Image, ImageDraw, ImageFont
 
 from audio_identity_v9 import write_soundtrack
+from font_registry import SANS
 from lottery_result_v18 import LotecaGame, loteca_game_for_speech, parse_lottery_result, team_name_without_code
 from voice_narration_v18 import (
     SpeechSegment,
@@ -34,24 +35,11 @@ def _run(command: Sequence[str]) -> None:
 
 
 def _font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    candidates = (
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
-    )
-    for candidate in candidates:
-        try:
-            return ImageFont.truetype(candidate, size=size)
-        except OSError:
-            pass
-    return ImageFont.load_default()
+    return SANS.get(size, bold)
 
 
 def _fit_font(draw: ImageDraw.ImageDraw, text: str, max_width: int, start: int, minimum: int = 18) -> ImageFont.FreeTypeFont:
-    for size in range(start, minimum - 1, -2):
-        font = _font(size, True)
-        if draw.textbbox((0, 0), text, font=font)[2] <= max_width:
-            return font
-    return _font(minimum, True)
+    return SANS.fit(draw, text, max_width, start, minimum)
 
 
 def _gradient(size: Tuple[int, int], top=(0, 119, 193), bottom=(0, 24, 56)) -> Image.Image:
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_ROOT = BASE_DIR / ".cache"
+
+
+class MediaCache:
+    """Cache em disco endereçado por conteúdo, com limite de tamanho e despejo LRU.
+
+    Cada entrada é um arquivo ``<sha256><sufixo>``. O horário de modificação marca
+    o último uso: um acerto renova o arquivo e o despejo remove os mais antigos.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, suffix: str, label: str = "CACHE") -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.suffix = suffix
+        self.label = label
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls, prefix: str, default_dir: str | Path, default_mb: int, suffix: str, label: str) -> "MediaCache":
+        directory = os.getenv(f"{prefix}_DIR", "").strip() or str(default_dir)
+        raw_mb = os.getenv(f"{prefix}_MAX_MB", "").strip()
+        try:
+            max_mb = float(raw_mb) if raw_mb else float(default_mb)
+        except ValueError:
+            max_mb = float(default_mb)
+        return cls(directory, int(max_mb * 1024 * 1024), suffix, label)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        raw = "\x1f".join(repr(part) for part in parts)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Retorna o arquivo em cache (e renova seu uso) ou ``None``."""
+        if not self.enabled:
+            return None
+        cached = self.path_for(key)
+        try:
+            if cached.stat().st_size <= 0:
+                raise FileNotFoundError(cached)
+            os.utime(cached)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached
+
+    def fetch(self, key: str, destination: str | Path) -> bool:
+        """Materializa a entrada em ``destination`` por hardlink (ou cópia)."""
+        cached = self.lookup(key)
+        if cached is None:
+            return False
+        target = Path(destination)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(cached, target)
+        except OSError:
+            shutil.copyfile(cached, target)
+        return True
+
+    def store(self, key: str, source: str | Path) -> Optional[Path]:
+        """Copia ``source`` para o cache de forma atômica e aplica o limite."""
+        if not self.enabled:
+            return None
+        source = Path(source)
+        size = source.stat().st_size
+        if size <= 0 or size > self.max_bytes:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(prefix=".tmp-", suffix=self.suffix, dir=str(self.directory))
+        os.close(handle)
+        try:
+            shutil.copyfile(source, temp_name)
+            os.replace(temp_name, self.path_for(key))
+        except OSError:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            return None
+        self.stored += 1
+        self.evict()
+        return self.path_for(key)
+
+    def evict(self) -> int:
+        """Remove as entradas usadas há mais tempo até caber em ``max_bytes``."""
+        entries = []
+        total = 0
+        try:
+            candidates = list(self.directory.glob(f"*{self.suffix}"))
+        except OSError:
+            return 0
+        for item in candidates:
+            if item.name.startswith(".tmp-"):
+                continue
+            try:
+                info = item.stat()
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, item))
+            total += info.st_size
+        removed = 0
+        for _mtime, size, item in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                item.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    def report(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stored": self.stored,
+            "evicted": self.evicted,
+        }
+
+    def log_report(self) -> None:
+        stats = self.report()
+        if stats["hits"] or stats["misses"]:
+            print(
+                f"[{self.label}] acertos={stats['hits']} faltas={stats['misses']} "
+                f"taxa={stats['hit_rate']:.0%} gravados={stats['stored']} removidos={stats['evicted']}",
+                flush=True,
+            )
+
+
+SOUNDTRACK_CACHE = MediaCache.from_env(
+    "SOUNDTRACK_CACHE", DEFAULT_CACHE_ROOT / "trilhas", 1024, ".wav", "TRILHA CACHE"
+)
+
+TTS_CACHE = MediaCache.from_env(
+    "TTS_CACHE", DEFAULT_CACHE_ROOT / "voz", 256, ".mp3", "VOZ CACHE"
+)
+
+
+__all__ = ["DEFAULT_CACHE_ROOT", "MediaCache", "SOUNDTRACK_CACHE", "TTS_CACHE"]
@@ -9,6 +9,7 @@ import caixa_direct_fallback_v23 as caixa_fallback
 import daily_calendar_api_v21 as cal
 import daily_queue_v19 as queue
 import youtube_daily_live_v22 as live
+from sheet_mirror import SheetMirror, mirror_for
 
 ALERT_SHEET_DEFAULT = "YOUTUBE_ALERTAS"
 FINAL_WORDS = (
@@ -184,7 +185,7 @@ def _process_date(
     today: str,
     config,
     worksheet,
-    values,
+    mirror: SheetMirror,
     api_spreadsheet,
     calendar_values,
     history_values,
@@ -207,20 +208,20 @@ def _process_date(
         try:
             inserted = caixa_fallback.append_missing_results(
                 worksheet,
-                values,
+                mirror.rows(),
                 targets,
                 expected_date=date,
                 log=queue._log,
             )
             if inserted:
-                values = worksheet.get_all_values()
+                mirror.sync(force=True)
         except Exception as error:
             queue._log(f"Fallback CAIXA {date} falhou: {error}")
 
-    headers = list(values[0])
+    headers = mirror.header()
     daily_column = os.getenv("PUBLICADO_YT_DIARIO_COL", queue.DAILY_COLUMN_DEFAULT)
     daily_index = queue._ensure_column(worksheet, headers, daily_column)
-    rows, missing_rows = cal._find_today_rows(values, headers, daily_index, date, targets)
+    rows, missing_rows = cal._find_today_rows(mirror, headers, daily_index, date, targets)
 
     # Dia antigo: o aviso de 20/08 foi publicado como vídeo normal de 13s. Não existe como
     # substituir esse MP4. Publica o consolidado agora usando upload scope e encerra o legado.
@@ -294,8 +295,8 @@ def processar_resumo_por_calendario_api_v27() -> int:
 
     main_spreadsheet = client.open_by_key(config.google_sheet_id)
     worksheet = main_spreadsheet.worksheet(config.sheet_tab)
-    values = worksheet.get_all_values()
-    if not values:
+    mirror = mirror_for(worksheet)
+    if not mirror.header():
         raise RuntimeError("A planilha principal está vazia.")
 
     api_sheet_id = os.getenv("YOUTUBE_API_CALENDAR_SHEET_ID", cal.API_CALENDAR_SHEET_ID_DEFAULT).strip()
@@ -316,14 +317,15 @@ def processar_resumo_por_calendario_api_v27() -> int:
     published = 0
     first_error = None
     for date in dates:
-        current_values = worksheet.get_all_values()
+        # As marcas deste fluxo passam pelo espelho; sync só relê se a planilha mudou por fora.
+        mirror.sync()
         try:
             published += _process_date(
                 date,
                 today=today,
                 config=config,
                 worksheet=worksheet,
-                values=current_values,
+                mirror=mirror,
                 api_spreadsheet=api_spreadsheet,
                 calendar_values=calendar_values,
                 history_values=history_values,
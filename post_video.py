@@ -213,6 +213,14 @@ def _metadata(dados_video: Dict[str, Any], tipo: str) -> Dict[str, Any]:
     return {"title": title, "description": description, "tags": tags}
 
 
+def renderizar_pacote(dados_video: Dict[str, Any]) -> Dict[str, Any]:
+    """Gera o pacote em um processo do lote; falhas voltam como {"erro": ...} para a etapa de upload."""
+    try:
+        return gerar_pacote(dados_video)
+    except Exception as error:
+        return {"erro": str(error)}
+
+
 def publicar_video_em_multicanais(
     dados_video: Dict[str, Any],
     cofre_get_fn,
@@ -221,6 +229,7 @@ def publicar_video_em_multicanais(
     dry_run: bool = False,
     sleep_between_channels: float = 1.0,
     tz_name: str = "America/Sao_Paulo",
+    pacote: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     accounts = listar_contas_youtube(cofre_cache)
     if not accounts:
@@ -232,7 +241,10 @@ def publicar_video_em_multicanais(
         }
 
     try:
-        if dry_run:
+        if pacote is not None:
+            if pacote.get("erro"):
+                raise RuntimeError(pacote["erro"])
+        elif dry_run:
             pacote = {
                 "short": "DRYRUN_short_resultado.mp4",
                 "completo": "DRYRUN_video_completo_resultado.mp4",
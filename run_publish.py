@@ -68,6 +68,9 @@ def main() -> None:
             "PINTEREST": bot.publicar_em_pinterest,
         }
 
+        # Demais redes ao mesmo tempo, cada uma com a própria pausa; as marcas
+        # seguem pelo escritor único do bot (ver bot.publicar_redes).
+        tasks = []
         for network in networks:
             network = network.upper()
             if network == "X":
@@ -84,7 +87,8 @@ def main() -> None:
             if not bot._has_creds_for(network):
                 bot._log(f"[{network}] Sem credenciais no Cofre. Pulando.")
                 continue
-            publisher(ws, candidates)
+            tasks.append((network, publisher, candidates))
+        bot.publicar_redes(ws, tasks)
 
         bot._log("Concluído.")
 
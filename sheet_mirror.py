@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+MIRROR_DIR = os.getenv("SHEET_MIRROR_DIR", str(BASE_DIR / ".cache" / "planilha")).strip()
+
+# Mesmos apelidos de cabeçalho de video_queue.VIDEO_FIELDS; sem cabeçalho
+# reconhecido vale o layout fixo do bot.py (A=Loteria, B=Concurso, C=Data).
+INDEXED_COLUMNS = {
+    "loteria": (("Produto", "Loteria", "Modalidade", "Jogo"), 1),
+    "concurso": (("Concurso", "Numero_Concurso", "Número do Concurso"), 2),
+    "data": (("Data", "Data_Sorteio", "Data do Sorteio"), 3),
+}
+STATUS_PREFIXES = ("publicado", "enfileirado", "status")
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff\u2060"))
+
+Row = List[str]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS linhas (
+    linha INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    loteria TEXT NOT NULL DEFAULT '',
+    concurso TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL DEFAULT '',
+    valores TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS linhas_loteria_concurso ON linhas (loteria, concurso);
+CREATE INDEX IF NOT EXISTS linhas_data ON linhas (data);
+CREATE TABLE IF NOT EXISTS estados (
+    linha INTEGER NOT NULL,
+    coluna INTEGER NOT NULL,
+    valor TEXT NOT NULL,
+    PRIMARY KEY (linha, coluna)
+);
+CREATE INDEX IF NOT EXISTS estados_coluna_valor ON estados (coluna, valor);
+"""
+
+
+def _log(message: str) -> None:
+    print(f"[ESPELHO] {message}", flush=True)
+
+
+def _clean(value: Any) -> str:
+    """Valor da célula sem espaços nem caracteres invisíveis (o mesmo critério de bot._strip_invisible)."""
+    return str(value or "").translate(_INVISIBLE).strip()
+
+
+def _norm_header(value: Any) -> str:
+    """Mesma chave de video_queue._norm: minúsculas, sem acentos e só [a-z0-9]."""
+    text = unicodedata.normalize("NFKD", str(value or "").strip().lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"[^a-z0-9]+", "", text)
+
+
+def _row_hash(row: Sequence[str]) -> str:
+    return hashlib.sha1(json.dumps(list(row), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _a1(row: int, column: int) -> str:
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return f"{letters}{row}"
+
+
+class SheetMirror:
+    """Espelho SQLite da aba principal, sincronizado por diferença de hash por linha.
+
+    A API do Sheets não informa quais linhas mudaram: ``sync`` consulta primeiro o
+    ``modifiedTime`` da planilha no Drive e, se nada mudou desde o último espelho, não
+    baixa nenhum valor. Caso contrário lê a aba uma vez e regrava no SQLite apenas as
+    linhas cujo hash mudou. Loteria/concurso, data e as colunas de status ficam indexadas;
+    os seletores das filas consultam o espelho em vez de percorrer listas de listas.
+
+    ``estados`` guarda só os status não vazios, já sem espaços e caracteres invisíveis;
+    por isso ``pending`` devolve um superconjunto seguro e cada fila ainda aplica o
+    próprio critério à linha original.
+    """
+
+    def __init__(self, ws: Any, path: str | Path = ":memory:") -> None:
+        self.ws = ws
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        self.reads = 0
+        self.writes = 0
+        self.synced = False
+        self._pending_marks: Dict[Tuple[int, int], str] = {}
+
+    # ---------------- metadados ----------------
+    def _meta(self, key: str, default: str = "") -> str:
+        found = self.db.execute("SELECT valor FROM meta WHERE chave = ?", (key,)).fetchone()
+        return found[0] if found else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (key, value))
+
+    def header(self) -> Row:
+        self._ensure_synced()
+        return list(json.loads(self._meta("cabecalho", "[]")))
+
+    def _indexed_positions(self, header: Sequence[str]) -> Dict[str, int]:
+        normalized = {_norm_header(name): index for index, name in enumerate(header) if _norm_header(name)}
+        positions: Dict[str, int] = {}
+        for field, (aliases, fallback) in INDEXED_COLUMNS.items():
+            found = next((normalized[_norm_header(alias)] for alias in aliases if _norm_header(alias) in normalized), None)
+            positions[field] = found if found is not None else fallback - 1
+        return positions
+
+    def _status_columns(self) -> List[int]:
+        return list(json.loads(self._meta("colunas_status", "[]")))
+
+    # ---------------- sincronização ----------------
+    def _remote_version(self) -> str:
+        spreadsheet = getattr(self.ws, "spreadsheet", None)
+        try:
+            getter = getattr(spreadsheet, "get_lastUpdateTime", None)
+            value = getter() if callable(getter) else getattr(spreadsheet, "lastUpdateTime", "")
+            return str(value or "")
+        except Exception as exc:
+            _log(f"modifiedTime indisponível ({exc}); lendo a aba inteira.")
+            return ""
+
+    def sync(self, force: bool = False) -> int:
+        """Atualiza o espelho e retorna quantas linhas mudaram (0 se a planilha não mudou)."""
+        with self.lock:
+            self.flush()
+            started = time.perf_counter()
+            version = self._remote_version()
+            if not force and version and version == self._meta("versao") and self._meta("cabecalho"):
+                self.synced = True
+                _log(f"{self.ws.title}: planilha sem alterações desde {version}; nenhuma leitura.")
+                return 0
+
+            values = self.ws.get_all_values()
+            self.reads += 1
+            header = list(values[0]) if values else []
+            positions = self._indexed_positions(header)
+            status_columns = sorted(
+                set(self._status_columns())
+                | {
+                    index
+                    for index, name in enumerate(header, start=1)
+                    if _norm_header(name).startswith(STATUS_PREFIXES)
+                }
+            )
+            rebuild_status = json.dumps(header, ensure_ascii=False) != self._meta("cabecalho") or status_columns != self._status_columns()
+            known = dict(self.db.execute("SELECT linha, hash FROM linhas"))
+            changed = 0
+            for row_number, row in enumerate(values[1:], start=2):
+                digest = _row_hash(row)
+                if not rebuild_status and known.get(row_number) == digest:
+                    continue
+                self._store_row(row_number, row, digest, positions, status_columns)
+                changed += 1
+            removed = [row_number for row_number in known if row_number > len(values)]
+            if removed:
+                self.db.execute("DELETE FROM linhas WHERE linha > ?", (len(values),))
+                self.db.execute("DELETE FROM estados WHERE linha > ?", (len(values),))
+            self._set_meta("cabecalho", json.dumps(header, ensure_ascii=False))
+            self._set_meta("posicoes", json.dumps(positions))
+            self._set_meta("colunas_status", json.dumps(status_columns))
+            self._set_meta("versao", version)
+            self.db.commit()
+            self.synced = True
+            _log(
+                f"{self.ws.title}: {max(0, len(values) - 1)} linha(s) | alteradas={changed} | "
+                f"removidas={len(removed)} | leituras={self.reads} | {time.perf_counter() - started:.2f}s"
+            )
+            return changed + len(removed)
+
+    def invalidate(self) -> None:
+        """A próxima consulta relê a aba (use após mudar a estrutura por fora do espelho)."""
+        with self.lock:
+            self.synced = False
+            self._set_meta("versao", "")
+            self.db.commit()
+
+    def _ensure_synced(self) -> None:
+        if not self.synced:
+            self.sync()
+
+    def _store_row(
+        self,
+        row_number: int,
+        row: Sequence[str],
+        digest: str,
+        positions: Dict[str, int],
+        status_columns: Sequence[int],
+    ) -> None:
+        def cell(index: int) -> str:
+            return str(row[index] if 0 <= index < len(row) else "").strip()
+
+        self.db.execute(
+            "INSERT OR REPLACE INTO linhas (linha, hash, loteria, concurso, data, valores) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                row_number,
+                digest,
+                cell(positions["loteria"]),
+                cell(positions["concurso"]),
+                cell(positions["data"]),
+                json.dumps(list(row), ensure_ascii=False),
+            ),
+        )
+        self.db.execute("DELETE FROM estados WHERE linha = ?", (row_number,))
+        self.db.executemany(
+            "INSERT INTO estados (linha, coluna, valor) VALUES (?, ?, ?)",
+            [
+                (row_number, column, _clean(row[column - 1]))
+                for column in status_columns
+                if column <= len(row) and _clean(row[column - 1])
+            ],
+        )
+
+    def _watch_status(self, column: int) -> None:
+        """Passa a indexar uma coluna de status que não segue os prefixos conhecidos."""
+        columns = self._status_columns()
+        if column in columns:
+            return
+        self._set_meta("colunas_status", json.dumps(sorted(columns + [column])))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO estados (linha, coluna, valor) VALUES (?, ?, ?)",
+            [
+                (row_number, column, _clean(row[column - 1]))
+                for row_number, row in self._iter("SELECT linha, valores FROM linhas")
+                if column <= len(row) and _clean(row[column - 1])
+            ],
+        )
+        self.db.commit()
+
+    # ---------------- consultas ----------------
+    def _iter(self, sql: str, params: Sequence[Any] = ()) -> Iterator[Tuple[int, Row]]:
+        for row_number, encoded in self.db.execute(sql, params).fetchall():
+            yield row_number, json.loads(encoded)
+
+    def rows(self) -> List[Row]:
+        """Cabeçalho + linhas, no mesmo formato de ``get_all_values`` (compatibilidade)."""
+        with self.lock:
+            self._ensure_synced()
+            width = len(self.header())
+            out: List[Row] = [self.header()]
+            for row_number, row in self._iter("SELECT linha, valores FROM linhas ORDER BY linha"):
+                while len(out) < row_number - 1:
+                    out.append([""] * width)
+                out.append(row)
+            return out
+
+    def count(self) -> int:
+        with self.lock:
+            self._ensure_synced()
+            return int(self.db.execute("SELECT COUNT(*) FROM linhas").fetchone()[0])
+
+    def items(self) -> List[Tuple[int, Row]]:
+        with self.lock:
+            self._ensure_synced()
+            return list(self._iter("SELECT linha, valores FROM linhas ORDER BY linha"))
+
+    def pending(self, column: int, filled: Optional[int] = None) -> List[Tuple[int, Row]]:
+        """Linhas com a coluna ``column`` (1-based) vazia e, se pedido, ``filled`` preenchida."""
+        with self.lock:
+            self._ensure_synced()
+            self._watch_status(column)
+            sql = (
+                "SELECT l.linha, l.valores FROM linhas l WHERE NOT EXISTS "
+                "(SELECT 1 FROM estados e WHERE e.linha = l.linha AND e.coluna = ?)"
+            )
+            params: List[Any] = [column]
+            if filled is not None:
+                self._watch_status(filled)
+                sql += " AND EXISTS (SELECT 1 FROM estados f WHERE f.linha = l.linha AND f.coluna = ?)"
+                params.append(filled)
+            return list(self._iter(sql + " ORDER BY l.linha", params))
+
+    def filled(self, column: int) -> List[Tuple[int, Row]]:
+        """Linhas com a coluna ``column`` (1-based) preenchida, via índice (coluna, valor)."""
+        with self.lock:
+            self._ensure_synced()
+            self._watch_status(column)
+            return list(self._iter(
+                "SELECT l.linha, l.valores FROM estados e JOIN linhas l ON l.linha = e.linha "
+                "WHERE e.coluna = ? ORDER BY l.linha",
+                (column,),
+            ))
+
+    def by_status_prefix(self, column: int, prefix: str) -> List[Tuple[int, Row]]:
+        """Linhas cujo status na coluna ``column`` começa com ``prefix`` (intervalo no índice)."""
+        with self.lock:
+            self._ensure_synced()
+            self._watch_status(column)
+            return list(self._iter(
+                "SELECT l.linha, l.valores FROM estados e JOIN linhas l ON l.linha = e.linha "
+                "WHERE e.coluna = ? AND e.valor >= ? AND e.valor < ? ORDER BY l.linha",
+                (column, prefix, prefix + "\U0010ffff"),
+            ))
+
+    def by_date(self, date: str) -> List[Tuple[int, Row]]:
+        with self.lock:
+            self._ensure_synced()
+            return list(self._iter(
+                "SELECT linha, valores FROM linhas WHERE data = ? ORDER BY linha",
+                (str(date or "").strip(),),
+            ))
+
+    def by_contest(self, loteria: str, concurso: str) -> List[Tuple[int, Row]]:
+        with self.lock:
+            self._ensure_synced()
+            return list(self._iter(
+                "SELECT linha, valores FROM linhas WHERE loteria = ? AND concurso = ? ORDER BY linha",
+                (str(loteria or "").strip(), str(concurso or "").strip()),
+            ))
+
+    # ---------------- escrita ----------------
+    def apply(self, cells: Dict[Tuple[int, int], str]) -> None:
+        """Reflete no espelho células já gravadas na planilha."""
+        with self.lock:
+            if not self._meta("cabecalho"):
+                return
+            positions = json.loads(self._meta("posicoes", "{}"))
+            status_columns = self._status_columns()
+            grouped: Dict[int, Dict[int, str]] = {}
+            for (row_number, column), value in cells.items():
+                grouped.setdefault(row_number, {})[column] = value
+            for row_number, changes in grouped.items():
+                if row_number == 1:
+                    self.invalidate()
+                    continue
+                found = self.db.execute("SELECT valores FROM linhas WHERE linha = ?", (row_number,)).fetchone()
+                row = json.loads(found[0]) if found else []
+                for column, value in changes.items():
+                    row.extend([""] * (column - len(row)))
+                    row[column - 1] = value
+                self._store_row(row_number, row, _row_hash(row), positions, status_columns)
+            self.db.commit()
+
+    def mark(self, row_number: int, column: int, value: str, flush: bool = False) -> None:
+        with self.lock:
+            self._pending_marks[(row_number, column)] = value
+            if flush:
+                self.flush()
+
+    def flush(self) -> int:
+        """Envia as marcas pendentes num único batch_update (ou célula a célula, se falhar)."""
+        with self.lock:
+            if not self._pending_marks:
+                return 0
+            cells = dict(self._pending_marks)
+            self._pending_marks.clear()
+            data = [{"range": _a1(r, c), "values": [[v]]} for (r, c), v in sorted(cells.items())]
+            try:
+                self.ws.batch_update(data, value_input_option="USER_ENTERED")
+                self.writes += 1
+            except Exception as exc:
+                _log(f"batch_update falhou ({exc}); gravando {len(cells)} marca(s) uma a uma.")
+                for (r, c), v in sorted(cells.items()):
+                    self.ws.update_cell(r, c, v)
+                    self.writes += 1
+            self.apply(cells)
+            return len(cells)
+
+
+_mirrors: Dict[int, SheetMirror] = {}
+
+
+def mirror_path(ws: Any) -> str:
+    if not MIRROR_DIR:
+        return ":memory:"
+    spreadsheet_id = getattr(getattr(ws, "spreadsheet", None), "id", "") or "planilha"
+    worksheet_id = getattr(ws, "id", "") or getattr(ws, "title", "aba")
+    return str(Path(MIRROR_DIR) / f"{spreadsheet_id}_{worksheet_id}.sqlite3")
+
+
+def mirror_for(ws: Any) -> SheetMirror:
+    """Espelho da aba, um por processo; a primeira chamada sincroniza."""
+    mirror = _mirrors.get(id(ws))
+    if mirror is None or mirror.ws is not ws:
+        mirror = _mirrors[id(ws)] = SheetMirror(ws, mirror_path(ws))
+        mirror.sync()
+    return mirror
+
+
+__all__ = ["SheetMirror", "mirror_for", "mirror_path"]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+"""Colunas da planilha resolvidas uma vez por cabeçalho.
+
+As filas procuravam cada campo pelo nome a cada linha: normalizavam o cabeçalho
+inteiro e todos os apelidos do campo de novo, linha após linha. compile_schema()
+faz essa resolução uma vez por (cabeçalho, normalizador) e SheetSchema.reader()
+gera, para um conjunto de campos, uma classe de registro com __slots__ cujos
+atributos são preenchidos direto pelo índice já conhecido.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+Normalizer = Callable[[Any], str]
+Fields = Mapping[str, Sequence[str]]
+
+
+class RowRecord:
+    """Base dos registros gerados: um atributo por campo mais a linha da planilha (1-based)."""
+
+    __slots__ = ("sheet_row",)
+    fields: Tuple[str, ...] = ()
+
+    def as_dict(self) -> Dict[str, str]:
+        return {name: getattr(self, name) for name in self.fields}
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.fields)
+        return f"{type(self).__name__}(sheet_row={self.sheet_row}, {values})"
+
+
+class RowReader:
+    """Lê linhas cruas em registros de uma classe fixa; campos sem coluna ficam ''."""
+
+    __slots__ = ("record_class", "positions", "_pairs")
+
+    def __init__(self, name: str, positions: Mapping[str, Optional[int]]):
+        fields = tuple(positions)
+        self.record_class = type(name, (RowRecord,), {"__slots__": fields, "fields": fields})
+        self.positions = dict(positions)
+        self._pairs = tuple(positions.items())
+
+    def read(self, row: Sequence[Any], sheet_row: int = 0) -> RowRecord:
+        record = self.record_class.__new__(self.record_class)
+        record.sheet_row = sheet_row
+        size = len(row)
+        for name, index in self._pairs:
+            value = row[index] if index is not None and index < size else ""
+            setattr(record, name, str(value or "").strip())
+        return record
+
+
+class SheetSchema:
+    """Índice normalizado de um cabeçalho; apelidos e leitores ficam memorizados."""
+
+    __slots__ = ("headers", "normalize", "positions", "_resolved", "_readers")
+
+    def __init__(self, headers: Sequence[Any], normalize: Normalizer, first_wins: bool = False):
+        self.headers = tuple(headers)
+        self.normalize = normalize
+        # Padrão: em nomes repetidos vale a última coluna (como video_queue._header_map);
+        # first_wins reproduz os _header_index que usavam list.index().
+        positions: Dict[str, int] = {}
+        for index, name in enumerate(self.headers):
+            key = normalize(name)
+            if key and not (first_wins and key in positions):
+                positions[key] = index
+        self.positions = positions
+        self._resolved: Dict[Tuple[str, ...], Optional[int]] = {}
+        self._readers: Dict[Tuple[Any, ...], RowReader] = {}
+
+    def index(self, *names: str) -> Optional[int]:
+        """Índice 0-based do primeiro apelido presente no cabeçalho, ou None."""
+        try:
+            return self._resolved[names]
+        except KeyError:
+            pass
+        found = None
+        for name in names:
+            key = self.normalize(name)
+            if key in self.positions:
+                found = self.positions[key]
+                break
+        self._resolved[names] = found
+        return found
+
+    def reader(self, name: str, fields: Fields) -> RowReader:
+        """Leitor de registros ``name`` com um atributo por campo de ``fields`` (campo -> apelidos)."""
+        key = (name,) + tuple((field, tuple(aliases)) for field, aliases in fields.items())
+        reader = self._readers.get(key)
+        if reader is None:
+            positions = {field: self.index(*aliases) for field, aliases in fields.items()}
+            reader = self._readers[key] = RowReader(name, positions)
+        return reader
+
+
+@lru_cache(maxsize=64)
+def _compile(headers: Tuple[Any, ...], normalize: Normalizer, first_wins: bool) -> SheetSchema:
+    return SheetSchema(headers, normalize, first_wins)
+
+
+def compile_schema(headers: Sequence[Any], normalize: Normalizer, first_wins: bool = False) -> SheetSchema:
+    """Esquema compartilhado para o cabeçalho; o mesmo cabeçalho devolve o mesmo objeto."""
+    return _compile(tuple(headers), normalize, first_wins)
+
+
+__all__ = ["RowReader", "RowRecord", "SheetSchema", "compile_schema"]
+
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+"""Cliente gspread compartilhado pelo processo.
+
+Cada gspread.authorize() monta credenciais novas e uma AuthorizedSession nova:
+outro handshake TLS e outro token OAuth para cada aba aberta. Aqui o cliente é
+criado uma vez por conta de serviço (e escopos) e reaproveitado por bot.py e pelas
+filas de vídeo. A AuthorizedSession do gspread é um requests.Session: as chamadas
+seguintes reutilizam a conexão keep-alive e o mesmo token, que a própria sessão só
+renova quando expira. open_by_key também fica memorizado por planilha, então abrir
+outra aba da mesma planilha não busca os metadados de novo.
+"""
+
+import threading
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+SCOPES = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+)
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, str, Tuple[str, ...]], "SharedClient"] = {}
+_stats = {"clientes": 0, "reusos": 0, "planilhas": 0, "planilhas_reusadas": 0}
+
+
+class SharedClient:
+    """Embrulha um gspread.Client; open_by_key devolve a mesma Spreadsheet por ID."""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self._spreadsheets: Dict[str, Any] = {}
+
+    @property
+    def session(self) -> Any:
+        # gspread 6 guarda a sessão em http_client; o 5 direto no cliente.
+        http_client = getattr(self.client, "http_client", None)
+        return getattr(http_client, "session", None) or getattr(self.client, "session", None)
+
+    def open_by_key(self, key: str) -> Any:
+        with _lock:
+            spreadsheet = self._spreadsheets.get(key)
+            if spreadsheet is not None:
+                _stats["planilhas_reusadas"] += 1
+                return spreadsheet
+        spreadsheet = self.client.open_by_key(key)
+        with _lock:
+            _stats["planilhas"] += 1
+            return self._spreadsheets.setdefault(key, spreadsheet)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+def gspread_client(info: Mapping[str, Any], scopes: Sequence[str] = SCOPES) -> SharedClient:
+    """Cliente autorizado para a conta de serviço ``info`` (JSON já decodificado)."""
+    key = (str(info.get("client_email") or ""), str(info.get("private_key_id") or ""), tuple(scopes))
+    with _lock:
+        shared = _clients.get(key)
+        if shared is not None:
+            _stats["reusos"] += 1
+            return shared
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+
+        credentials = ServiceAccountCredentials.from_json_keyfile_dict(dict(info), list(scopes))
+        shared = _clients[key] = SharedClient(gspread.authorize(credentials))
+        _stats["clientes"] += 1
+        return shared
+
+
+def pool_stats() -> Dict[str, int]:
+    """Clientes criados/reusados e planilhas abertas/reusadas desde o início do processo."""
+    with _lock:
+        return dict(_stats)
+
+
+def reset_pool() -> None:
+    with _lock:
+        _clients.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+__all__ = ["SCOPES", "SharedClient", "gspread_client", "pool_stats", "reset_pool"]
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from cofre_index import SINONIMOS_REDE, CofreIndex
+
+REDES = sorted({alias for aliases in SINONIMOS_REDE.values() for alias in aliases} | set(SINONIMOS_REDE))
+REDES += ["PLANILHAS_GOOGLE", "META FACEBOOK", "YOUTUBE", "INSTAGRAM"]
+CONTAS = ["", "", "CONTA1", "CONTA2", "PAGINA_A", "X1"]
+CHAVES = ["API_KEY", "API_SECRET", "ACCESS_TOKEN", "ACCESS_SECRET", "BOT_TOKEN", "CHAT_ID",
+          "WEBHOOK", "BOARD_ID", "GOOGLE_SHEET_ID", "PAGE_TOKEN", "POST_WITH_IMAGE"]
+
+
+def lookup_linear(creds_rc, synonyms, rede_u, chave_u, conta_u=""):
+    """Varredura original de bot._cofre_get, referência para o índice."""
+
+    def match_rede(key_rede, target):
+        kr = (key_rede or "").strip().upper()
+        tg = (target or "").strip().upper()
+        return kr == tg or kr.replace("_", " ") == tg.replace("_", " ") or kr in synonyms.get(tg, [])
+
+    if conta_u:
+        v = creds_rc.get((rede_u, conta_u, chave_u))
+        if v:
+            return v
+    for (r, c, k), v in creds_rc.items():
+        if r == rede_u and k == chave_u and v:
+            return v
+    for (r, c, k), v in creds_rc.items():
+        if k == chave_u and match_rede(r, rede_u) and v:
+            if conta_u and c == conta_u:
+                return v
+    for (r, c, k), v in creds_rc.items():
+        if k == chave_u and match_rede(r, rede_u) and v:
+            return v
+    return None
+
+
+def _cofre_sintetico(generator, entradas=400):
+    creds_rc = {}
+    for index in range(entradas):
+        key = (generator.choice(REDES), generator.choice(CONTAS), generator.choice(CHAVES))
+        creds_rc[key] = "" if index % 17 == 0 else f"v{index}"
+    return creds_rc
+
+
+@pytest.mark.parametrize("seed", [20, 1, 2, 3, 4, 5])
+def test_indice_igual_a_busca_linear(seed):
+    generator = random.Random(seed)
+    creds_rc = _cofre_sintetico(generator)
+    index = CofreIndex(creds_rc, SINONIMOS_REDE)
+    perguntas = [
+        (generator.choice(REDES + ["OUTRA"]), generator.choice(CHAVES + ["NADA"]), generator.choice(CONTAS + ["Z"]))
+        for _ in range(5_000)
+    ]
+
+    divergencias = [
+        (rede, chave, conta)
+        for rede, chave, conta in perguntas
+        if index.get(rede, chave, conta) != lookup_linear(creds_rc, SINONIMOS_REDE, rede, chave, conta)
+    ]
+
+    assert divergencias == []
+
+
+def test_precedencia_exato_rede_e_sinonimo():
+    creds_rc = {
+        ("TWITTER", "CONTA1", "API_KEY"): "sinonimo-conta",
+        ("TWITTER", "", "API_KEY"): "sinonimo",
+        ("X", "CONTA2", "API_KEY"): "rede",
+        ("X", "CONTA1", "API_SECRET"): "",
+    }
+    index = CofreIndex(creds_rc, SINONIMOS_REDE)
+
+    assert index.get("X", "API_KEY", "CONTA2") == "rede"
+    assert index.get("X", "API_KEY", "CONTA1") == "rede"
+    assert index.get("X", "API_SECRET", "CONTA1") is None
+    assert CofreIndex({k: v for k, v in creds_rc.items() if k[0] != "X"}, SINONIMOS_REDE).get("X", "API_KEY", "CONTA1") == "sinonimo-conta"
+
+
+def test_is_current_detecta_cofre_recarregado():
+    creds_rc = {("X", "", "API_KEY"): "a"}
+    index = CofreIndex(creds_rc, SINONIMOS_REDE)
+
+    assert index.is_current(creds_rc)
+    creds_rc[("X", "", "API_SECRET")] = "b"
+    assert not index.is_current(creds_rc)
+    assert not index.is_current(dict(creds_rc))
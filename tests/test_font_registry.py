@@ -0,0 +1,67 @@
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from font_registry import DEJAVU, LIBERATION2, SANS
+
+TEXTOS = [
+    "ACOMPANHE OS PRÓXIMOS RESULTADOS", "INSCREVA-SE NO SIMONSPORTS", "MAIS RESULTADOS E DETALHES",
+    "ATIVE AS NOTIFICAÇÕES • CURTA • COMENTE", "LINK DIRETO NA DESCRIÇÃO DO VÍDEO", "MEGA-SENA",
+    "LOTOFÁCIL", "+MILIONÁRIA", "CORINTHIANS/SP", "ATLETICO MINEIRO/MG", "EMPATE", "COLUNA 1",
+]
+LARGURAS = [180, 320, 540, 760, 930, 1770]
+INICIOS = [92, 66, 48, 29]
+
+
+def _legacy_font(size):
+    for path in (f"{DEJAVU}/DejaVuSans-Bold.ttf", f"{LIBERATION2}/LiberationSans-Bold.ttf"):
+        try:
+            return ImageFont.truetype(path, size=size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _legacy_fit(draw, text, width, start, minimum=18):
+    """Laço antigo dos _fit_font: de 2 em 2 a partir de ``start`` até caber."""
+    for size in range(start, minimum - 1, -2):
+        font = _legacy_font(size)
+        if draw.textbbox((0, 0), text, font=font)[2] <= width:
+            return font
+    return _legacy_font(minimum)
+
+
+@pytest.fixture
+def draw():
+    SANS.clear()
+    yield ImageDraw.Draw(Image.new("RGB", (8, 8)))
+    SANS.clear()
+
+
+@pytest.mark.skipif(not SANS.bold, reason="sem DejaVu/Liberation instalada")
+@pytest.mark.parametrize("start", INICIOS)
+def test_fit_igual_ao_laco_linear(draw, start):
+    casos = [(texto, largura) for texto in TEXTOS for largura in LARGURAS]
+
+    divergencias = [
+        (texto, largura)
+        for texto, largura in casos
+        if SANS.fit(draw, texto, largura, start).size != _legacy_fit(draw, texto, largura, start).size
+    ]
+
+    assert divergencias == []
+
+
+@pytest.mark.skipif(not SANS.bold, reason="sem DejaVu/Liberation instalada")
+def test_fit_memorizado_devolve_a_mesma_fonte(draw):
+    primeira = SANS.fit(draw, "MEGA-SENA", 320, 92)
+
+    assert SANS.fit(draw, "MEGA-SENA", 320, 92) is primeira
+
+
+def test_fit_sem_tamanhos_cai_no_minimo(draw):
+    # start abaixo do mínimo: range vazio
+    assert SANS.fit(draw, "MEGA-SENA", 1000, 10, minimum=18) is SANS.get(18, True)
+
+
+def test_fit_nada_cabe_cai_no_minimo(draw):
+    assert SANS.fit(draw, "ATIVE AS NOTIFICAÇÕES • CURTA • COMENTE", 5, 92, minimum=18) is SANS.get(18, True)
@@ -0,0 +1,69 @@
+import random
+
+from daily_queue_v19 import DAILY_FIELDS
+from sheet_schema import compile_schema
+from video_queue import _norm
+
+HEADERS = [
+    "Produto", "Concurso", "Data", "Números", "URL", "Prêmio estimado", "Publicado_X",
+    "Imagem_Path", "Publicado_Telegram", "Enfileirado_Videos", "Publicado_Youtube",
+    "Premiação", "Ganhadores", "Destaque_Short", "Publicado_Youtube_Diario",
+]
+PRODUTOS = ["Mega-Sena", "Lotofácil", "Quina", "Lotomania", "Timemania", "Dupla Sena",
+            "Dia de Sorte", "Super Sete", "+Milionária", "Federal", "Loteca"]
+
+
+def _planilha_sintetica(linhas):
+    generator = random.Random(17)
+    values = [HEADERS]
+    for index in range(linhas):
+        values.append([
+            PRODUTOS[index % len(PRODUTOS)], str(1000 + index), f"{1 + index % 28:02d}/0{1 + index % 9}/2026",
+            " ".join(f"{generator.randint(1, 60):02d}" for _ in range(6)),
+            f"https://example.invalid/{index}", "R$ 3.000.000,00", "", "", "",
+            "sim" if index % 3 == 0 else "", "" if index % 5 else "ok", "", "", "", "",
+        ][: len(HEADERS) - index % 4])  # linhas curtas, como a API devolve
+    return values
+
+
+def _legacy_pick(headers, row, names):
+    """Busca antiga das filas: normaliza o cabeçalho e os apelidos a cada linha."""
+    normalized = {_norm(name): index for index, name in enumerate(headers) if _norm(name)}
+    for candidate in names:
+        key = _norm(candidate)
+        if key in normalized:
+            index = normalized[key]
+            return str(row[index] or "").strip() if index < len(row) else ""
+    return ""
+
+
+def test_registros_iguais_a_busca_por_linha():
+    values = _planilha_sintetica(2_000)
+    reader = compile_schema(HEADERS, _norm).reader("DailyRow", DAILY_FIELDS)
+
+    divergencias = [
+        sheet_row
+        for sheet_row, row in enumerate(values[1:], start=2)
+        if reader.read(row, sheet_row).as_dict()
+        != {field: _legacy_pick(HEADERS, row, aliases) for field, aliases in DAILY_FIELDS.items()}
+    ]
+
+    assert divergencias == []
+
+
+def test_registro_guarda_linha_e_campo_sem_coluna_vazio():
+    reader = compile_schema(["Produto"], _norm).reader("Parcial", {"loteria": ["Produto"], "url": ["URL"]})
+
+    record = reader.read(["  Quina "], 7)
+
+    assert record.sheet_row == 7
+    assert record.as_dict() == {"loteria": "Quina", "url": ""}
+
+
+def test_cabecalho_repetido_first_wins():
+    headers = ["Data", "Produto", "data"]
+
+    assert compile_schema(headers, _norm).index("Data") == 2
+    assert compile_schema(headers, _norm, first_wins=True).index("Data") == 0
+    assert compile_schema(headers, _norm, first_wins=True).index("Sorteio", "data") == 0
+    assert compile_schema(headers, _norm) is compile_schema(list(headers), _norm)
@@ -0,0 +1,138 @@
+import re
+
+import pytest
+
+pytest.importorskip("pytz")
+pytest.importorskip("tweepy")
+pytest.importorskip("gspread")
+
+import x_publisher  # noqa: E402
+
+DATA = {"loteria": "Mega-Sena", "concurso": "1", "data": "01/01/2026", "url": "https://example.com"}
+
+
+class CountingWorksheet:
+    """Aba em memória que conta as chamadas de API que o ledger faria no Google Sheets."""
+
+    def __init__(self, rows=()):
+        self.id = 0
+        self.title = "X_Publicacoes"
+        self.spreadsheet = None
+        self.data = [list(row) for row in rows] or [list(x_publisher.LEDGER_HEADERS)]
+        self.calls = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @staticmethod
+    def _origin(a1_range):
+        match = re.match(r"([A-Z]+)(\d+)", a1_range)
+        column = sum((ord(char) - 64) * 26 ** power for power, char in enumerate(reversed(match.group(1))))
+        return int(match.group(2)), column
+
+    def _set(self, a1_range, values):
+        first_row, column = self._origin(a1_range)
+        for offset, row_values in enumerate(values):
+            row = self.data[first_row - 1 + offset]
+            row.extend([""] * (column - 1 + len(row_values) - len(row)))
+            row[column - 1:column - 1 + len(row_values)] = list(row_values)
+
+    def get_all_values(self):
+        self._count("get_all_values")
+        return [list(row) for row in self.data]
+
+    def batch_get(self, ranges):
+        self._count("batch_get")
+        results = []
+        for a1_range in ranges:
+            first_row, _ = self._origin(a1_range)
+            last_row = re.search(r":[A-Z]+(\d+)$", a1_range)
+            last = int(last_row.group(1)) if last_row else len(self.data)
+            results.append([list(row) for row in self.data[first_row - 1:last]])
+        return results
+
+    def append_row(self, values, value_input_option="RAW"):
+        self._count("append_row")
+        self.data.append(list(values))
+        row_number = len(self.data)
+        return {"updates": {"updatedRange": f"'{self.title}'!A{row_number}:{x_publisher.LEDGER_LAST_COLUMN}{row_number}"}}
+
+    def update_cell(self, row, col, value):
+        self._count("update_cell")
+        self._set(x_publisher.rowcol_to_a1(row, col), [[value]])
+
+    def update(self, values, range_name, value_input_option="RAW"):
+        self._count("update")
+        self._set(range_name, values)
+
+    def batch_update(self, data, value_input_option="RAW"):
+        self._count("batch_update")
+        for item in data:
+            self._set(item["range"], item["values"])
+
+
+def _history(rows=200):
+    return [list(x_publisher.LEDGER_HEADERS)] + [
+        [f"evento-{index}", "POSTED", str(index), "ACC1", "", "", "", f"texto-{index}", "", "", x_publisher._iso(), ""]
+        for index in range(rows)
+    ]
+
+
+def _cycle(ws, updates):
+    x_publisher._ledger_load(ws)
+    with x_publisher._ledger_batch(ws):
+        appended = [
+            x_publisher._ledger_append(ws, f"novo-{position}", "PENDING", "ACC", DATA, f"hash-{position}")
+            for position in range(len(updates))
+        ]
+        for row_number, (status, extra) in zip(appended, updates):
+            x_publisher._ledger_update(ws, row_number, status, **extra)
+    return appended
+
+
+@pytest.fixture(autouse=True)
+def ledger_isolado(monkeypatch, tmp_path):
+    monkeypatch.setattr(x_publisher, "LEDGER_CACHE_DIR", str(tmp_path / "x_ledger"))
+    monkeypatch.setattr(x_publisher, "_ledger_indexes", {})
+
+
+@pytest.mark.parametrize(
+    "updates, expected",
+    [
+        # POSTED é gravado na hora, numa única faixa STATUS..DETAIL
+        ([("POSTED", {"tweet_id": "1", "media_hash": "m"})], {"update": 1}),
+        # sem POSTED, a atualização espera o fim do ciclo
+        ([("REJECTED", {"media_hash": "m", "detail": "400"})], {"update": 1}),
+        # várias contas no mesmo ciclo: um batch_update só
+        ([("DRY_RUN", {"tweet_id": "DRY-1"}), ("DRY_RUN", {"tweet_id": "DRY-2"})], {"batch_update": 1}),
+        # POSTED leva junto a linha pendente do ciclo
+        ([("MEDIA_DUPLICATE", {"media_hash": "m"}), ("POSTED", {"tweet_id": "2"})], {"batch_update": 1}),
+    ],
+    ids=["publicado", "rejeitado", "multicontas_dry_run", "multicontas_publicado"],
+)
+def test_chamadas_por_caminho(updates, expected):
+    ws = CountingWorksheet(_history())
+
+    appended = _cycle(ws, updates)
+
+    assert ws.calls == {"get_all_values": 1, "append_row": len(updates), **expected}
+    assert ws.calls.get("update_cell", 0) == 0
+    for row_number, (status, extra) in zip(appended, updates):
+        row = ws.data[row_number - 1]
+        assert row[1] == status
+        assert row[2] == extra.get("tweet_id", "")
+
+
+def test_rodada_seguinte_le_so_o_final_pelo_cache():
+    anterior = CountingWorksheet(_history())
+    _cycle(anterior, [("POSTED", {"tweet_id": "1"})])
+    # outra execução gravou uma linha que o cache ainda não conhece
+    rows = anterior.data + [["outro-evento", "POSTED", "9", "ACC2"] + [""] * 6 + [x_publisher._iso(), ""]]
+    x_publisher._ledger_indexes.clear()
+    ws = CountingWorksheet(rows)
+
+    ledger = x_publisher._ledger_load(ws)
+
+    assert ws.calls == {"batch_get": 1}
+    assert ledger["rows"] == len(rows)
+    assert "outro-evento" in ledger["posted_events"]
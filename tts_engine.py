@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Sequence, Tuple, TypeVar
+
+from media_cache import TTS_CACHE, MediaCache
+
+SegmentT = TypeVar("SegmentT")
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.8
+
+# Quadro MPEG-1 Layer III, 128 kbps, 44,1 kHz, mono, sem CRC: 417 bytes e 1152
+# amostras. Com side info e dados zerados o decodificador devolve silêncio.
+_SILENT_FRAME = bytes((0xFF, 0xFB, 0x90, 0xC4)) + bytes(413)
+_FRAME_SECONDS = 1152 / 44100
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+
+
+def backend_name() -> str:
+    return os.getenv("TTS_BACKEND", "edge").strip().lower() or "edge"
+
+
+class FakeCommunicate:
+    """Backend local que imita edge_tts.Communicate sem acessar a rede.
+
+    Grava um MP3 silencioso com duração proporcional ao texto e espera
+    ``TTS_FAKE_LATENCY`` segundos, simulando a ida e volta ao serviço.
+    """
+
+    def __init__(self, text: str, voice: str, rate: str = "+0%", pitch: str = "+0Hz", volume: str = "+0%") -> None:
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+        self.pitch = pitch
+        self.volume = volume
+        self.latency = _env_float("TTS_FAKE_LATENCY", 0.25)
+
+    def duration(self) -> float:
+        words = max(1, len(self.text.split()))
+        return 0.35 + words * 0.32
+
+    async def save(self, output: str) -> None:
+        await asyncio.sleep(self.latency)
+        frames = max(1, round(self.duration() / _FRAME_SECONDS))
+        Path(output).write_bytes(_SILENT_FRAME * frames)
+
+
+class CachedCommunicate:
+    """Envolve um comunicador e reaproveita o MP3 já sintetizado para a mesma fala."""
+
+    def __init__(self, inner: Any, key: str, cache: MediaCache = TTS_CACHE) -> None:
+        self.inner = inner
+        self.key = key
+        self.cache = cache
+
+    async def save(self, output: str) -> None:
+        if self.cache.fetch(self.key, output):
+            return
+        await self.inner.save(output)
+        self.cache.store(self.key, output)
+
+
+def phrase_key(backend: str, voice: str, rate: str, pitch: str, volume: str, text: str) -> str:
+    return MediaCache.key("tts", backend, voice, rate, pitch, volume, text)
+
+
+def communicate(text: str, voice: str, rate: str, pitch: str, volume: str):
+    """Cria o comunicador do backend configurado em ``TTS_BACKEND`` (edge ou fake)."""
+    backend = backend_name()
+    if backend == "fake":
+        inner = FakeCommunicate(text=text, voice=voice, rate=rate, pitch=pitch, volume=volume)
+    else:
+        import edge_tts
+
+        inner = edge_tts.Communicate(text=text, voice=voice, rate=rate, pitch=pitch, volume=volume)
+    if not TTS_CACHE.enabled:
+        return inner
+    return CachedCommunicate(inner, phrase_key(backend, voice, rate, pitch, volume, text))
+
+
+async def _with_retry(
+    synthesize_one: Callable[[SegmentT, Path], Awaitable[None]],
+    segment: SegmentT,
+    output: Path,
+    semaphore: asyncio.Semaphore,
+    retries: int,
+    backoff: float,
+) -> Path:
+    attempt = 0
+    while True:
+        async with semaphore:
+            try:
+                await synthesize_one(segment, output)
+                if not output.exists() or output.stat().st_size <= 0:
+                    raise RuntimeError(f"Síntese vazia em {output.name}.")
+                return output
+            except Exception:
+                attempt += 1
+                if attempt > retries:
+                    raise
+        # A espera acontece fora do semáforo para liberar a vaga a outro segmento.
+        await asyncio.sleep(backoff * (2 ** (attempt - 1)))
+
+
+async def synthesize_concurrently(
+    synthesize_one: Callable[[SegmentT, Path], Awaitable[None]],
+    jobs: Sequence[Tuple[SegmentT, Path]],
+    *,
+    concurrency: int | None = None,
+    retries: int | None = None,
+    backoff: float | None = None,
+) -> List[Path]:
+    """Sintetiza vários segmentos em paralelo, limitado por um semáforo.
+
+    Cada segmento tem novas tentativas com espera exponencial. O retorno segue a
+    ordem de ``jobs``, independentemente da ordem em que as falas terminam.
+    """
+    limit = max(1, concurrency if concurrency is not None else _env_int("TTS_CONCURRENCY", DEFAULT_CONCURRENCY))
+    attempts = max(0, retries if retries is not None else _env_int("TTS_RETRIES", DEFAULT_RETRIES))
+    delay = max(0.0, backoff if backoff is not None else _env_float("TTS_RETRY_BACKOFF", DEFAULT_BACKOFF))
+    semaphore = asyncio.Semaphore(limit)
+    tasks = [
+        asyncio.ensure_future(_with_retry(synthesize_one, segment, Path(output), semaphore, attempts, delay))
+        for segment, output in jobs
+    ]
+    try:
+        outputs = list(await asyncio.gather(*tasks))
+        TTS_CACHE.log_report()
+        return outputs
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def benchmark(segments: int = 40, latency: float = 0.25, concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """Compara síntese sequencial e concorrente com o backend falso, sem rede."""
+    import tempfile
+
+    async def fake_one(text: str, output: Path) -> None:
+        speaker = FakeCommunicate(text=text, voice="fake")
+        speaker.latency = latency
+        await speaker.save(str(output))
+
+    texts = [f"Dezena número {index}." for index in range(segments)]
+    report = {}
+    with tempfile.TemporaryDirectory(prefix="portalsimonsports-tts-bench-") as temporary:
+        for label, limit in (("sequencial", 1), ("concorrente", concurrency)):
+            jobs = [(text, Path(temporary) / f"{label}_{index:02d}.mp3") for index, text in enumerate(texts)]
+            started = time.perf_counter()
+            asyncio.run(synthesize_concurrently(fake_one, jobs, concurrency=limit, retries=0))
+            report[label] = round(time.perf_counter() - started, 3)
+    report["speedup"] = round(report["sequencial"] / max(report["concorrente"], 1e-9), 1)
+    return report
+
+
+__all__ = [
+    "CachedCommunicate",
+    "FakeCommunicate",
+    "backend_name",
+    "benchmark",
+    "communicate",
+    "phrase_key",
+    "synthesize_concurrently",
+]
+
+
+if __name__ == "__main__":
+    print(f"[TTS] segmentos=40 | {benchmark()}", flush=True)
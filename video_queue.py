@@ -3,9 +3,10 @@ from __future__ import annotations
 """Fila de vídeos das loterias para YouTube.
 
 Fluxo:
-1. lê a aba principal do Google Sheets;
+1. lê a aba principal do Google Sheets pelo espelho SQLite local (sheet_mirror.py);
 2. seleciona linhas com Enfileirado_Videos preenchido e Publicado_Youtube vazio;
-3. gera um único MP4 por resultado;
+3. gera um único MP4 por resultado (com VIDEO_RENDER_WORKERS != 1, vários
+   pacotes em paralelo, cada um enviado assim que fica pronto);
 4. envia o mesmo MP4 para todas as contas YouTube cadastradas no Cofre;
 5. grava o resumo de publicação na coluna Publicado_Youtube.
 """
@@ -15,14 +16,30 @@ import os
 import re
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from post_video import publicar_video_em_multicanais
+from post_video import listar_contas_youtube, publicar_video_em_multicanais, renderizar_pacote
+from sheet_mirror import mirror_for
+from sheet_schema import RowReader, RowRecord, SheetSchema, compile_schema
+from sheets_client import gspread_client
 
 TRUE_VALUES = {"1", "true", "sim", "yes", "y", "on", "ok", "enfileirado", "fila", "publicar"}
 FALSE_VALUES = {"0", "false", "nao", "não", "no", "n", "off", "cancelado", "cancelada"}
 
+# Campo -> apelidos aceitos no cabeçalho da aba principal, na ordem de preferência.
+VIDEO_FIELDS = {
+    "produto": ("Produto", "Loteria", "Modalidade", "Jogo"),
+    "concurso": ("Concurso", "Numero_Concurso", "Número do Concurso"),
+    "numeros": ("Numeros", "Números", "Descricao", "Descrição", "Resultado"),
+    "data": ("Data", "Data_Sorteio", "Data do Sorteio"),
+    "url": ("URL", "Link", "URL_Publicacao", "URL Blogger"),
+    "premio": ("Premio", "Prêmio", "Estimativa", "Premio_Estimado", "Prêmio estimado"),
+    "imagem_path": ("Imagem_Path", "Caminho_Imagem", "Arquivo_Imagem"),
+}
+
 
 @dataclass(frozen=True)
 class Config:
@@ -36,6 +53,7 @@ class Config:
     pausa: float
     dry_run: bool
     timezone: str
+    render_workers: int
 
 
 def _env(name: str, default: str = "") -> str:
@@ -74,6 +92,8 @@ def carregar_config() -> Config:
         pausa=_env_float("PAUSA_ENTRE_VIDEOS", 2.0, 0.0, 120.0),
         dry_run=_env_bool("DRY_RUN_VIDEOS", False),
         timezone=_env("TZ", "America/Sao_Paulo"),
+        # 1 = um pacote por vez (padrão); 0 = um processo por núcleo disponível.
+        render_workers=_env_int("VIDEO_RENDER_WORKERS", 1, 0, 64),
     )
 
 
@@ -112,19 +132,20 @@ def _empty(value: Any) -> bool:
     return str(value or "").strip() == ""
 
 
+def _schema(headers: Sequence[str]) -> SheetSchema:
+    return compile_schema(headers, _norm)
+
+
 def _header_map(headers: Sequence[str]) -> Dict[str, int]:
-    return {_norm(name): index for index, name in enumerate(headers) if _norm(name)}
+    return dict(_schema(headers).positions)
 
 
 def _find_col(headers: Sequence[str], candidates: Iterable[str], required: bool = False) -> Optional[int]:
-    normalized = _header_map(headers)
-    for candidate in candidates:
-        key = _norm(candidate)
-        if key in normalized:
-            return normalized[key]
-    if required:
+    candidates = tuple(candidates)
+    index = _schema(headers).index(*candidates)
+    if index is None and required:
         raise RuntimeError(f"Coluna obrigatória não encontrada. Esperado um de: {', '.join(candidates)}")
-    return None
+    return index
 
 
 def _ensure_column(ws: Any, headers: List[str], name: str) -> int:
@@ -142,12 +163,6 @@ def _ensure_column(ws: Any, headers: List[str], name: str) -> int:
 
 
 def _google_client() -> Any:
-    try:
-        import gspread
-        from oauth2client.service_account import ServiceAccountCredentials
-    except ImportError as exc:
-        raise RuntimeError("Dependências Google ausentes. Execute pip install -r requirements.txt") from exc
-
     raw = _env("GOOGLE_SERVICE_JSON")
     if not raw:
         raise RuntimeError("GOOGLE_SERVICE_JSON ausente nos secrets do GitHub.")
@@ -156,12 +171,12 @@ def _google_client() -> Any:
     except json.JSONDecodeError as exc:
         raise RuntimeError(f"GOOGLE_SERVICE_JSON inválido: {exc}") from exc
 
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    credentials = ServiceAccountCredentials.from_json_keyfile_dict(info, scopes)
-    return gspread.authorize(credentials)
+    # Cliente compartilhado do processo (sheets_client.py): quem chamar de novo recebe
+    # a mesma sessão e o mesmo token OAuth.
+    try:
+        return gspread_client(info)
+    except ImportError as exc:
+        raise RuntimeError("Dependências Google ausentes. Execute pip install -r requirements.txt") from exc
 
 
 def _load_cofre(client: Any, cfg: Config):
@@ -231,7 +246,8 @@ def _extract_numbers(value: Any) -> str:
     return re.sub(r"^n[uú]meros?\s*:\s*", "", text, flags=re.I).strip()
 
 
-def _asset_path(folder: str, loteria: str, extensions: Sequence[str]) -> str:
+@lru_cache(maxsize=256)
+def _asset_path(folder: str, loteria: str, extensions: Tuple[str, ...]) -> str:
     slug = _slug(loteria)
     aliases = {
         "megasena": "mega-sena",
@@ -249,26 +265,22 @@ def _asset_path(folder: str, loteria: str, extensions: Sequence[str]) -> str:
     return ""
 
 
-def _row_to_video_data(row: Sequence[str], headers: Sequence[str]) -> Dict[str, Any]:
-    def pick(*names: str) -> str:
-        idx = _find_col(headers, names)
-        if idx is None or idx >= len(row):
-            return ""
-        return str(row[idx] or "").strip()
-
-    product = pick("Produto", "Loteria", "Modalidade", "Jogo")
-    contest_raw = pick("Concurso", "Numero_Concurso", "Número do Concurso")
-    loteria, concurso = _parse_product(product, contest_raw)
-    numbers = _extract_numbers(pick("Numeros", "Números", "Descricao", "Descrição", "Resultado"))
-    data = pick("Data", "Data_Sorteio", "Data do Sorteio")
-    url = pick("URL", "Link", "URL_Publicacao", "URL Blogger")
-    premio = pick("Premio", "Prêmio", "Estimativa", "Premio_Estimado", "Prêmio estimado")
-    image_path = pick("Imagem_Path", "Caminho_Imagem", "Arquivo_Imagem")
+def _video_reader(headers: Sequence[str]) -> RowReader:
+    return _schema(headers).reader("VideoRow", VIDEO_FIELDS)
+
+
+def _record_to_video_data(record: RowRecord) -> Dict[str, Any]:
+    loteria, concurso = _parse_product(record.produto, record.concurso)
+    numbers = _extract_numbers(record.numeros)
+    data = record.data
+    url = record.url
+    premio = record.premio
+    image_path = record.imagem_path
 
     if image_path and not os.path.exists(image_path):
         image_path = ""
     if not image_path:
-        image_path = _asset_path("fundos", loteria, ["jpg", "jpeg", "png", "webp"])
+        image_path = _asset_path("fundos", loteria, ("jpg", "jpeg", "png", "webp"))
 
     return {
         "loteria": loteria,
@@ -278,7 +290,7 @@ def _row_to_video_data(row: Sequence[str], headers: Sequence[str]) -> Dict[str,
         "url": url,
         "premio": premio,
         "imagem_path": image_path,
-        "logo_path": _asset_path("logos", loteria, ["png", "webp", "jpg"]),
+        "logo_path": _asset_path("logos", loteria, ("png", "webp", "jpg")),
         "duracao": _env_float("DURACAO_VIDEO", 8.0, 4.0, 30.0),
         "title": f"Resultado {loteria} — Concurso {concurso}".strip(" —"),
         "description": (
@@ -291,12 +303,101 @@ def _row_to_video_data(row: Sequence[str], headers: Sequence[str]) -> Dict[str,
     }
 
 
+def _row_to_video_data(row: Sequence[str], headers: Sequence[str]) -> Dict[str, Any]:
+    return _record_to_video_data(_video_reader(headers).read(row))
+
+
 def _validate_video_data(data: Mapping[str, Any]) -> None:
     missing = [name for name in ("loteria", "numeros") if not str(data.get(name) or "").strip()]
     if missing:
         raise RuntimeError(f"Dados insuficientes para gerar vídeo: {', '.join(missing)}")
 
 
+def _render_workers(cfg: Config, jobs: int) -> int:
+    workers = cfg.render_workers or (os.cpu_count() or 1)
+    return max(1, min(workers, jobs))
+
+
+def _publicar_e_marcar(
+    ws: Any,
+    published_idx: int,
+    sheet_row: int,
+    data: Dict[str, Any],
+    cfg: Config,
+    cofre_get: Any,
+    cofre_cache: Dict[str, Any],
+    pacote: Optional[Dict[str, Any]] = None,
+) -> bool:
+    result = publicar_video_em_multicanais(
+        data,
+        cofre_get,
+        cofre_cache,
+        dry_run=cfg.dry_run,
+        sleep_between_channels=max(0.5, min(cfg.pausa, 15.0)),
+        tz_name=cfg.timezone,
+        pacote=pacote,
+    )
+    if result.get("ok_any"):
+        if cfg.dry_run:
+            _log(f"Linha {sheet_row}: DRY RUN concluído; planilha não alterada.")
+            return False
+        mirror_for(ws).mark(sheet_row, published_idx + 1, str(result.get("mark_value") or "Publicado YOUTUBE"), flush=True)
+        _log(f"Linha {sheet_row}: publicada e marcada na planilha.")
+        return True
+    _log(f"Linha {sheet_row}: nenhuma publicação concluída. {result.get('mark_value', '')}")
+    return False
+
+
+def publicar_linhas(
+    ws: Any,
+    published_idx: int,
+    jobs: Sequence[Tuple[int, Dict[str, Any]]],
+    cfg: Config,
+    cofre_get: Any,
+    cofre_cache: Dict[str, Any],
+) -> int:
+    """Gera e publica cada linha, marcando a planilha linha a linha.
+
+    Com mais de um processo, os pacotes são gerados em um ProcessPoolExecutor e o
+    upload de cada um começa assim que ele termina, enquanto os demais seguem
+    renderizando. A marcação continua no processo principal, sempre na linha
+    de origem do pacote concluído.
+    """
+    started = time.perf_counter()
+    workers = _render_workers(cfg, len(jobs))
+    if cfg.dry_run or not listar_contas_youtube(cofre_cache):
+        workers = 1
+    successes = 0
+
+    if workers <= 1:
+        for sheet_row, data in jobs:
+            try:
+                successes += _publicar_e_marcar(ws, published_idx, sheet_row, data, cfg, cofre_get, cofre_cache)
+            except Exception as exc:
+                _log(f"Linha {sheet_row}: ERRO: {exc}")
+                traceback.print_exc()
+            time.sleep(cfg.pausa)
+    else:
+        _log(f"Lote: {len(jobs)} pacotes em {workers} processos; envio conforme cada pacote fica pronto.")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(renderizar_pacote, data): (sheet_row, data) for sheet_row, data in jobs}
+            for future in as_completed(futures):
+                sheet_row, data = futures[future]
+                try:
+                    pacote = future.result()
+                    _log(f"Linha {sheet_row}: pacote pronto em {time.perf_counter() - started:.1f}s.")
+                    successes += _publicar_e_marcar(
+                        ws, published_idx, sheet_row, data, cfg, cofre_get, cofre_cache, pacote=pacote
+                    )
+                except Exception as exc:
+                    _log(f"Linha {sheet_row}: ERRO: {exc}")
+                    traceback.print_exc()
+                time.sleep(cfg.pausa)
+
+    _log(f"Etapa de geração e envio: {time.perf_counter() - started:.1f}s | processos={workers}")
+    return successes
+
+
 def processar_fila() -> int:
     cfg = carregar_config()
     _log(f"Início | aba={cfg.sheet_tab} | max={cfg.max_videos} | dry_run={cfg.dry_run} | publicado={cfg.publicado_col}")
@@ -304,17 +405,17 @@ def processar_fila() -> int:
     client = _google_client()
     cofre_cache, cofre_get = _load_cofre(client, cfg)
     ws = client.open_by_key(cfg.google_sheet_id).worksheet(cfg.sheet_tab)
-    values = ws.get_all_values()
-    if not values:
+    mirror = mirror_for(ws)
+    headers = mirror.header()
+    if not headers:
         _log("Aba principal vazia.")
         return 0
 
-    headers = list(values[0])
     queue_idx = _ensure_column(ws, headers, cfg.enfileirado_col)
     published_idx = _ensure_column(ws, headers, cfg.publicado_col)
 
     candidates: List[Tuple[int, Sequence[str]]] = []
-    for sheet_row, row in enumerate(values[1:], start=2):
+    for sheet_row, row in mirror.pending(published_idx + 1, filled=queue_idx + 1):
         queue_value = row[queue_idx] if queue_idx < len(row) else ""
         published_value = row[published_idx] if published_idx < len(row) else ""
         if _truthy_queue(queue_value) and _empty(published_value):
@@ -325,38 +426,19 @@ def processar_fila() -> int:
         return 0
 
     _log(f"Pendentes encontrados: {len(candidates)}; processando até {cfg.max_videos}.")
-    successes = 0
 
+    jobs: List[Tuple[int, Dict[str, Any]]] = []
     for sheet_row, row in candidates[: cfg.max_videos]:
         try:
             data = _row_to_video_data(row, headers)
             _validate_video_data(data)
             _log(f"Linha {sheet_row}: {data['loteria']} concurso {data['concurso'] or '-'}")
-
-            result = publicar_video_em_multicanais(
-                data,
-                cofre_get,
-                cofre_cache,
-                dry_run=cfg.dry_run,
-                sleep_between_channels=max(0.5, min(cfg.pausa, 15.0)),
-                tz_name=cfg.timezone,
-            )
-
-            if result.get("ok_any"):
-                if cfg.dry_run:
-                    _log(f"Linha {sheet_row}: DRY RUN concluído; planilha não alterada.")
-                else:
-                    ws.update_cell(sheet_row, published_idx + 1, str(result.get("mark_value") or "Publicado YOUTUBE"))
-                    successes += 1
-                    _log(f"Linha {sheet_row}: publicada e marcada na planilha.")
-            else:
-                _log(f"Linha {sheet_row}: nenhuma publicação concluída. {result.get('mark_value', '')}")
-
+            jobs.append((sheet_row, data))
         except Exception as exc:
             _log(f"Linha {sheet_row}: ERRO: {exc}")
             traceback.print_exc()
 
-        time.sleep(cfg.pausa)
+    successes = publicar_linhas(ws, published_idx, jobs, cfg, cofre_get, cofre_cache)
 
     _log(f"Fim | publicações confirmadas: {successes}")
     return successes
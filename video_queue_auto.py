@@ -2,14 +2,12 @@ from __future__ import annotations
 
 import os
 import re
-import time
-import traceback
 import unicodedata
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Sequence, Tuple
 
-from post_video import publicar_video_em_multicanais
+from sheet_mirror import SheetMirror, mirror_for
 from video_queue import (
     _empty,
     _ensure_column,
@@ -17,10 +15,13 @@ from video_queue import (
     _google_client,
     _load_cofre,
     _log,
-    _row_to_video_data,
+    _parse_product,
+    _record_to_video_data,
     _truthy_queue,
     _validate_video_data,
+    _video_reader,
     carregar_config,
+    publicar_linhas,
 )
 
 Candidate = Tuple[int, Sequence[str], Dict[str, Any], datetime | None]
@@ -90,31 +91,29 @@ def _legacy_scheduled_workflow_should_skip() -> bool:
 
 
 def _recent_published_counts(
-    values: List[List[str]],
+    mirror: SheetMirror,
     headers: List[str],
     published_index: int,
 ) -> Dict[str, int]:
     balance_days = _env_int("VIDEO_MODALITY_BALANCE_DAYS", 30, 1, 3650)
     cutoff = datetime.now() - timedelta(days=balance_days)
     counts: Dict[str, int] = {}
-    for row in values[1:]:
+    reader = _video_reader(headers)
+    for sheet_row, row in mirror.filled(published_index + 1):
         published = row[published_index] if published_index < len(row) else ""
         if _empty(published):
             continue
-        try:
-            data = _row_to_video_data(row, headers)
-        except Exception:
-            continue
-        result_date = _parse_date(data.get("data"))
+        record = reader.read(row, sheet_row)
+        result_date = _parse_date(record.data)
         if result_date is not None and result_date < cutoff:
             continue
-        key = _lottery_key(data.get("loteria"))
+        key = _lottery_key(_parse_product(record.produto, record.concurso)[0])
         if key:
             counts[key] = counts.get(key, 0) + 1
     return counts
 
 
-def _candidate_rows(values: List[List[str]], headers: List[str], published_index: int) -> List[Candidate]:
+def _candidate_rows(mirror: SheetMirror, headers: List[str], published_index: int) -> List[Candidate]:
     auto_enqueue = _env_bool("AUTO_ENQUEUE_VIDEOS", True)
     backlog_days = _env_int("VIDEO_BACKLOG_DAYS", 7, 1, 3650)
     allow_old_queued = _env_bool("ALLOW_OLD_QUEUED_VIDEOS", False)
@@ -122,10 +121,12 @@ def _candidate_rows(values: List[List[str]], headers: List[str], published_index
     target_modality, target_contest = _target_filters()
     cutoff = datetime.now() - timedelta(days=backlog_days)
     queue_index = _find_col(headers, ["Enfileirado_Videos", "Enfileirado Videos", "Fila_Video"])
-    published_counts = _recent_published_counts(values, headers, published_index)
+    published_counts = _recent_published_counts(mirror, headers, published_index)
+
+    reader = _video_reader(headers)
 
     candidates: List[Candidate] = []
-    for sheet_row, row in enumerate(values[1:], start=2):
+    for sheet_row, row in mirror.pending(published_index + 1):
         published = row[published_index] if published_index < len(row) else ""
         if not _empty(published):
             continue
@@ -134,20 +135,23 @@ def _candidate_rows(values: List[List[str]], headers: List[str], published_index
         if not queued and not auto_enqueue:
             continue
 
-        try:
-            data = _row_to_video_data(row, headers)
-            _validate_video_data(data)
-        except Exception:
-            continue
-
-        modality_key = _lottery_key(data.get("loteria"))
-        contest_key = _contest_key(data.get("concurso"))
+        # Filtros do disparo imediato direto no registro, antes de montar os dados do vídeo.
+        record = reader.read(row, sheet_row)
+        loteria, concurso = _parse_product(record.produto, record.concurso)
+        modality_key = _lottery_key(loteria)
+        contest_key = _contest_key(concurso)
 
         if target_modality and modality_key != target_modality:
             continue
         if target_contest and contest_key != target_contest:
             continue
 
+        try:
+            data = _record_to_video_data(record)
+            _validate_video_data(data)
+        except Exception:
+            continue
+
         if modality_key in excluded_modalities:
             _log(f"Linha {sheet_row} ignorada: modalidade excluída nesta execução ({data.get('loteria')}).")
             continue
@@ -226,14 +230,14 @@ def processar_fila_automatica() -> int:
     client = _google_client()
     cofre_cache, cofre_get = _load_cofre(client, config)
     worksheet = client.open_by_key(config.google_sheet_id).worksheet(config.sheet_tab)
-    values = worksheet.get_all_values()
-    if not values:
+    mirror = mirror_for(worksheet)
+    headers = mirror.header()
+    if not headers:
         _log("Aba principal vazia.")
         return 0
 
-    headers = list(values[0])
     published_index = _ensure_column(worksheet, headers, config.publicado_col)
-    candidates = _candidate_rows(values, headers, published_index)
+    candidates = _candidate_rows(mirror, headers, published_index)
     if not candidates:
         if targeted:
             _log(
@@ -257,36 +261,11 @@ def processar_fila_automatica() -> int:
         f"Pendentes elegíveis encontrados: {len(candidates)}; processando {len(selected)} "
         + ("resultado informado pelo evento." if targeted else "com equilíbrio entre modalidades.")
     )
-    successes = 0
-
+    jobs = []
     for sheet_row, _row, data, _result_date in selected:
-        try:
-            _log(f"Linha {sheet_row}: {data['loteria']} concurso {data.get('concurso') or '-'}")
-            result = publicar_video_em_multicanais(
-                data,
-                cofre_get,
-                cofre_cache,
-                dry_run=config.dry_run,
-                sleep_between_channels=max(0.5, min(config.pausa, 15.0)),
-                tz_name=config.timezone,
-            )
-            if result.get("ok_any"):
-                if config.dry_run:
-                    _log(f"Linha {sheet_row}: DRY RUN concluído; planilha não alterada.")
-                else:
-                    worksheet.update_cell(
-                        sheet_row,
-                        published_index + 1,
-                        str(result.get("mark_value") or "Publicado YOUTUBE"),
-                    )
-                    successes += 1
-                    _log(f"Linha {sheet_row}: publicada e marcada na planilha.")
-            else:
-                _log(f"Linha {sheet_row}: nenhuma publicação concluída. {result.get('mark_value', '')}")
-        except Exception as error:
-            _log(f"Linha {sheet_row}: ERRO: {error}")
-            traceback.print_exc()
-        time.sleep(config.pausa)
+        _log(f"Linha {sheet_row}: {data['loteria']} concurso {data.get('concurso') or '-'}")
+        jobs.append((sheet_row, data))
+    successes = publicar_linhas(worksheet, published_index, jobs, config, cofre_get, cofre_cache)
 
     _log(f"Fila automática concluída | publicações confirmadas: {successes}")
     return successes
@@ -10,6 +10,8 @@ from zoneinfo import ZoneInfo
 
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
 
+from font_registry import SANS
+
 WIDTH = int(os.getenv("VIDEO_WIDTH", "1080"))
 HEIGHT = int(os.getenv("VIDEO_HEIGHT", "1920"))
 
@@ -55,15 +57,7 @@ def _palette(loteria: str, override: Any = None):
 
 
 def _font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    real_size = max(10, round(size * WIDTH / 1080.0))
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
-    ]
-    for path in candidates:
-        if os.path.exists(path):
-            return ImageFont.truetype(path, size=real_size)
-    return ImageFont.load_default()
+    return SANS.get(max(10, round(size * WIDTH / 1080.0)), bold)
 
 
 def _s(value: int | float) -> int:
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Sequence
 
-import edge_tts
+import tts_engine
 
 
 VOICE_FRANCISCA = "pt-BR-FranciscaNeural"
@@ -254,7 +254,7 @@ def build_segments(
 
 async def _synthesize_one(segment: SpeechSegment, output: Path) -> None:
     settings = VOICE_SETTINGS[segment.voice]
-    communicator = edge_tts.Communicate(
+    communicator = tts_engine.communicate(
         text=segment.text,
         voice=segment.voice,
         rate=settings["rate"],
@@ -265,12 +265,8 @@ async def _synthesize_one(segment: SpeechSegment, output: Path) -> None:
 
 
 async def _synthesize_all(segments: List[SpeechSegment], directory: Path) -> List[Path]:
-    outputs: List[Path] = []
-    for index, segment in enumerate(segments):
-        output = directory / f"fala_{index:02d}.mp3"
-        await _synthesize_one(segment, output)
-        outputs.append(output)
-    return outputs
+    jobs = [(segment, directory / f"fala_{index:02d}.mp3") for index, segment in enumerate(segments)]
+    return await tts_engine.synthesize_concurrently(_synthesize_one, jobs)
 
 
 def synthesize_narration_mix(
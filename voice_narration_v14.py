@@ -9,7 +9,8 @@ from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-import edge_tts
+import audio_probe
+import tts_engine
 
 
 VOICE_FRANCISCA = "pt-BR-FranciscaNeural"
@@ -283,7 +284,7 @@ def build_segments(
 
 async def _synthesize_one(segment: SpeechSegment, output: Path) -> None:
     settings = VOICE_SETTINGS[segment.voice]
-    communicator = edge_tts.Communicate(
+    communicator = tts_engine.communicate(
         text=segment.text,
         voice=segment.voice,
         rate=segment.rate or settings["rate"],
@@ -294,33 +295,12 @@ async def _synthesize_one(segment: SpeechSegment, output: Path) -> None:
 
 
 async def _synthesize_all(segments: List[SpeechSegment], directory: Path) -> List[Path]:
-    outputs: List[Path] = []
-    for index, segment in enumerate(segments):
-        output = directory / f"fala_{index:02d}.mp3"
-        await _synthesize_one(segment, output)
-        outputs.append(output)
-    return outputs
+    jobs = [(segment, directory / f"fala_{index:02d}.mp3") for index, segment in enumerate(segments)]
+    return await tts_engine.synthesize_concurrently(_synthesize_one, jobs)
 
 
 def _clip_duration(path: Path) -> float:
-    process = subprocess.run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            str(path),
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if process.returncode != 0:
-        raise RuntimeError(f"Não foi possível medir a duração de {path.name}: {process.stderr[-1000:]}")
-    return max(0.05, float(process.stdout.strip()))
+    return audio_probe.clip_duration(path)
 
 
 def _resolve_non_overlapping_schedule(
@@ -335,7 +315,7 @@ def _resolve_non_overlapping_schedule(
     fala anterior ainda está tocando. Esse controle elimina a sobreposição que
     reduzia a qualidade da locução.
     """
-    clip_durations = [_clip_duration(path) for path in clips]
+    clip_durations = audio_probe.clip_durations(clips)
     gap = 0.10 if compact else 0.42
     cursor = 0.0
     resolved: List[SpeechSegment] = []
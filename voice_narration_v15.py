@@ -8,8 +8,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-import edge_tts
-
+import audio_probe
+import tts_engine
 from voice_narration_v14 import (
     VOICE_ANTONIO,
     VOICE_FRANCISCA,
@@ -204,7 +204,7 @@ def build_segments(
 
 async def _synthesize_one(segment: SpeechSegment, output: Path) -> None:
     settings = VOICE_SETTINGS[segment.voice]
-    communicator = edge_tts.Communicate(
+    communicator = tts_engine.communicate(
         text=segment.text,
         voice=segment.voice,
         rate=segment.rate or settings["rate"],
@@ -215,33 +215,12 @@ async def _synthesize_one(segment: SpeechSegment, output: Path) -> None:
 
 
 async def _synthesize_all(segments: List[SpeechSegment], directory: Path) -> List[Path]:
-    outputs: List[Path] = []
-    for index, segment in enumerate(segments):
-        output = directory / f"fala_{index:02d}.mp3"
-        await _synthesize_one(segment, output)
-        outputs.append(output)
-    return outputs
+    jobs = [(segment, directory / f"fala_{index:02d}.mp3") for index, segment in enumerate(segments)]
+    return await tts_engine.synthesize_concurrently(_synthesize_one, jobs)
 
 
 def _clip_duration(path: Path) -> float:
-    process = subprocess.run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
-            str(path),
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if process.returncode != 0:
-        raise RuntimeError(f"Não foi possível medir {path.name}: {process.stderr[-1200:]}")
-    return max(0.05, float(process.stdout.strip()))
+    return audio_probe.clip_duration(path)
 
 
 def _fit_segments(
@@ -253,8 +232,8 @@ def _fit_segments(
     gap = 0.07 if compact else 0.22
     fitted: List[FittedSegment] = []
 
-    for index, (segment, clip) in enumerate(zip(segments, clips)):
-        clip_duration = _clip_duration(clip)
+    clip_durations = audio_probe.clip_durations(clips)
+    for index, (segment, clip, clip_duration) in enumerate(zip(segments, clips, clip_durations)):
         next_start = segments[index + 1].start if index + 1 < len(segments) else duration
         available = max(0.12, next_start - segment.start - gap)
         speed = max(1.0, clip_duration / available)
@@ -8,7 +8,6 @@ não publicar simultaneamente com a primeira.
 from __future__ import annotations
 
 import hashlib
-import io
 import os
 import re
 import time
@@ -19,6 +18,10 @@ from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageOps
 
 import bot
 import x_publisher as base
+from font_registry import DEJAVU, LIBERATION, family
+from image_encode import policy_for
+from image_store import RenderedImage, image_store, row_key
+from sheet_mirror import mirror_for
 
 
 def _label(account: Any) -> str:
@@ -55,7 +58,7 @@ def _detail(event_key: str, account_label: str, profile: int, extra: str = "") -
 
 
 def _snapshot(ledger_ws: Any) -> Dict[str, Any]:
-    values = ledger_ws.get_all_values()
+    values = base._ledger_index(ledger_ws).rows
     posted_keys: Set[str] = set()
     posted_by_base: Dict[str, Set[str]] = {}
     tweet_ids: Dict[str, Dict[str, str]] = {}
@@ -115,11 +118,14 @@ def _status_candidate(status: str, ttl: int) -> bool:
 
 
 def _candidates(ws: Any) -> List[Tuple[int, List[str]]]:
-    rows = ws.get_all_values()
+    mirror = mirror_for(ws)
     status_col = base._status_column(ws)
     ttl = base._cfg_int("X_CLAIM_TTL_MINUTES", 60, 10, 1440)
+    rows = mirror.pending(status_col)
+    rows += mirror.by_status_prefix(status_col, "PENDENTE_X_CONTAS|")
+    rows += mirror.by_status_prefix(status_col, "PROCESSANDO_X|")
     found = []
-    for row_number, row in enumerate(rows[1:], start=2):
+    for row_number, row in rows:
         status = row[status_col - 1] if len(row) >= status_col else ""
         if _status_candidate(status, ttl) and bot._row_has_min_payload(row):
             priority = 0 if str(status).startswith("PENDENTE_X_CONTAS|") else 1
@@ -133,7 +139,9 @@ def _mark_pending(ws: Any, row_number: int, pending: Sequence[str], complete: Se
         f"PENDENTE_X_CONTAS|faltam={','.join(pending) or '-'}|"
         f"concluidas={','.join(complete) or '-'}|{base._iso()}"
     )
-    ws.update_cell(row_number, base._status_column(ws), value[:500])
+    status_col = base._status_column(ws)
+    ws.update_cell(row_number, status_col, value[:500])
+    mirror_for(ws).apply({(row_number, status_col): value[:500]})
 
 
 def _mark_complete(
@@ -209,18 +217,15 @@ def montar_texto(row: Sequence[str], event_key: str, account_label: str, profile
     return _fit([body, source, disclosure, link, tag])
 
 
+_FONTS = family(
+    "x",
+    [f"{DEJAVU}/DejaVuSans.ttf", f"{LIBERATION}/LiberationSans-Regular.ttf"],
+    [f"{DEJAVU}/DejaVuSans-Bold.ttf", f"{LIBERATION}/LiberationSans-Bold.ttf"],
+)
+
+
 def _font(size: int, bold: bool = False) -> ImageFont.ImageFont:
-    paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-    ]
-    for path in paths:
-        if os.path.exists(path):
-            try:
-                return ImageFont.truetype(path, size)
-            except Exception:
-                pass
-    return ImageFont.load_default()
+    return _FONTS.get(size, bold)
 
 
 def _accent(account_label: str, profile: int) -> Tuple[int, int, int]:
@@ -283,16 +288,20 @@ def _bulletin(base_image: Image.Image, data: Dict[str, str], label: str, profile
     return canvas
 
 
-def gerar_imagem(row: Sequence[str], account_label: str, profile: int) -> io.BytesIO:
-    source = bot._build_image_from_row(row)
-    source.seek(0)
-    base_image = Image.open(source).convert("RGB")
+def gerar_imagem(row: Sequence[str], account_label: str, profile: int) -> RenderedImage:
+    # Parte da base RGB já renderizada pelo bot nesta rodada (sem decodificar o PNG) e
+    # guarda a versão da conta no mesmo image_store, com a conta/perfil como variante.
+    # Codifica direto na política de envio do X (IMAGE_ENCODE_X).
     data = base._event_data(row)
-    image = [_classic, _panel, _bulletin][profile % 3](base_image, data, account_label, profile)
-    output = io.BytesIO()
-    image.save(output, format="PNG", optimize=True)
-    output.seek(0)
-    return output
+    policy = policy_for("X")
+
+    def render() -> RenderedImage:
+        base_image = bot._rendered_image(row).rgb()
+        image = [_classic, _panel, _bulletin][profile % 3](base_image, data, account_label, profile)
+        return RenderedImage.from_image(image, policy, keep_rgb=False)
+
+    key = (row_key([f"{name}={value}" for name, value in sorted(data.items())]), ("x", account_label, profile, policy.name))
+    return image_store.get(key, render)
 
 
 def _accounts(accounts: Sequence[Any], event_key: str) -> List[Any]:
@@ -368,164 +377,164 @@ def publicar_x_automatico(main_ws: Any) -> base.XRunResult:
             continue
 
         row_error = False
-        for profile, account in enumerate(accounts):
-            if sent_run >= max_run or remaining <= 0:
-                break
-            label = _label(account)
-            if label in complete:
-                continue
-            if not _eligible(event_key, profile, snapshot, stagger):
-                continue
-
-            scoped_key = _scoped_key(event_key, label)
-            if scoped_key in snapshot["posted_keys"]:
-                complete.add(label)
-                continue
-
-            text = montar_texto(row, event_key, label, profile)
-            text_hash = base._sha256_text(text)
-            if text_hash in snapshot["text_hashes"]:
-                base._mark_error(main_ws, row_number, "TEXTO_DUPLICADO", f"conta={label}|hash={text_hash[:16]}")
-                result.errors += 1
-                row_error = True
-                break
-
-            ledger_row = base._ledger_append(
-                ledger_ws,
-                scoped_key,
-                "PENDING",
-                _name(account),
-                data,
-                text_hash,
-                detail=_detail(event_key, label, profile),
-            )
-            media_hash = ""
-            media_ids = None
-
-            try:
-                if bot._x_post_with_image() and not bot.DRY_RUN:
-                    try:
-                        image = gerar_imagem(row, label, profile)
-                        media_hash = base._sha256_bytes(image.getvalue())
-                    except Exception as image_exc:
-                        detail = f"Falha ao gerar imagem distinta: {image_exc}"
-                        base._ledger_update(
-                            ledger_ws,
-                            ledger_row,
-                            "IMAGE_ERROR",
-                            detail=_detail(event_key, label, profile, detail),
-                        )
-                        base._mark_error(main_ws, row_number, "IMAGEM", f"conta={label}|{detail}")
-                        result.errors += 1
-                        row_error = True
-                        break
+        with base._ledger_batch(ledger_ws):
+            for profile, account in enumerate(accounts):
+                if sent_run >= max_run or remaining <= 0:
+                    break
+                label = _label(account)
+                if label in complete:
+                    continue
+                if not _eligible(event_key, profile, snapshot, stagger):
+                    continue
+
+                scoped_key = _scoped_key(event_key, label)
+                if scoped_key in snapshot["posted_keys"]:
+                    complete.add(label)
+                    continue
 
-                    if media_hash in snapshot["media_hashes"]:
-                        detail = f"Imagem repetida em {label}; hash={media_hash[:16]}"
+                text = montar_texto(row, event_key, label, profile)
+                text_hash = base._sha256_text(text)
+                if text_hash in snapshot["text_hashes"]:
+                    base._mark_error(main_ws, row_number, "TEXTO_DUPLICADO", f"conta={label}|hash={text_hash[:16]}")
+                    result.errors += 1
+                    row_error = True
+                    break
+
+                ledger_row = base._ledger_append(
+                    ledger_ws,
+                    scoped_key,
+                    "PENDING",
+                    _name(account),
+                    data,
+                    text_hash,
+                    detail=_detail(event_key, label, profile),
+                )
+                media_hash = ""
+                media_ids = None
+
+                try:
+                    if bot._x_post_with_image() and not bot.DRY_RUN:
+                        try:
+                            image = gerar_imagem(row, label, profile)
+                            media_hash = base._sha256_bytes(image.data)
+                        except Exception as image_exc:
+                            detail = f"Falha ao gerar imagem distinta: {image_exc}"
+                            base._ledger_update(
+                                ledger_ws,
+                                ledger_row,
+                                "IMAGE_ERROR",
+                                detail=_detail(event_key, label, profile, detail),
+                            )
+                            base._mark_error(main_ws, row_number, "IMAGEM", f"conta={label}|{detail}")
+                            result.errors += 1
+                            row_error = True
+                            break
+
+                        if media_hash in snapshot["media_hashes"]:
+                            detail = f"Imagem repetida em {label}; hash={media_hash[:16]}"
+                            base._ledger_update(
+                                ledger_ws,
+                                ledger_row,
+                                "MEDIA_DUPLICATE",
+                                media_hash=media_hash,
+                                detail=_detail(event_key, label, profile, detail),
+                            )
+                            if require_distinct_media:
+                                base._mark_error(main_ws, row_number, "MIDIA_DUPLICADA", detail)
+                                result.errors += 1
+                                row_error = True
+                                break
+                            media_hash = ""
+                        else:
+                            media = account.api_v1.media_upload(
+                                filename=f"resultado-{label.lower()}-{event_key[:10]}.{image.extension}",
+                                file=image.buffer(),
+                            )
+                            media_ids = [media.media_id_string]
+
+                    if bot.DRY_RUN:
+                        fake_id = f"DRY-{label}-{scoped_key[:10]}"
+                        base._log(f"DRY_RUN | {_name(account)} | perfil={profile}\n{text}")
                         base._ledger_update(
                             ledger_ws,
                             ledger_row,
-                            "MEDIA_DUPLICATE",
+                            "DRY_RUN",
+                            tweet_id=fake_id,
                             media_hash=media_hash,
-                            detail=_detail(event_key, label, profile, detail),
+                            detail=_detail(event_key, label, profile, "dry_run=true"),
                         )
-                        if require_distinct_media:
-                            base._mark_error(main_ws, row_number, "MIDIA_DUPLICADA", detail)
-                            result.errors += 1
-                            row_error = True
-                            break
-                        media_hash = ""
-                    else:
-                        image.seek(0)
-                        media = account.api_v1.media_upload(
-                            filename=f"resultado-{label.lower()}-{event_key[:10]}.png",
-                            file=image,
-                        )
-                        media_ids = [media.media_id_string]
+                        result.skipped += 1
+                        continue
 
-                if bot.DRY_RUN:
-                    fake_id = f"DRY-{label}-{scoped_key[:10]}"
-                    base._log(f"DRY_RUN | {_name(account)} | perfil={profile}\n{text}")
+                    response = account.client_v2.create_tweet(text=text, media_ids=media_ids)
+                    tweet_id = str(response.data["id"])
                     base._ledger_update(
                         ledger_ws,
                         ledger_row,
-                        "DRY_RUN",
-                        tweet_id=fake_id,
+                        "POSTED",
+                        tweet_id=tweet_id,
                         media_hash=media_hash,
-                        detail=_detail(event_key, label, profile, "dry_run=true"),
+                        detail=_detail(event_key, label, profile, f"published_to={_name(account)}"),
                     )
-                    result.skipped += 1
-                    continue
-
-                response = account.client_v2.create_tweet(text=text, media_ids=media_ids)
-                tweet_id = str(response.data["id"])
-                base._ledger_update(
-                    ledger_ws,
-                    ledger_row,
-                    "POSTED",
-                    tweet_id=tweet_id,
-                    media_hash=media_hash,
-                    detail=_detail(event_key, label, profile, f"published_to={_name(account)}"),
-                )
-                complete.add(label)
-                tweet_ids[label] = tweet_id
-                snapshot["posted_keys"].add(scoped_key)
-                snapshot["posted_by_base"].setdefault(event_key, set()).add(label)
-                snapshot["tweet_ids"].setdefault(event_key, {})[label] = tweet_id
-                snapshot["text_hashes"].add(text_hash)
-                if media_hash:
-                    snapshot["media_hashes"].add(media_hash)
-                if event_key not in snapshot["first_post"]:
-                    snapshot["first_post"][event_key] = base._now()
-                result.published += 1
-                sent_run += 1
-                remaining -= 1
-                base._log(f"OK | linha={row_number} | conta={_name(account)} | perfil={profile} | id={tweet_id}")
-                if sent_run < max_run and remaining > 0:
-                    time.sleep(pause)
-
-            except Exception as exc:
-                status = base._http_status(exc)
-                detail = base._exception_detail(exc)
-                result.errors += 1
-                row_error = True
-                base._log(f"ERRO | linha={row_number} | conta={label} | status={status} | {detail}")
-
-                if status in {400, 422}:
-                    base._ledger_update(
-                        ledger_ws,
-                        ledger_row,
-                        "REJECTED",
-                        media_hash=media_hash,
-                        detail=_detail(event_key, label, profile, detail),
-                    )
-                    base._mark_error(main_ws, row_number, str(status), f"conta={label}|{detail}")
-                    break
+                    complete.add(label)
+                    tweet_ids[label] = tweet_id
+                    snapshot["posted_keys"].add(scoped_key)
+                    snapshot["posted_by_base"].setdefault(event_key, set()).add(label)
+                    snapshot["tweet_ids"].setdefault(event_key, {})[label] = tweet_id
+                    snapshot["text_hashes"].add(text_hash)
+                    if media_hash:
+                        snapshot["media_hashes"].add(media_hash)
+                    if event_key not in snapshot["first_post"]:
+                        snapshot["first_post"][event_key] = base._now()
+                    result.published += 1
+                    sent_run += 1
+                    remaining -= 1
+                    base._log(f"OK | linha={row_number} | conta={_name(account)} | perfil={profile} | id={tweet_id}")
+                    if sent_run < max_run and remaining > 0:
+                        time.sleep(pause)
+
+                except Exception as exc:
+                    status = base._http_status(exc)
+                    detail = base._exception_detail(exc)
+                    result.errors += 1
+                    row_error = True
+                    base._log(f"ERRO | linha={row_number} | conta={label} | status={status} | {detail}")
+
+                    if status in {400, 422}:
+                        base._ledger_update(
+                            ledger_ws,
+                            ledger_row,
+                            "REJECTED",
+                            media_hash=media_hash,
+                            detail=_detail(event_key, label, profile, detail),
+                        )
+                        base._mark_error(main_ws, row_number, str(status), f"conta={label}|{detail}")
+                        break
 
-                base._release_claim(main_ws, row_number)
-                if status in {401, 403}:
-                    reason = f"X bloqueou autenticação/permissão de {label} ({status}): {detail}"
-                    base._ledger_update(ledger_ws, ledger_row, "AUTH_POLICY_BLOCK", media_hash=media_hash, detail=detail)
-                    base._open_circuit(state_ws, reason, base._now() + timedelta(hours=circuit_hours))
-                    result.circuit_opened = True
-                    result.circuit_reason = reason
-                    stop = True
-                    break
-                if status == 429:
-                    reason = f"Limite da API do X em {label}: {detail}"
-                    base._ledger_update(ledger_ws, ledger_row, "RATE_LIMIT", media_hash=media_hash, detail=detail)
-                    base._open_circuit(state_ws, reason, base._rate_reset(exc))
+                    base._release_claim(main_ws, row_number)
+                    if status in {401, 403}:
+                        reason = f"X bloqueou autenticação/permissão de {label} ({status}): {detail}"
+                        base._ledger_update(ledger_ws, ledger_row, "AUTH_POLICY_BLOCK", media_hash=media_hash, detail=detail)
+                        base._open_circuit(state_ws, reason, base._now() + timedelta(hours=circuit_hours))
+                        result.circuit_opened = True
+                        result.circuit_reason = reason
+                        stop = True
+                        break
+                    if status == 429:
+                        reason = f"Limite da API do X em {label}: {detail}"
+                        base._ledger_update(ledger_ws, ledger_row, "RATE_LIMIT", media_hash=media_hash, detail=detail)
+                        base._open_circuit(state_ws, reason, base._rate_reset(exc))
+                        result.circuit_opened = True
+                        result.circuit_reason = reason
+                        stop = True
+                        break
+                    reason = f"Falha temporária no X em {label}: {detail}"
+                    base._ledger_update(ledger_ws, ledger_row, "TEMP_ERROR", media_hash=media_hash, detail=detail)
+                    base._open_circuit(state_ws, reason, base._now() + timedelta(minutes=30))
                     result.circuit_opened = True
                     result.circuit_reason = reason
                     stop = True
                     break
-                reason = f"Falha temporária no X em {label}: {detail}"
-                base._ledger_update(ledger_ws, ledger_row, "TEMP_ERROR", media_hash=media_hash, detail=detail)
-                base._open_circuit(state_ws, reason, base._now() + timedelta(minutes=30))
-                result.circuit_opened = True
-                result.circuit_reason = reason
-                stop = True
-                break
 
         complete_ordered = [label for label in labels if label in complete]
         pending = [label for label in labels if label not in complete]
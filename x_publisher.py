@@ -17,19 +17,24 @@ Este módulo reutiliza credenciais, planilha e geração de imagens já existent
 from __future__ import annotations
 
 import hashlib
+import json
 import os
 import re
 import time
 import unicodedata
 import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import pytz
 import tweepy
+from gspread.utils import rowcol_to_a1
 
 import bot
+from sheet_mirror import mirror_for
 
 
 TZ = pytz.timezone("America/Sao_Paulo")
@@ -50,6 +55,8 @@ LEDGER_HEADERS = [
     "DETAIL",
 ]
 STATE_HEADERS = ["CHAVE", "VALOR", "ATUALIZADO"]
+LEDGER_LAST_COLUMN = rowcol_to_a1(1, len(LEDGER_HEADERS)).rstrip("0123456789")
+LEDGER_CACHE_DIR = os.getenv("X_LEDGER_CACHE_DIR", ".cache/x_ledger").strip()
 
 
 @dataclass
@@ -180,26 +187,64 @@ def _state_ws(main_ws: Any) -> Any:
     return _worksheet(main_ws, _cfg("X_STATE_TAB", "X_Estado"), STATE_HEADERS, rows=100)
 
 
+class _StateCache:
+    """X_Estado lido uma única vez por rodada; as gravações vão direto para a planilha e para cá."""
+
+    def __init__(self, state_ws: Any):
+        self.ws = state_ws
+        self.values: Dict[str, Tuple[str, int]] = {}
+        self.next_row = 2
+        self.reads = 0
+        self._load()
+
+    def _load(self) -> None:
+        values = self.ws.get_all_values()
+        self.reads += 1
+        for row_number, row in enumerate(values[1:], start=2):
+            key = (row[0] if len(row) > 0 else "").strip().upper()
+            value = (row[1] if len(row) > 1 else "").strip()
+            if key:
+                self.values[key] = (value, row_number)
+        self.next_row = max(2, len(values) + 1)
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        stamp = _iso()
+        data = []
+        for key, value in items.items():
+            key = (key or "").strip().upper()
+            if key in self.values:
+                row_number = self.values[key][1]
+                data.append({"range": f"B{row_number}:C{row_number}", "values": [[value, stamp]]})
+                self.values[key] = (value, row_number)
+                continue
+            response = self.ws.append_row([key, value, stamp], value_input_option="RAW")
+            updated_range = ((response or {}).get("updates") or {}).get("updatedRange", "")
+            match = re.search(r"![A-Z]+(\d+)", updated_range)
+            row_number = int(match.group(1)) if match else self.next_row
+            self.values[key] = (value, row_number)
+            self.next_row = max(self.next_row, row_number + 1)
+        if len(data) == 1:
+            self.ws.update(data[0]["values"], data[0]["range"], value_input_option="RAW")
+        elif data:
+            self.ws.batch_update(data, value_input_option="RAW")
+
+
+_state_caches: Dict[int, _StateCache] = {}
+
+
+def _state_cache(state_ws: Any) -> _StateCache:
+    cache = _state_caches.get(id(state_ws))
+    if cache is None or cache.ws is not state_ws:
+        cache = _state_caches[id(state_ws)] = _StateCache(state_ws)
+    return cache
+
+
 def _state_load(state_ws: Any) -> Dict[str, Tuple[str, int]]:
-    values = state_ws.get_all_values()
-    result: Dict[str, Tuple[str, int]] = {}
-    for row_number, row in enumerate(values[1:], start=2):
-        key = (row[0] if len(row) > 0 else "").strip().upper()
-        value = (row[1] if len(row) > 1 else "").strip()
-        if key:
-            result[key] = (value, row_number)
-    return result
+    return _state_cache(state_ws).values
 
 
 def _state_set(state_ws: Any, key: str, value: str) -> None:
-    key = (key or "").strip().upper()
-    state = _state_load(state_ws)
-    if key in state:
-        row_number = state[key][1]
-        state_ws.update_cell(row_number, 2, value)
-        state_ws.update_cell(row_number, 3, _iso())
-    else:
-        state_ws.append_row([key, value, _iso()], value_input_option="RAW")
+    _state_cache(state_ws).set_many({key: value})
 
 
 def _parse_iso(value: str) -> Optional[datetime]:
@@ -220,19 +265,184 @@ def _circuit_status(state_ws: Any) -> Tuple[bool, str]:
     if until and until > _now():
         return True, f"{reason or 'proteção ativa'} até {until.strftime('%d/%m/%Y %H:%M:%S')}"
     if until_raw:
-        _state_set(state_ws, "CIRCUIT_UNTIL", "")
-        _state_set(state_ws, "CIRCUIT_REASON", "")
+        _state_cache(state_ws).set_many({"CIRCUIT_UNTIL": "", "CIRCUIT_REASON": ""})
     return False, ""
 
 
 def _open_circuit(state_ws: Any, reason: str, until: datetime) -> None:
-    _state_set(state_ws, "CIRCUIT_REASON", reason[:500])
-    _state_set(state_ws, "CIRCUIT_UNTIL", _iso(until))
+    _state_cache(state_ws).set_many({"CIRCUIT_REASON": reason[:500], "CIRCUIT_UNTIL": _iso(until)})
     _log(f"Circuito aberto: {reason} | até {_iso(until)}")
 
 
+class _LedgerIndex:
+    """Cópia local do ledger, carregada uma vez por rodada e mantida pelas gravações do próprio bot.
+
+    As linhas já vistas ficam em LEDGER_CACHE_DIR junto com a marca d'água (quantidade de
+    linhas conhecidas). Na rodada seguinte só são lidas, numa única chamada, as linhas a
+    partir da marca e as que ainda estavam PENDING. A última linha conhecida é relida para
+    conferir o cache; se não bater (aba limpa ou editada), o ledger é lido por inteiro.
+    """
+
+    def __init__(self, ledger_ws: Any):
+        self.ws = ledger_ws
+        self.rows: List[List[str]] = []
+        self.reads = 0
+        self.writes = 0
+        self._dirty: Optional[Dict[int, None]] = None
+        self._load()
+
+    def _cache_path(self) -> Optional[Path]:
+        if not LEDGER_CACHE_DIR:
+            return None
+        spreadsheet_id = getattr(getattr(self.ws, "spreadsheet", None), "id", "") or "planilha"
+        worksheet_id = getattr(self.ws, "id", "") or getattr(self.ws, "title", "ledger")
+        return Path(LEDGER_CACHE_DIR) / f"{spreadsheet_id}_{worksheet_id}.json"
+
+    @staticmethod
+    def _pad(row: Sequence[str]) -> List[str]:
+        values = [str(value) for value in row[: len(LEDGER_HEADERS)]]
+        return values + [""] * (len(LEDGER_HEADERS) - len(values))
+
+    def _read_cache(self) -> List[List[str]]:
+        path = self._cache_path()
+        if path is None or not path.exists():
+            return []
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            rows = [self._pad(row) for row in payload.get("rows", [])]
+            return rows if int(payload.get("mark", 0)) == len(rows) else []
+        except Exception as exc:
+            _log(f"Cache do ledger ignorado: {exc}")
+            return []
+
+    def _full_load(self) -> None:
+        self.rows = [self._pad(row) for row in self.ws.get_all_values()]
+        self.reads += 1
+
+    def _load(self) -> None:
+        cached = self._read_cache()
+        if len(cached) < 2:
+            self._full_load()
+        else:
+            mark = len(cached)
+            pending = [
+                row_number
+                for row_number in range(2, mark)
+                if cached[row_number - 1][1].strip().upper() == "PENDING"
+            ]
+            ranges = [f"A{mark}:{LEDGER_LAST_COLUMN}"]
+            ranges += [f"A{row_number}:{LEDGER_LAST_COLUMN}{row_number}" for row_number in pending]
+            results = self.ws.batch_get(ranges)
+            self.reads += 1
+            tail = [self._pad(row) for row in (results[0] if results else [])]
+            if not tail or tail[0][0] != cached[-1][0] or tail[0][10] != cached[-1][10]:
+                _log("Cache do ledger não confere com a planilha; relendo o ledger inteiro.")
+                self._full_load()
+            else:
+                self.rows = cached[:-1] + tail
+                for row_number, values in zip(pending, results[1:]):
+                    self.rows[row_number - 1] = self._pad(values[0] if values else [])
+        _log(f"Ledger carregado: {len(self.rows)} linha(s) | leituras na rodada: {self.reads}")
+        self.persist()
+
+    def persist(self) -> None:
+        path = self._cache_path()
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(
+                json.dumps({"mark": len(self.rows), "rows": self.rows}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            os.replace(temporary, path)
+        except OSError as exc:
+            _log(f"Não foi possível gravar o cache do ledger: {exc}")
+
+    def next_row(self) -> int:
+        return len(self.rows) + 1
+
+    def append(self, row_number: int, values: Sequence[str]) -> None:
+        while len(self.rows) < row_number:
+            self.rows.append(self._pad([]))
+        self.rows[row_number - 1] = self._pad(values)
+        self.persist()
+
+    def update(self, row_number: int, changes: Dict[int, str]) -> None:
+        if row_number > len(self.rows):
+            return
+        row = self.rows[row_number - 1]
+        for column, value in changes.items():
+            row[column - 1] = value
+        self.persist()
+
+    def write(self, row_number: int, flush: bool = False) -> None:
+        """Grava as colunas STATUS..DETAIL da linha num único intervalo.
+
+        Dentro de _ledger_batch a gravação espera o fim do ciclo (ou um flush) e
+        as linhas alteradas vão juntas num batch_update.
+        """
+        if self._dirty is None:
+            self._dirty = {row_number: None}
+            self.flush()
+            self._dirty = None
+            return
+        self._dirty[row_number] = None
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        data = [
+            {
+                "range": f"B{row_number}:{LEDGER_LAST_COLUMN}{row_number}",
+                "values": [self.rows[row_number - 1][1:]],
+            }
+            for row_number in self._dirty
+        ]
+        if len(data) == 1:
+            self.ws.update(data[0]["values"], data[0]["range"], value_input_option="RAW")
+        else:
+            self.ws.batch_update(data, value_input_option="RAW")
+        self.writes += 1
+        self._dirty.clear()
+
+
+_ledger_indexes: Dict[int, _LedgerIndex] = {}
+
+
+def _ledger_index(ledger_ws: Any) -> _LedgerIndex:
+    index = _ledger_indexes.get(id(ledger_ws))
+    if index is None or index.ws is not ledger_ws:
+        index = _ledger_indexes[id(ledger_ws)] = _LedgerIndex(ledger_ws)
+    return index
+
+
+@contextmanager
+def _ledger_batch(ledger_ws: Any) -> Iterator[_LedgerIndex]:
+    """Agrupa as atualizações de um ciclo de publicação num único batch_update.
+
+    POSTED continua sendo gravado na hora (levando junto o que estiver pendente):
+    perder esse registro numa queda faria a próxima rodada publicar de novo.
+    """
+    index = _ledger_index(ledger_ws)
+    if index._dirty is not None:
+        yield index
+        return
+    index._dirty = {}
+    try:
+        yield index
+    finally:
+        try:
+            index.flush()
+        finally:
+            index._dirty = None
+
+
 def _ledger_load(ledger_ws: Any) -> Dict[str, Any]:
-    values = ledger_ws.get_all_values()
+    values = _ledger_index(ledger_ws).rows
     posted_events: Dict[str, Dict[str, str]] = {}
     posted_text_hashes: set[str] = set()
     posted_media_hashes: set[str] = set()
@@ -281,24 +491,26 @@ def _ledger_append(
     tweet_id: str = "",
     detail: str = "",
 ) -> int:
-    row_number = len(ledger_ws.get_all_values()) + 1
-    ledger_ws.append_row(
-        [
-            event_key,
-            status,
-            tweet_id,
-            account,
-            data["loteria"],
-            data["concurso"],
-            data["data"],
-            text_hash,
-            media_hash,
-            data["url"],
-            _iso(),
-            detail[:1000],
-        ],
-        value_input_option="RAW",
-    )
+    index = _ledger_index(ledger_ws)
+    values = [
+        event_key,
+        status,
+        tweet_id,
+        account,
+        data["loteria"],
+        data["concurso"],
+        data["data"],
+        text_hash,
+        media_hash,
+        data["url"],
+        _iso(),
+        detail[:1000],
+    ]
+    response = ledger_ws.append_row(values, value_input_option="RAW")
+    updated_range = ((response or {}).get("updates") or {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)", updated_range)
+    row_number = int(match.group(1)) if match else index.next_row()
+    index.append(row_number, values)
     return row_number
 
 
@@ -310,13 +522,16 @@ def _ledger_update(
     media_hash: str = "",
     detail: str = "",
 ) -> None:
-    ledger_ws.update_cell(row_number, 2, status)
+    changes = {2: status}
     if tweet_id:
-        ledger_ws.update_cell(row_number, 3, tweet_id)
+        changes[3] = tweet_id
     if media_hash:
-        ledger_ws.update_cell(row_number, 9, media_hash)
-    ledger_ws.update_cell(row_number, 11, _iso())
-    ledger_ws.update_cell(row_number, 12, detail[:1000])
+        changes[9] = media_hash
+    changes[11] = _iso()
+    changes[12] = detail[:1000]
+    index = _ledger_index(ledger_ws)
+    index.update(row_number, changes)
+    index.write(row_number, flush=status == "POSTED")
 
 
 def _status_column(main_ws: Any) -> int:
@@ -339,13 +554,15 @@ def _claim_is_stale(value: str, ttl_minutes: int) -> bool:
 
 
 def coletar_candidatos_x(main_ws: Any) -> List[Tuple[int, List[str]]]:
-    rows = main_ws.get_all_values()
-    if len(rows) <= 1:
+    mirror = mirror_for(main_ws)
+    total = mirror.count()
+    if total <= 0:
         return []
     status_col = _status_column(main_ws)
     ttl = _cfg_int("X_CLAIM_TTL_MINUTES", 60, 10, 1440)
+    rows = sorted(mirror.pending(status_col) + mirror.by_status_prefix(status_col, "PROCESSANDO_X|"))
     candidates: List[Tuple[int, List[str]]] = []
-    for row_number, row in enumerate(rows[1:], start=2):
+    for row_number, row in rows:
         status = row[status_col - 1] if len(row) >= status_col else ""
         status = bot._strip_invisible(status)
         if status and not _claim_is_stale(status, ttl):
@@ -353,7 +570,7 @@ def coletar_candidatos_x(main_ws: Any) -> List[Tuple[int, List[str]]]:
         if not bot._row_has_min_payload(row):
             continue
         candidates.append((row_number, row))
-    _log(f"Candidatas: {len(candidates)}/{len(rows) - 1}")
+    _log(f"Candidatas: {len(candidates)}/{total}")
     return candidates
 
 
@@ -362,17 +579,22 @@ def _claim(main_ws: Any, row_number: int, event_key: str) -> bool:
     run_id = (os.getenv("GITHUB_RUN_ID", "") or uuid.uuid4().hex[:12]).strip()
     value = f"PROCESSANDO_X|{run_id}|{_iso()}|{event_key[:16]}"
     main_ws.update_cell(row_number, status_col, value)
+    mirror_for(main_ws).apply({(row_number, status_col): value})
     confirmed = bot._strip_invisible(main_ws.cell(row_number, status_col).value or "")
     return confirmed == value
 
 
 def _release_claim(main_ws: Any, row_number: int) -> None:
-    main_ws.update_cell(row_number, _status_column(main_ws), "")
+    status_col = _status_column(main_ws)
+    main_ws.update_cell(row_number, status_col, "")
+    mirror_for(main_ws).apply({(row_number, status_col): ""})
 
 
 def _mark_error(main_ws: Any, row_number: int, code: str, detail: str) -> None:
     value = f"ERRO_X_{code} em {bot._ts_br()} | {detail[:250]}"
-    main_ws.update_cell(row_number, _status_column(main_ws), value)
+    status_col = _status_column(main_ws)
+    main_ws.update_cell(row_number, status_col, value)
+    mirror_for(main_ws).apply({(row_number, status_col): value})
 
 
 def _hashtag(loteria: str) -> str:
@@ -624,9 +846,8 @@ def publicar_x_automatico(main_ws: Any) -> XRunResult:
         try:
             if bot._x_post_with_image() and not bot.DRY_RUN:
                 try:
-                    image_buffer = bot._build_image_from_row(row)
-                    image_bytes = image_buffer.getvalue()
-                    media_hash = _sha256_bytes(image_bytes)
+                    image = bot._rendered_image(row, "X")
+                    media_hash = _sha256_bytes(image.data)
                     if media_hash in ledger["posted_media_hashes"]:
                         _log(
                             f"Linha {row_number}: imagem idêntica a uma já publicada; "
@@ -634,10 +855,9 @@ def publicar_x_automatico(main_ws: Any) -> XRunResult:
                         )
                         media_hash = ""
                     else:
-                        image_buffer.seek(0)
                         media = account.api_v1.media_upload(
-                            filename=f"resultado-{event_key[:12]}.png",
-                            file=image_buffer,
+                            filename=f"resultado-{event_key[:12]}.{image.extension}",
+                            file=image.buffer(),
                         )
                         media_ids = [media.media_id_string]
                 except tweepy.TweepyException:
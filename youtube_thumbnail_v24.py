@@ -5,9 +5,11 @@ import re
 from pathlib import Path
 from typing import Any, Dict, List, Sequence, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 import daily_queue_v19 as queue
+from font_registry import SANS
+from video_queue import _find_col
 from youtube_auth import get_access_token
 from youtube_upload import upload_thumbnail
 
@@ -17,22 +19,11 @@ OUT_DIR = Path("output")
 
 
 def _font(size: int, bold: bool = False):
-    paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
-    ]
-    for path in paths:
-        if os.path.exists(path):
-            return ImageFont.truetype(path, size=size)
-    return ImageFont.load_default()
+    return SANS.get(size, bold)
 
 
 def _fit(draw, text, max_width, start, minimum=18, bold=True):
-    for size in range(start, minimum - 1, -2):
-        f = _font(size, bold)
-        if draw.textbbox((0, 0), text, font=f)[2] <= max_width:
-            return f
-    return _font(minimum, bold)
+    return SANS.fit(draw, text, max_width, start, minimum, bold)
 
 
 def _money_value(value: str) -> float:
@@ -141,7 +132,7 @@ def reparar_ultima_capa_publicada() -> int:
     cfg = queue.carregar_config(); client = queue._google_client(); cofre_cache, cofre_get = queue._load_cofre(client, cfg)
     ws = client.open_by_key(cfg.google_sheet_id).worksheet(cfg.sheet_tab); values = ws.get_all_values()
     if not values: return 0
-    headers = list(values[0]); daily_idx = queue._find_col(headers, [os.getenv("PUBLICADO_YT_DIARIO_COL", queue.DAILY_COLUMN_DEFAULT)])
+    headers = list(values[0]); daily_idx = _find_col(headers, [os.getenv("PUBLICADO_YT_DIARIO_COL", queue.DAILY_COLUMN_DEFAULT)])
     if daily_idx is None: return 0
     video_id = ""
     for row in reversed(values[1:]):